@@ -7,6 +7,7 @@ import json
 import sys
 import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable, Iterable, Optional
 
 ftd2xx = ctypes.WinDLL('ftd2xx.dll')
@@ -27,6 +28,11 @@ CTRL_ETB = '\x17'
 CTRL_RS = '\x1e'
 CRLF_BYTES = b'\r\n'
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+_DATE_RE = re.compile(r'([0-9]{1,2})-([0-9]{1,2})-([0-9]{4})')
+_TIME_RE = re.compile(r'([0-9]{1,2}):([0-9]{1,2}):([0-9]{1,2})')
+
 class FT_DEVICE_LIST_INFO_NODE(ctypes.Structure):
     _fields_ = [
         ('Flags', DWORD),
@@ -166,7 +172,16 @@ def close_device(handle: HANDLE) -> None:
     if handle:
         _check_status(_ft_close(handle), 'FT_Close')
 
-def configure_device(handle: HANDLE, baud: int, databits: int, stopbits: float, parity: str, read_timeout: int, write_timeout: int) -> None:
+def configure_device(
+    handle: HANDLE,
+    baud: int,
+    databits: int,
+    stopbits: float,
+    parity: str,
+    read_timeout: int,
+    write_timeout: int,
+    latency_timer_ms: int = 2,
+) -> None:
     stopbit_map = {1: 0x00, 1.5: 0x01, 2: 0x02}
     parity_map = {'N': 0x00, 'O': 0x01, 'E': 0x02, 'M': 0x03, 'S': 0x04}
     if databits not in (7, 8):
@@ -176,6 +191,9 @@ def configure_device(handle: HANDLE, baud: int, databits: int, stopbits: float,
     parity = parity.upper()
     if parity not in parity_map:
         raise ValueError('Parity must be one of N, O, E, M, S')
+    # The FTDI latency timer flushes short packets (a CX-505 frame is well under
+    # 64 bytes); the driver default of 16 ms delays every reply by that much.
+    latency = min(max(int(latency_timer_ms), 1), 255)
 
     _check_status(_ft_reset(handle), 'FT_ResetDevice')
     _check_status(_ft_purge(handle, FT_PURGE_RX | FT_PURGE_TX), 'FT_Purge')
@@ -184,7 +202,7 @@ def configure_device(handle: HANDLE, baud: int, databits: int, stopbits: float,
     _check_status(_ft_set_flow(handle, ctypes.c_ushort(0), UCHAR(0), UCHAR(0)), 'FT_SetFlowControl')
     _check_status(_ft_set_usb_params(handle, DWORD(65536), DWORD(65536)), 'FT_SetUSBParameters')
     _check_status(_ft_set_chars(handle, UCHAR(0), UCHAR(0), UCHAR(0), UCHAR(0)), 'FT_SetChars')
-    _check_status(_ft_set_latency(handle, UCHAR(2)), 'FT_SetLatencyTimer')
+    _check_status(_ft_set_latency(handle, UCHAR(latency)), 'FT_SetLatencyTimer')
     modem_status = DWORD()
     _check_status(_ft_get_modem_status(handle, ctypes.byref(modem_status)), 'FT_GetModemStatus')
     _check_status(_ft_purge(handle, FT_PURGE_RX | FT_PURGE_TX), 'FT_Purge')
@@ -225,9 +243,11 @@ def write_payloads(handle: HANDLE, payloads: Iterable[bytes]) -> int:
     for payload in payloads:
         if not payload:
             continue
-        buffer = (ctypes.c_ubyte * len(payload))(*payload)
+        # FT_Write only reads the buffer, so bytes are passed without building a
+        # ctypes array (bytes() is a no-op for the memoised poll frame).
+        data = bytes(payload)
         written = DWORD()
-        _check_status(_ft_write(handle, ctypes.byref(buffer), DWORD(len(payload)), ctypes.byref(written)), 'FT_Write')
+        _check_status(_ft_write(handle, data, DWORD(len(data)), ctypes.byref(written)), 'FT_Write')
         total += written.value
     return total
 
@@ -238,7 +258,7 @@ def _normalize_whitespace(text: str) -> str:
         return ''
     text = text.replace('\u00a0', ' ').replace('\u00b0', ' deg ')
     text = text.strip()
-    return re.sub(r'\s+', ' ', text)
+    return _WHITESPACE_RE.sub(' ', text)
 
 
 def _safe_float(text: Optional[str]) -> Optional[float]:
@@ -281,15 +301,35 @@ TEMP_UNIT_FIELDS = {
 }
 
 
+@lru_cache(maxsize=64)
 def _unit_slug(text: Optional[str]) -> Optional[str]:
+    # Meters repeat the same few unit labels on every frame.
     if not text:
         return None
     normalized = _normalize_whitespace(text).lower()
     normalized = normalized.replace('\u00b0', 'deg').replace('%', 'percent')
-    slug = re.sub(r'[^a-z0-9]+', '_', normalized).strip('_')
+    slug = _SLUG_RE.sub('_', normalized).strip('_')
     return slug or None
 
 
+def _parse_timestamp(date_text: str, time_text: str) -> Optional[str]:
+    """Return the ISO form of a ``%d-%m-%Y %H:%M:%S`` pair, or None when invalid."""
+
+    date_match = _DATE_RE.fullmatch(date_text)
+    time_match = _TIME_RE.fullmatch(time_text)
+    try:
+        if date_match and time_match:
+            # Plain digit groups skip the much slower strptime machinery.
+            day, month, year = map(int, date_match.groups())
+            hour, minute, second = map(int, time_match.groups())
+            dt = datetime(year, month, day, hour, minute, second)
+        else:
+            dt = datetime.strptime(f"{date_text} {time_text}", '%d-%m-%Y %H:%M:%S')
+    except ValueError:
+        return None
+    return dt.isoformat()
+
+
 
 
 def _extract_frames(buffer: bytearray) -> list[bytes]:
@@ -353,6 +393,15 @@ def _decode_frame(frame: bytes) -> dict:
         'measurement': {
             'raw': measurement_text,
             'fields': measurement_fields,
+            'sequence': None,
+            'value': None,
+            'value_text': None,
+            'value_unit': None,
+            'value_unit_slug': None,
+            'temperature': None,
+            'temperature_text': None,
+            'temperature_unit': None,
+            'temperature_unit_slug': None,
         },
     }
     header_info = record['header']
@@ -371,15 +420,6 @@ def _decode_frame(frame: bytes) -> dict:
     if len(header_fields) > 3:
         header_info['mode'] = header_fields[3]
     measurement_info = record['measurement']
-    measurement_info['sequence'] = None
-    measurement_info['value'] = None
-    measurement_info['value_text'] = None
-    measurement_info['value_unit'] = None
-    measurement_info['value_unit_slug'] = None
-    measurement_info['temperature'] = None
-    measurement_info['temperature_text'] = None
-    measurement_info['temperature_unit'] = None
-    measurement_info['temperature_unit_slug'] = None
     if measurement_fields:
         first_field = measurement_fields[0]
         if ':' in first_field:
@@ -423,11 +463,9 @@ def _decode_frame(frame: bytes) -> dict:
         measurement_info['time'] = measurement_fields[4]
         date_value = measurement_info.get('date')
         if date_value:
-            try:
-                dt = datetime.strptime(f"{date_value} {measurement_info['time']}", '%d-%m-%Y %H:%M:%S')
-                measurement_info['timestamp'] = dt.isoformat()
-            except ValueError:
-                pass
+            timestamp = _parse_timestamp(date_value, measurement_info['time'])
+            if timestamp is not None:
+                measurement_info['timestamp'] = timestamp
     if len(measurement_fields) > 5:
         measurement_info['extra_fields'] = measurement_fields[5:]
     return record
@@ -248,6 +248,10 @@ class AcquisitionService:
     def database(self) -> Database:
         return self._database
 
+    @property
+    def stop_requested(self) -> bool:
+        return self._stop_requested
+
     def command_metrics(self) -> Dict[str, Any]:
         """Return a snapshot of command queue and schedule state for diagnostics."""
 
@@ -2,17 +2,17 @@
 from __future__ import annotations
 
 import io
-import json
 import platform
 import sys
 import zipfile
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 
 from ..acquisition.service import AcquisitionService
 from ..protocols import CommandDefinition
+from ..serialization import dumps_bytes
 from .health import HealthMonitor, health_status_to_dict
 
 
@@ -27,7 +27,7 @@ def _isoformat(value: Optional[datetime]) -> Optional[str]:
 
 
 def _json_bytes(payload: Any) -> bytes:
-    return json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+    return dumps_bytes(payload, indent=True)
 
 
 def _config_payload(config: Optional[Any]) -> Optional[Dict[str, Any]]:
@@ -99,14 +99,20 @@ def _environment_payload() -> Dict[str, Any]:
     }
 
 
-def build_diagnostic_bundle(
+def write_diagnostic_bundle(
+    target: BinaryIO,
     service: AcquisitionService,
     monitor: HealthMonitor,
     *,
     event_limit: int = 200,
     session_limit: int = 5,
-) -> bytes:
-    """Return a ZIP archive capturing health, config, and recent activity."""
+) -> None:
+    """Write a ZIP archive capturing health, config, and recent activity to *target*.
+
+    *target* only needs `write`/`flush`; non-seekable streams such as HTTP
+    response bodies are supported. Members are encoded one at a time so only
+    a single payload is held in memory alongside the compressor state.
+    """
 
     event_limit = max(1, min(event_limit, _MAX_EVENT_LIMIT))
     session_limit = max(0, min(session_limit, _MAX_SESSION_LIMIT))
@@ -121,38 +127,38 @@ def build_diagnostic_bundle(
     config = getattr(service, '_config', None)
     command_definitions = getattr(service, '_command_definitions', {})
     monitoring_config = monitor.monitoring_config
+    sessions_payload = _sessions_payload(service, limit=session_limit)
+
+    manifest = {
+        'generated_at': generated_at,
+        'tool': 'elmetron-diagnostic-bundle',
+        'version': '1.0',
+        'counts': {
+            'events': len(events),
+            'sessions': len(sessions_payload.get('sessions', [])),
+        },
+        'context': {
+            'database_path': sessions_payload.get('database_path'),
+            'config_available': bool(config),
+        },
+        'files': {
+            'health_snapshot': 'health/snapshot.json',
+            'log_events': 'health/log_events.json',
+            'service_stats': 'service/stats.json',
+            'command_metrics': 'service/command_metrics.json',
+            'environment': 'service/environment.json',
+            'config': 'config/app_config.json',
+            'monitoring': 'config/monitoring.json',
+            'commands': 'config/command_definitions.json',
+            'sessions': 'storage/recent_sessions.json',
+        },
+    }
 
-    bundle = io.BytesIO()
-    with zipfile.ZipFile(bundle, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
-        sessions_payload = _sessions_payload(service, limit=session_limit)
-
-        manifest = {
-            'generated_at': generated_at,
-            'tool': 'elmetron-diagnostic-bundle',
-            'version': '1.0',
-            'counts': {
-                'events': len(events),
-                'sessions': len(sessions_payload.get('sessions', [])),
-            },
-            'context': {
-                'database_path': sessions_payload.get('database_path'),
-                'config_available': bool(config),
-            },
-            'files': {
-                'health_snapshot': 'health/snapshot.json',
-                'log_events': 'health/log_events.json',
-                'service_stats': 'service/stats.json',
-                'command_metrics': 'service/command_metrics.json',
-                'environment': 'service/environment.json',
-                'config': 'config/app_config.json',
-                'monitoring': 'config/monitoring.json',
-                'commands': 'config/command_definitions.json',
-                'sessions': 'storage/recent_sessions.json',
-            },
-        }
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
         archive.writestr('manifest.json', _json_bytes(manifest))
         archive.writestr('health/snapshot.json', _json_bytes(snapshot))
         archive.writestr('health/log_events.json', _json_bytes(events))
+        del events
         archive.writestr('service/stats.json', _json_bytes(_stats_payload(service)))
         archive.writestr('service/command_metrics.json', _json_bytes(_command_metrics_payload(service)))
         archive.writestr('service/environment.json', _json_bytes(_environment_payload()))
@@ -162,4 +168,22 @@ def build_diagnostic_bundle(
         archive.writestr('config/command_definitions.json', _json_bytes(_command_definitions_payload(command_definitions)))
         archive.writestr('storage/recent_sessions.json', _json_bytes(sessions_payload))
 
+
+def build_diagnostic_bundle(
+    service: AcquisitionService,
+    monitor: HealthMonitor,
+    *,
+    event_limit: int = 200,
+    session_limit: int = 5,
+) -> bytes:
+    """Return a ZIP archive capturing health, config, and recent activity."""
+
+    bundle = io.BytesIO()
+    write_diagnostic_bundle(
+        bundle,
+        service,
+        monitor,
+        event_limit=event_limit,
+        session_limit=session_limit,
+    )
     return bundle.getvalue()
@@ -1,34 +1,246 @@
 ﻿"""Health/status API primitives for the acquisition service."""
 from __future__ import annotations
 
+import atexit
 import json
 import platform
+import queue
 import subprocess
+import threading
 import time
 from collections import deque
-from dataclasses import asdict, dataclass
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
-from typing import Any, Deque, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 from ..acquisition.service import AcquisitionService
 from ..config import MonitoringConfig
+from ..serialization import dumps_bytes
 
+_IS_WINDOWS = platform.system().lower() == 'windows'
 LOG_ROTATION_TIMEOUT_S = 5
+POWERSHELL_HOST_COMMAND = ('powershell.exe', '-NoProfile', '-NoLogo', '-NonInteractive', '-Command', '-')
+_POWERSHELL_SENTINEL = '<<END>>'
+# `-Command -` evaluates stdin line by line, so the probe must be a single
+# statement sequence without bare newlines inside blocks. Only the leading
+# `$taskName` assignment varies per call.
+_LOG_ROTATION_SCRIPT_BODY = ' '.join(
+    part.strip()
+    for part in (
+        "$task = Get-ScheduledTask -TaskName $taskName -ErrorAction SilentlyContinue;",
+        "if (-not $task) {",
+        "    Write-Output '{\"state\":\"missing\"}';",
+        "} else {",
+        "    $info = Get-ScheduledTaskInfo -TaskName $taskName;",
+        "    $result = [pscustomobject]@{",
+        "        state = 'ok';",
+        "        lastTaskResult = $info.LastTaskResult;",
+        "        lastRunTime = if ($info.LastRunTime) { $info.LastRunTime.ToUniversalTime().ToString('o') } else { $null };",
+        "        nextRunTime = if ($info.NextRunTime) { $info.NextRunTime.ToUniversalTime().ToString('o') } else { $null };",
+        "        lastRunAgeMinutes = if ($info.LastRunTime) { [math]::Round(((Get-Date) - $info.LastRunTime).TotalMinutes, 2) } else { $null };",
+        "    };",
+        "    $result | ConvertTo-Json -Compress;",
+        "}",
+    )
+)
+WATCHDOG_HISTORY_SIZE = 32
+# Upper bound on how long a cached /health body is reused when none of the
+# cheap change counters moved (command queues and log rotation age silently).
+SNAPSHOT_CACHE_MAX_AGE_S = 1.0
+DEFAULT_COMMAND_METRICS_TTL_S = 0.2
+# How long a /health request waits for another thread's in-flight
+# command_metrics() call before falling back to the previous result.
+COMMAND_METRICS_WAIT_S = 0.5
+HEALTH_PROBE_WORKERS = 2
+
+
+@lru_cache(maxsize=16)
+def _cached_isoformat(value: datetime, utcoffset: Optional[timedelta]) -> str:
+    return value.isoformat()
 
 
 def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    # Frame/window timestamps repeat across many /health polls, so the
+    # formatted strings are memoised. Aware datetimes for the same instant
+    # compare equal across zones, hence the offset is part of the key.
     if value is None:
         return None
-    return value.isoformat()
+    return _cached_isoformat(value, value.utcoffset())
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(field.name for field in fields(cls))
+
+
+def _flat_dataclass_dict(value: Any) -> Dict[str, Any]:
+    """Shallow `asdict` for dataclasses whose fields are plain scalars.
+
+    Raises `TypeError` for non-dataclass values, like `asdict`.
+    """
+
+    return {name: getattr(value, name) for name in _field_names(type(value))}
 
 
 def health_status_to_dict(status: "HealthStatus") -> Dict[str, Any]:
-    """Serialise a HealthStatus dataclass to basic Python types."""
+    """Serialise a HealthStatus dataclass to basic Python types.
+
+    Built field by field instead of via `asdict`, which would deep-copy the
+    nested payloads only for them to be encoded to JSON straight away. Nested
+    dictionaries are therefore shared with the snapshot and must be treated as
+    read-only.
+    """
+
+    return {
+        'state': status.state,
+        'frames': status.frames,
+        'bytes_read': status.bytes_read,
+        'last_frame_at': _isoformat(status.last_frame_at),
+        'last_window_started': _isoformat(status.last_window_started),
+        'watchdog_alert': status.watchdog_alert,
+        'detail': status.detail,
+        'log_rotation': status.log_rotation,
+        'watchdog_history': status.watchdog_history,
+        'command_metrics': status.command_metrics,
+        'interface_lock': status.interface_lock,
+        'analytics_profile': status.analytics_profile,
+        'response_times': status.response_times,
+        'latest_measurement': status.latest_measurement,
+    }
+
+
+class _PowerShellHost:
+    """Long-lived PowerShell process that evaluates one-line scripts on demand.
+
+    Spawning `powershell.exe` costs several hundred milliseconds, so the probe
+    keeps a single `-Command -` session alive and streams scripts into its
+    stdin. Each script is followed by a sentinel line marking the end of its
+    output. The process is restarted transparently if it exits.
+    """
+
+    _instance: Optional["_PowerShellHost"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, command: Sequence[str] = POWERSHELL_HOST_COMMAND) -> None:
+        self._command = list(command)
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    @classmethod
+    def instance(cls) -> "_PowerShellHost":
+        """Return the process-wide host, creating it on first use."""
+
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance.close)
+            return cls._instance
 
-    payload = asdict(status)
-    payload['last_frame_at'] = _isoformat(status.last_frame_at)
-    payload['last_window_started'] = _isoformat(status.last_window_started)
-    return payload
+    @property
+    def pid(self) -> Optional[int]:
+        process = self._process
+        return process.pid if process is not None else None
+
+    def query(self, script: str, timeout: float = LOG_ROTATION_TIMEOUT_S) -> str:
+        """Evaluate *script* and return its stdout (stderr is merged in)."""
+
+        with self._lock:
+            process = self._ensure_process()
+            payload = f"{script}\nWrite-Output '{_POWERSHELL_SENTINEL}'\n"
+            try:
+                _write_script(process, payload)
+            except OSError:
+                # The host died between calls; retry once on a fresh process.
+                self._terminate()
+                process = self._ensure_process()
+                try:
+                    _write_script(process, payload)
+                except OSError as exc:
+                    self._terminate()
+                    raise ChildProcessError('PowerShell host rejected the probe script') from exc
+
+            lines: List[str] = []
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._terminate()
+                    raise subprocess.TimeoutExpired(self._command, timeout)
+                try:
+                    line = self._lines.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+                if line is None:
+                    self._terminate()
+                    raise ChildProcessError('PowerShell host exited unexpectedly')
+                if line == _POWERSHELL_SENTINEL:
+                    return '\n'.join(lines)
+                lines.append(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._terminate()
+
+    def _ensure_process(self) -> subprocess.Popen:
+        process = self._process
+        if process is not None and process.poll() is None:
+            return process
+        self._terminate()
+        process = subprocess.Popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        reader = threading.Thread(
+            target=_pump_lines,
+            args=(process.stdout, lines),
+            name='powershell-host-reader',
+            daemon=True,
+        )
+        reader.start()
+        self._process = process
+        self._lines = lines
+        return process
+
+    def _terminate(self) -> None:
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+        except OSError:  # pragma: no cover - pipe already closed
+            pass
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:  # pragma: no cover - defensive
+            pass
+
+
+def _write_script(process: subprocess.Popen, payload: str) -> None:
+    process.stdin.write(payload)  # type: ignore[union-attr]
+    process.stdin.flush()  # type: ignore[union-attr]
+
+
+def _pump_lines(stream: Any, lines: "queue.Queue[Optional[str]]") -> None:
+    try:
+        for line in stream:
+            lines.put(line.rstrip('\r\n'))
+    except (OSError, ValueError):  # pragma: no cover - stream closed underneath us
+        pass
+    finally:
+        lines.put(None)
 
 
 def _check_log_rotation_task(task_name: str, max_age_minutes: int) -> Dict[str, Any]:
@@ -36,37 +248,14 @@ def _check_log_rotation_task(task_name: str, max_age_minutes: int) -> Dict[str,
     if not task_name:
         status['status'] = 'disabled'
         return status
-    if platform.system().lower() != 'windows':
+    if not _IS_WINDOWS:
         status['status'] = 'unsupported'
         status['message'] = 'Log rotation monitoring is only available on Windows.'
         return status
     escaped_name = task_name.replace("'", "''")
-    script_lines = [
-        f"$taskName = '{escaped_name}';",
-        "$task = Get-ScheduledTask -TaskName $taskName -ErrorAction SilentlyContinue;",
-        "if (-not $task) {",
-        "    Write-Output '{\"state\":\"missing\"}';",
-        "    exit 0;",
-        "}",
-        "$info = Get-ScheduledTaskInfo -TaskName $taskName;",
-        "$result = [pscustomobject]@{",
-        "    state = 'ok';",
-        "    lastTaskResult = $info.LastTaskResult;",
-        "    lastRunTime = if ($info.LastRunTime) { $info.LastRunTime.ToUniversalTime().ToString('o') } else { $null };",
-        "    nextRunTime = if ($info.NextRunTime) { $info.NextRunTime.ToUniversalTime().ToString('o') } else { $null };",
-        "    lastRunAgeMinutes = if ($info.LastRunTime) { [math]::Round(((Get-Date) - $info.LastRunTime).TotalMinutes, 2) } else { $null };",
-        "};",
-        "$result | ConvertTo-Json -Compress",
-    ]
-    script = '\n'.join(script_lines)
+    script = f"$taskName = '{escaped_name}'; {_LOG_ROTATION_SCRIPT_BODY}"
     try:
-        completed = subprocess.run(
-            ['powershell.exe', '-NoProfile', '-Command', script],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=LOG_ROTATION_TIMEOUT_S,
-        )
+        output = _PowerShellHost.instance().query(script, timeout=LOG_ROTATION_TIMEOUT_S).strip()
     except FileNotFoundError:
         status['status'] = 'error'
         status['message'] = 'powershell.exe not available'
@@ -75,12 +264,11 @@ def _check_log_rotation_task(task_name: str, max_age_minutes: int) -> Dict[str,
         status['status'] = 'error'
         status['message'] = 'Scheduled task query timed out'
         return status
-
-    output = (completed.stdout or '').strip()
-    if completed.returncode != 0:
+    except ChildProcessError as exc:
         status['status'] = 'error'
-        status['message'] = (completed.stderr or output or '').strip() or 'Scheduled task query failed'
+        status['message'] = str(exc) or 'PowerShell host exited unexpectedly'
         return status
+
     if not output:
         status['status'] = 'error'
         status['message'] = 'Scheduled task query returned no data'
@@ -162,11 +350,30 @@ class HealthMonitor:
         self._service = service
         self._monitoring = monitoring
         self._watchdog_alert: Optional[str] = None
-        self._watchdog_detail: Optional[str] = None
-        self._watchdog_events: Deque[Dict[str, Any]] = deque(maxlen=32)
+        self._watchdog_detail_payload: Optional[Any] = None
+        self._watchdog_detail: Optional[str] = None  # formatted from _watchdog_detail_payload
+        # Fixed-size ring buffer; `_watchdog_head` is the next write slot.
+        self._watchdog_events: List[Optional[Dict[str, Any]]] = [None] * WATCHDOG_HISTORY_SIZE
+        self._watchdog_head = 0
+        self._watchdog_count = 0
+        self._watchdog_history: Optional[List[Dict[str, Any]]] = None
+        self._watchdog_generation = 0
+        self._snapshot_cache: Optional[Tuple[Tuple[Any, ...], bytes, str, float]] = None
+        self._snapshot_lock = threading.Lock()
+        # Body fields not covered by `_snapshot_key`, from the last rebuild, and
+        # a counter bumped whenever they change; both feed the ETag.
+        self._snapshot_extras: Optional[Tuple[Any, ...]] = None
+        self._snapshot_extras_generation = 0
+        self._command_metrics_cache: Tuple[Dict[str, Any], Optional[float]] = ({}, None)
+        self._command_metrics_lock = threading.Lock()
+        self._command_metrics_inflight: Optional[threading.Event] = None
         self._log_rotation_cache: Optional[Dict[str, Any]] = None
-        self._log_rotation_checked_at: Optional[datetime] = None
+        self._log_rotation_checked_at: Optional[float] = None  # time.monotonic()
         self._response_times: Deque[float] = deque(maxlen=64)
+        self._probe_lock = threading.Lock()
+        self._probe_pool: Optional[ThreadPoolExecutor] = None
+        self._log_rotation_future: Optional[Future] = None
+        self._closed = False
 
     @property
     def service(self) -> AcquisitionService:
@@ -180,13 +387,32 @@ class HealthMonitor:
 
         return self._monitoring
 
+    def close(self) -> None:
+        """Stop the background probe pool; later snapshots probe inline."""
+
+        with self._probe_lock:
+            self._closed = True
+            pool, self._probe_pool = self._probe_pool, None
+            self._log_rotation_future = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _log_rotation_due(self) -> bool:
+        if not self._monitoring or not self._monitoring.log_rotation_task:
+            return False
+        refresh = max(int(self._monitoring.log_rotation_probe_interval_s or 0), 1)
+        checked_at = self._log_rotation_checked_at
+        return checked_at is None or time.monotonic() - checked_at >= refresh
+
     def _log_rotation_status(self) -> Optional[Dict[str, Any]]:
         if not self._monitoring or not self._monitoring.log_rotation_task:
             return None
-        refresh = max(int(self._monitoring.log_rotation_probe_interval_s or 0), 1)
-        now = datetime.utcnow()
-        if self._log_rotation_checked_at and now - self._log_rotation_checked_at < timedelta(seconds=refresh):
+        if not self._log_rotation_due():
             return self._log_rotation_cache
+        return self._refresh_log_rotation()
+
+    def _refresh_log_rotation(self) -> Dict[str, Any]:
+        now = time.monotonic()
         status = _check_log_rotation_task(
             self._monitoring.log_rotation_task,
             int(self._monitoring.log_rotation_max_age_minutes or 0),
@@ -195,7 +421,55 @@ class HealthMonitor:
         self._log_rotation_checked_at = now
         return status
 
+    def _submit_log_rotation_probe(self) -> Optional[Future]:
+        """Start a due log-rotation probe on the pool, sharing one already running."""
+
+        if not self._log_rotation_due():
+            return None
+        with self._probe_lock:
+            if self._closed:
+                return None
+            future = self._log_rotation_future
+            if future is None or future.done():
+                if not self._log_rotation_due():
+                    return None
+                if self._probe_pool is None:
+                    self._probe_pool = ThreadPoolExecutor(
+                        max_workers=HEALTH_PROBE_WORKERS,
+                        thread_name_prefix='health-probe',
+                    )
+                future = self._probe_pool.submit(self._refresh_log_rotation)
+                self._log_rotation_future = future
+            return future
+
     def _command_metrics(self) -> Dict[str, Any]:
+        ttl = self._monitoring.command_metrics_ttl_s if self._monitoring else DEFAULT_COMMAND_METRICS_TTL_S
+        metrics, fetched_at = self._command_metrics_cache
+        if fetched_at is not None and time.monotonic() - fetched_at < ttl:
+            return metrics
+        # Single-flight: concurrent /health requests share one service call
+        # instead of contending for the acquisition locks in parallel.
+        with self._command_metrics_lock:
+            inflight = self._command_metrics_inflight
+            leader = inflight is None
+            if leader:
+                inflight = self._command_metrics_inflight = threading.Event()
+        if not leader:
+            # Fall back to the previous result only once there is one; before
+            # the first fetch completes the `{}` placeholder would read as "no
+            # commands", so wait for the leader instead.
+            inflight.wait(COMMAND_METRICS_WAIT_S if fetched_at is not None else None)
+            return self._command_metrics_cache[0]
+        try:
+            metrics = self._fetch_command_metrics()
+            self._command_metrics_cache = (metrics, time.monotonic())
+        finally:
+            with self._command_metrics_lock:
+                self._command_metrics_inflight = None
+            inflight.set()
+        return metrics
+
+    def _fetch_command_metrics(self) -> Dict[str, Any]:
         service = self._service
         if hasattr(service, 'command_metrics'):
             try:
@@ -218,22 +492,36 @@ class HealthMonitor:
         }
         if payload is not None:
             record['payload'] = payload
-        self._watchdog_events.appendleft(record)
+        self._watchdog_events[self._watchdog_head] = record
+        self._watchdog_head = (self._watchdog_head + 1) % WATCHDOG_HISTORY_SIZE
+        self._watchdog_count = min(self._watchdog_count + 1, WATCHDOG_HISTORY_SIZE)
+        self._watchdog_history = None
+        self._watchdog_generation += 1
         if kind == 'timeout':
             self._watchdog_alert = message
-            if payload is None:
-                self._watchdog_detail = None
-            elif isinstance(payload, dict):
-                try:
-                    self._watchdog_detail = json.dumps(payload, ensure_ascii=False)
-                except TypeError:  # pragma: no cover - non-serialisable payload
-                    self._watchdog_detail = str(payload)
-            else:
-                self._watchdog_detail = str(payload)
+            # Formatted lazily by _watchdog_detail_text(); bursts of timeouts
+            # that nobody polls for never pay for the JSON encoding.
+            self._watchdog_detail_payload = payload
+            self._watchdog_detail = None
         elif kind == 'recovery':
             self._watchdog_alert = None
+            self._watchdog_detail_payload = None
             self._watchdog_detail = None
 
+    def _watchdog_detail_text(self) -> Optional[str]:
+        payload = self._watchdog_detail_payload
+        if payload is None or self._watchdog_detail is not None:
+            return self._watchdog_detail
+        if isinstance(payload, dict):
+            try:
+                detail = json.dumps(payload, ensure_ascii=False)
+            except TypeError:  # pragma: no cover - non-serialisable payload
+                detail = str(payload)
+        else:
+            detail = str(payload)
+        self._watchdog_detail = detail
+        return detail
+
     def update_watchdog(self, message: str, detail: Optional[str] = None) -> None:
         payload: Optional[Dict[str, Any]] = None
         if detail is not None:
@@ -244,25 +532,69 @@ class HealthMonitor:
         self.record_watchdog_event('recovery', 'Watchdog recovered', datetime.utcnow())
 
 
-    def recent_events(self, *, limit: int = 20, since_id: Optional[int] = None) -> list[Dict[str, Any]]:
-        """Return recent audit events for diagnostics dashboards."""
+    def recent_events(
+        self,
+        *,
+        limit: int = 20,
+        since_id: Optional[int] = None,
+        ascending: bool = False,
+        level: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> list[Dict[str, Any]]:
+        """Return recent audit events for diagnostics dashboards.
+
+        Events are newest-first unless *ascending* is set, in which case the
+        database returns them in id order. *level*/*category* filters are
+        applied by the query (see `Database.recent_audit_events`).
+        """
 
         database = getattr(self._service, 'database', None)
         if database is None or not hasattr(database, 'recent_audit_events'):
             return []
-        return database.recent_audit_events(limit=limit, since_id=since_id)
+        options: Dict[str, Any] = {}
+        if ascending:
+            options['order'] = 'asc'
+        if level:
+            options['level'] = level
+        if category:
+            options['category'] = category
+        return database.recent_audit_events(limit=limit, since_id=since_id, **options)
+
+    def audit_generation(self) -> Optional[int]:
+        """Return the audit-event change counter, or None without notification support."""
+
+        database = getattr(self._service, 'database', None)
+        generation = getattr(database, 'audit_generation', None)
+        return generation if isinstance(generation, int) else None
+
+    def wait_for_audit_events(self, generation: int, timeout: float) -> int:
+        """Block until a new audit event is committed or *timeout* elapses."""
+
+        return self._service.database.wait_for_audit_events(generation, timeout)  # type: ignore[attr-defined]
 
     def snapshot(self) -> HealthStatus:
         start = time.perf_counter()
         stats = self._service.stats
-        state = 'running' if not self._service._stop_requested else 'stopping'  # pylint: disable=protected-access
+        state = 'running' if not self._service.stop_requested else 'stopping'
         lock_metrics: Optional[Dict[str, Any]] = None
         lock_stats = getattr(stats, 'interface_lock', None)
         if lock_stats is not None:
             try:
-                lock_metrics = asdict(lock_stats)
+                lock_metrics = _flat_dataclass_dict(lock_stats)
             except TypeError:  # pragma: no cover - defensive fallback
                 lock_metrics = None
+        # A due log-rotation probe (PowerShell round-trip) runs on the pool
+        # while the command metrics are gathered here, so the worst case is
+        # the slower of the two rather than their sum.
+        log_rotation_future = self._submit_log_rotation_probe()
+        command_metrics = self._command_metrics()
+        if log_rotation_future is None:
+            log_rotation = self._log_rotation_status()
+        else:
+            try:
+                log_rotation = log_rotation_future.result(timeout=LOG_ROTATION_TIMEOUT_S + 1)
+            except (FutureTimeoutError, CancelledError):  # pragma: no cover - probe stuck or pool closed
+                log_rotation = self._log_rotation_cache
         status = HealthStatus(
             state=state,
             frames=stats.frames,
@@ -270,10 +602,10 @@ class HealthMonitor:
             last_frame_at=stats.last_frame_at,
             last_window_started=stats.last_window_started,
             watchdog_alert=self._watchdog_alert,
-            detail=self._watchdog_detail,
-            log_rotation=self._log_rotation_status(),
-            watchdog_history=list(self._watchdog_events),
-            command_metrics=self._command_metrics(),
+            detail=self._watchdog_detail_text(),
+            log_rotation=log_rotation,
+            watchdog_history=self._watchdog_history_list(),
+            command_metrics=command_metrics,
             interface_lock=lock_metrics,
             analytics_profile=getattr(stats, 'analytics_profile', None),
             latest_measurement=getattr(stats, 'latest_measurement', None),
@@ -283,6 +615,79 @@ class HealthMonitor:
         status.response_times = self._response_time_payload(duration)
         return status
 
+    def snapshot_bytes(self) -> bytes:
+        """Return the JSON-encoded snapshot, reusing it while nothing changed."""
+
+        return self.snapshot_payload()[0]
+
+    def snapshot_payload(self) -> Tuple[bytes, str]:
+        """Return the JSON-encoded snapshot together with its weak ETag.
+
+        The ETag hashes the snapshot key together with a generation counter
+        for the body fields the key does not cover (command metrics, interface
+        lock, log rotation, analytics). It is therefore stable across rebuilds
+        that only refresh `response_times` and costs no second encode.
+        """
+
+        cached = self._fresh_snapshot_cache()
+        if cached is not None:
+            return cached
+        # Pollers arriving together rebuild the body once; the rest reuse it.
+        with self._snapshot_lock:
+            cached = self._fresh_snapshot_cache()
+            if cached is not None:
+                return cached
+            key = self._snapshot_key()
+            status = self.snapshot()
+            body = dumps_bytes(health_status_to_dict(status))
+            extras = (
+                status.command_metrics,
+                status.interface_lock,
+                status.log_rotation,
+                status.analytics_profile,
+                status.latest_measurement,
+            )
+            if extras != self._snapshot_extras:
+                self._snapshot_extras = extras
+                self._snapshot_extras_generation += 1
+            etag = 'W/"%016x"' % (hash((key, self._snapshot_extras_generation)) & 0xFFFFFFFFFFFFFFFF)
+            self._snapshot_cache = (key, body, etag, time.monotonic())
+            return body, etag
+
+    def _fresh_snapshot_cache(self) -> Optional[Tuple[bytes, str]]:
+        cached = self._snapshot_cache
+        if cached is None or time.monotonic() - cached[3] >= SNAPSHOT_CACHE_MAX_AGE_S:
+            return None
+        if cached[0] != self._snapshot_key():
+            return None
+        return cached[1], cached[2]
+
+    def _snapshot_key(self) -> Tuple[Any, ...]:
+        stats = self._service.stats
+        return (
+            self._service.stop_requested,
+            stats.frames,
+            stats.bytes_read,
+            stats.last_frame_at,
+            stats.last_window_started,
+            self._watchdog_generation,
+            self._log_rotation_checked_at,
+        )
+
+    def _watchdog_history_list(self) -> List[Dict[str, Any]]:
+        """Return watchdog events newest-first, rebuilt only after new events."""
+
+        history = self._watchdog_history
+        if history is None:
+            buffer = self._watchdog_events
+            head = self._watchdog_head
+            history = [
+                buffer[(head - 1 - offset) % WATCHDOG_HISTORY_SIZE]  # type: ignore[misc]
+                for offset in range(self._watchdog_count)
+            ]
+            self._watchdog_history = history
+        return history
+
     def _response_time_payload(self, last_duration: float) -> Dict[str, Any]:
         samples = list(self._response_times)
         average = sum(samples) / len(samples) if samples else 0.0
@@ -1,32 +1,74 @@
 ﻿"""Health/status API server for the acquisition service."""
 from __future__ import annotations
 
-import json
+import io
+import os
+import re
+import selectors
+import socket
 import threading
 import time
-from dataclasses import asdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import unquote_plus, urlsplit
 from typing import Optional, Tuple
 
-from .diagnostics import build_diagnostic_bundle
-from .health import HealthMonitor, health_status_to_dict
+from .diagnostics import write_diagnostic_bundle
+from .health import HealthMonitor
 from ..reporting.session import build_session_evaluation
+from ..serialization import dumps_bytes
 
 
-def _serialize_datetime(value):
-    if value is None:
-        return None
-    return value.isoformat()
+# `/sessions/<identifier>` plus an optional sub-route such as `/evaluation`.
+_SESSION_ROUTE = re.compile(r'/sessions/([^/]+)(/.+)?')
+# Characters that are not allowed in Windows filenames.
+_FILENAME_TABLE = str.maketrans({ch: '_' for ch in '\\/:*?"<>|'})
 
 
-def _snapshot_dict(status):
-    payload = asdict(status)
-    payload['last_frame_at'] = _serialize_datetime(status.last_frame_at)
-    payload['last_window_started'] = _serialize_datetime(status.last_window_started)
-    return payload
+def _query_param(query: str, key: str, default=None):
+    """Return the last value of *key* in a raw query string.
+
+    Mirrors `parse_qs` semantics (blank values are ignored) without building
+    a dict of lists for parameters the handler never reads.
+    """
+
+    value = default
+    for pair in query.split('&'):
+        name, separator, raw = pair.partition('=')
+        if not separator or not raw:
+            continue
+        if name != key and unquote_plus(name) != key:
+            continue
+        value = unquote_plus(raw)
+    return value
+
+
+def _split_query(query: str) -> dict[str, str]:
+    """Parse a raw query string into single values (last non-blank one wins).
+
+    Equivalent to `{key: values[-1] for key, values in parse_qs(query).items()}`
+    without the intermediate lists.
+    """
+
+    params: dict[str, str] = {}
+    for pair in query.split('&'):
+        name, separator, raw = pair.partition('=')
+        if separator and raw:
+            params[unquote_plus(name)] = unquote_plus(raw)
+    return params
+
+
+def _split_target(target: str) -> Tuple[str, str]:
+    """Split a request target into `(path without trailing slash, query)`."""
+
+    if not target.startswith('/'):  # absolute-form target, e.g. via a proxy
+        parts = urlsplit(target)
+        return parts.path.rstrip('/'), parts.query
+    path, _, query = target.partition('?')
+    query = query.partition('#')[0]
+    return path.rstrip('/'), query
+
 
 def _clamp_int(value, default, minimum=None, maximum=None):
     try:
@@ -50,372 +92,944 @@ def _parse_float(value, default, minimum=None):
     return result
 
 
-def _stream_log_events(
-    monitor,
-    writer,
-    *,
-    since_id=None,
-    limit=50,
-    interval_s=1.0,
-    heartbeat_interval_s=15.0,
-    max_loops=None,
-):
-    """Stream audit events via Server-Sent Events."""
+_CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type'),
+)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an `If-None-Match` header against *etag*."""
+
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _response_head(status: HTTPStatus, headers) -> bytes:
+    """Pre-render a status line plus headers (CORS included), minus the blank line."""
+
+    lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+    lines.extend(f'{name}: {value}' for name, value in (*headers, *_CORS_HEADERS))
+    return ('\r\n'.join(lines) + '\r\n').encode('latin-1')
+
+
+# /health bodies are cached server-side and carry an ETag; clients must
+# revalidate on every poll rather than reuse their own copy.
+_HEALTH_CACHE_CONTROL = ('Cache-Control', 'max-age=0, must-revalidate')
+
+# Invariant response heads for the hot endpoints, written in a single call
+# instead of a send_header() round-trip per line.
+_HEALTH_RESPONSE_HEAD = _response_head(
+    HTTPStatus.OK,
+    (('Content-Type', 'application/json; charset=utf-8'), _HEALTH_CACHE_CONTROL),
+)
+_SSE_RESPONSE_HEAD = _response_head(
+    HTTPStatus.OK,
+    (
+        ('Content-Type', 'text/event-stream; charset=utf-8'),
+        ('Cache-Control', 'no-cache'),
+        ('Connection', 'keep-alive'),
+    ),
+) + b'\r\n'
+_NOT_MODIFIED_HEAD = _response_head(HTTPStatus.NOT_MODIFIED, (_HEALTH_CACHE_CONTROL,))
+_SSE_HEARTBEAT = b': heartbeat\n\n'
+_SSE_EVENT_FRAME = b'id: %d\nevent: log\ndata: %b\n\n'
+_SUBSCRIBER_BACKLOG = 64
+_HUB_FETCH_LIMIT = 500
+_HUB_IDLE_WAIT_S = 1.0
+_BUNDLE_CACHE_TTL_S = 2.0
+# Bundles larger than this are streamed without keeping a cached copy.
+_BUNDLE_CACHE_MAX_BYTES = 8 << 20
+# Unsent bytes a detached SSE client may accumulate before it is dropped.
+_SSE_BUFFER_LIMIT = 1 << 20
+# Request workers; SSE clients are detached to the log hub and do not hold one.
+_REQUEST_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Idle keep-alive connections release their worker after this many seconds;
+# kept short so a few idle browser tabs cannot starve the pool.
+_KEEPALIVE_TIMEOUT_S = 5.0
+
+
+def _event_frames(events) -> list[tuple[int, bytes]]:
+    """Encode audit events as `(id, SSE frame)` pairs, skipping malformed rows."""
+
+    frames: list[tuple[int, bytes]] = []
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        event_id = event.get('id')
+        if event_id is None:
+            continue
+        try:
+            event_id = int(event_id)
+        except (TypeError, ValueError):
+            continue
+        frames.append((event_id, _SSE_EVENT_FRAME % (event_id, dumps_bytes(event))))
+    return frames
+
+
+class _SocketStream:
+    """SSE connection detached from its handler thread and written by the hub.
+
+    Batches published before `start` are held back so they follow the
+    backlog; afterwards frames are appended to an outgoing buffer that the
+    hub's writer thread drains with non-blocking sends.
+    """
+
+    def __init__(self, sock: socket.socket, heartbeat_interval_s: float) -> None:
+        self.sock = sock
+        self._heartbeat_interval_s = heartbeat_interval_s
+        self._lock = threading.Lock()
+        self._held: Optional[list[list[tuple[int, bytes]]]] = []
+        self._buffer = bytearray()
+        self._last_id: Optional[int] = None
+        self._heartbeat_due = time.monotonic() + heartbeat_interval_s
+        self.closed = False
+
+    @property
+    def heartbeat_due(self) -> float:
+        return self._heartbeat_due
+
+    def publish(self, batch: list[tuple[int, bytes]]) -> bool:
+        with self._lock:
+            if self.closed:
+                return False
+            if self._held is not None:
+                if len(self._held) >= _SUBSCRIBER_BACKLOG:
+                    self.closed = True
+                    return False
+                self._held.append(batch)
+                return True
+            self._append(batch)
+            if len(self._buffer) > _SSE_BUFFER_LIMIT:
+                # The client cannot keep up; drop it so it reconnects with
+                # Last-Event-ID and catches up from the database.
+                self.closed = True
+                return False
+            return True
+
+    def start(self, prefix: bytes, last_id: Optional[int]) -> None:
+        with self._lock:
+            self._buffer += prefix
+            self._last_id = last_id
+            held, self._held = self._held or [], None
+            for batch in held:
+                self._append(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            self.closed = True
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._buffer)
+
+    def send_pending(self, now: float) -> bool:
+        """Send what the socket accepts without blocking; False once finished."""
+
+        with self._lock:
+            if self.closed:
+                return False
+            if self._held is None and not self._buffer and now >= self._heartbeat_due:
+                self._buffer += _SSE_HEARTBEAT
+                self._heartbeat_due = now + self._heartbeat_interval_s
+            if not self._buffer:
+                return True
+            try:
+                sent = self.sock.send(self._buffer)
+            except (BlockingIOError, InterruptedError):
+                return True
+            except OSError:
+                self.closed = True
+                return False
+            del self._buffer[:sent]
+            return True
+
+    def _append(self, batch: list[tuple[int, bytes]]) -> None:
+        if self._last_id is not None:
+            batch = [item for item in batch if item[0] > self._last_id]
+        if batch:
+            self._last_id = batch[-1][0]
+            self._buffer += b''.join(frame for _, frame in batch)
+            self._heartbeat_due = time.monotonic() + self._heartbeat_interval_s
+
+
+def _close_socket(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    sock.close()
+
+
+class _LogEventHub:
+    """Single publisher that fans new audit events out to every SSE client.
+
+    One background thread waits for audit-event commits (or polls when the
+    monitor has no change notifications), queries the database once and
+    encodes each event once, regardless of how many dashboards are attached.
+    HTTP streams are handed over as `_SocketStream`s and written by a second
+    thread multiplexing all sockets with `selectors`, so an idle dashboard
+    holds no request thread. Both threads exit when their last client leaves.
+    """
+
+    def __init__(self, monitor: HealthMonitor, poll_interval_s: float = 1.0) -> None:
+        self._monitor = monitor
+        self._poll_interval_s = poll_interval_s
+        self._lock = threading.Lock()
+        self._subscribers: set[_SocketStream] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self._last_id = 0
+        self._new_streams: list[_SocketStream] = []
+        self._writer: Optional[threading.Thread] = None
+        self._wake_reader: Optional[socket.socket] = None
+        self._wake_writer: Optional[socket.socket] = None
+
+    def subscribe(self, subscription: _SocketStream, poll_interval_s: Optional[float] = None) -> _SocketStream:
+        """Register *subscription* and start the publisher thread if needed."""
+
+        with self._lock:
+            if self._closed.is_set():
+                subscription.close()
+                return subscription
+            if poll_interval_s:
+                self._poll_interval_s = max(min(self._poll_interval_s, poll_interval_s), 0.05)
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._last_id = self._latest_event_id()
+                self._thread = threading.Thread(target=self._run, name='health-log-hub', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def open_stream(
+        self,
+        sock: socket.socket,
+        *,
+        heartbeat_interval_s: float,
+        poll_interval_s: Optional[float] = None,
+    ) -> _SocketStream:
+        """Subscribe *sock*; events are held until `start_stream` is called."""
 
+        return self.subscribe(_SocketStream(sock, heartbeat_interval_s), poll_interval_s)
+
+    def start_stream(self, stream: _SocketStream, prefix: bytes, last_id: Optional[int]) -> None:
+        """Queue *prefix* and take over writing *stream* from the caller."""
+
+        stream.start(prefix, last_id)
+        with self._lock:
+            if self._closed.is_set():
+                _close_socket(stream.sock)
+                return
+            self._new_streams.append(stream)
+            if self._writer is None:
+                if self._wake_reader is None:
+                    self._wake_reader, self._wake_writer = socket.socketpair()
+                    self._wake_reader.setblocking(False)
+                    self._wake_writer.setblocking(False)
+                self._writer = threading.Thread(target=self._write_streams, name='health-sse-writer', daemon=True)
+                self._writer.start()
+        self._wake()
+
+    def unsubscribe(self, subscription: _SocketStream) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+        subscription.close()
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+            threads = [self._thread, self._writer]
+        for subscription in subscribers:
+            subscription.close()
+        self._wake()
+        for thread in threads:
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=_HUB_IDLE_WAIT_S * 2)
+        with self._lock:
+            for wake_socket in (self._wake_reader, self._wake_writer):
+                if wake_socket is not None:
+                    wake_socket.close()
+            self._wake_reader = self._wake_writer = None
+
+    def _wake(self) -> None:
+        wake_socket = self._wake_writer
+        if wake_socket is None:
+            return
+        try:
+            wake_socket.send(b'\0')
+        except OSError:  # full (a wake-up is already pending) or closed
+            pass
+
+    def _latest_event_id(self) -> int:
+        try:
+            events = self._monitor.recent_events(limit=1)
+        except Exception:  # pragma: no cover - defensive guard
+            return 0
+        return max((event_id for event_id, _ in _event_frames(events)), default=0)
+
+    def _run(self) -> None:
+        monitor = self._monitor
+        generation = monitor.audit_generation()
+        while not self._closed.is_set():
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self._publish_new_events()
+            if generation is not None:
+                generation = monitor.wait_for_audit_events(generation, _HUB_IDLE_WAIT_S)
+            else:
+                self._closed.wait(self._poll_interval_s)
+        with self._lock:
+            self._thread = None
+
+    def _publish_new_events(self) -> None:
+        while True:
+            try:
+                events = self._monitor.recent_events(
+                    limit=_HUB_FETCH_LIMIT,
+                    since_id=self._last_id,
+                    ascending=True,
+                )
+            except Exception:  # pragma: no cover - defensive guard
+                return
+            batch = _event_frames(events)
+            if batch:
+                self._last_id = max(self._last_id, batch[-1][0])
+                with self._lock:
+                    subscribers = list(self._subscribers)
+                for subscription in subscribers:
+                    if not subscription.publish(batch):
+                        self.unsubscribe(subscription)
+                self._wake()
+            if len(events) < _HUB_FETCH_LIMIT:
+                return
+
+    def _write_streams(self) -> None:
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_reader, selectors.EVENT_READ)
+        streams: dict[_SocketStream, int] = {}
+        try:
+            while not self._closed.is_set():
+                with self._lock:
+                    added, self._new_streams = self._new_streams, []
+                    if not added and not streams:
+                        self._writer = None
+                        return
+                for stream in added:
+                    stream.sock.setblocking(False)
+                    selector.register(stream.sock, selectors.EVENT_READ, stream)
+                    streams[stream] = selectors.EVENT_READ
+                now = time.monotonic()
+                for stream in list(streams):
+                    if not stream.send_pending(now):
+                        selector.unregister(stream.sock)
+                        del streams[stream]
+                        self.unsubscribe(stream)
+                        _close_socket(stream.sock)
+                        continue
+                    mask = selectors.EVENT_READ
+                    if stream.has_pending():
+                        mask |= selectors.EVENT_WRITE
+                    if mask != streams[stream]:
+                        selector.modify(stream.sock, mask, stream)
+                        streams[stream] = mask
+                if not streams:
+                    continue
+                wake_at = min(stream.heartbeat_due for stream in streams)
+                for key, mask in selector.select(max(wake_at - time.monotonic(), 0.0)):
+                    if key.data is None:
+                        try:
+                            key.fileobj.recv(4096)
+                        except OSError:
+                            pass
+                    elif mask & selectors.EVENT_READ:
+                        # SSE clients never send after the request; readable
+                        # means EOF or a reset, i.e. the dashboard went away.
+                        try:
+                            data = key.fileobj.recv(4096)
+                        except (BlockingIOError, InterruptedError):
+                            continue
+                        except OSError:
+                            data = b''
+                        if not data:
+                            key.data.close()
+        finally:
+            with self._lock:
+                if self._writer is threading.current_thread():
+                    self._writer = None
+                leftover, self._new_streams = self._new_streams, []
+            for stream in (*streams, *leftover):
+                self.unsubscribe(stream)
+                _close_socket(stream.sock)
+            selector.close()
+
+
+def _stream_log_events(monitor, writer, *, since_id=None, limit=50) -> Optional[int]:
+    """Write the SSE backlog of audit events after *since_id* to *writer*.
+
+    Pages of *limit* events are fetched until one comes back short, so the
+    backlog reaches the `_LogEventHub` cursor without gaps however far behind
+    *since_id* is. Returns the id of the last event written (or *since_id*).
+    Pages are not re-sorted: `HealthMonitor.recent_events(ascending=True)`
+    orders rows by id in SQL.
+    """
+
+    frames: list[tuple[int, bytes]] = []
     last_id = since_id
-    loops = 0
-    heartbeat_due = time.monotonic() + max(heartbeat_interval_s, interval_s)
     while True:
         try:
-            events = monitor.recent_events(limit=limit, since_id=last_id)
+            page = monitor.recent_events(limit=limit, since_id=last_id, ascending=True)
         except Exception:  # pragma: no cover - defensive guard
-            events = []
-        events_sorted = sorted(
-            events,
-            key=lambda item: item.get('id', 0) if isinstance(item, dict) else 0,
-        )
-        if events_sorted:
-            for event in events_sorted:
-                if not isinstance(event, dict):
-                    continue
-                event_id = event.get('id')
-                if event_id is None:
-                    continue
-                try:
-                    last_id = int(event_id)
-                except (TypeError, ValueError):
-                    continue
-                payload = json.dumps(event, ensure_ascii=False)
-                message = (
-                    f"id: {last_id}\n"
-                    "event: log\n"
-                    f"data: {payload}\n\n"
-                )
-                writer.write(message.encode('utf-8'))
-            writer.flush()
-            heartbeat_due = time.monotonic() + max(heartbeat_interval_s, interval_s)
-        else:
-            now = time.monotonic()
-            if now >= heartbeat_due:
-                writer.write(b': heartbeat\n\n')
-                writer.flush()
-                heartbeat_due = now + max(heartbeat_interval_s, interval_s)
-        loops += 1
-        if max_loops is not None and loops >= max_loops:
             break
-        sleep_interval = max(interval_s, 0.0)
-        if sleep_interval:
-            time.sleep(sleep_interval)
+        page_frames = _event_frames(page)
+        if page_frames:
+            if __debug__:
+                ids = [event_id for event_id, _ in page_frames]
+                assert ids == sorted(ids), 'recent_events(ascending=True) must return events in id order'
+            if last_id is not None and page_frames[-1][0] <= last_id:
+                break
+            frames.extend(page_frames)
+            last_id = page_frames[-1][0]
+        if len(page) < limit or not page_frames:
+            break
+    if not frames:
+        return since_id
+    writer.write(b''.join(frame for _, frame in frames))
+    writer.flush()
+    return last_id
 
 
+def _sendmsg_all(sock, buffers) -> None:
+    """Send *buffers* with one scatter-gather call, resuming after partial writes."""
 
+    views = [memoryview(buffer) for buffer in buffers]
+    try:
+        pending = [view for view in views if view.nbytes]
+        while pending:
+            sent = sock.sendmsg(pending)
+            while sent:
+                head = pending[0]
+                if sent >= head.nbytes:
+                    sent -= head.nbytes
+                    pending.pop(0)
+                else:
+                    pending[0] = head[sent:]
+                    sent = 0
+    finally:
+        for view in views:
+            view.release()
 
-def _handler_factory(monitor: HealthMonitor):
-    class HealthHandler(BaseHTTPRequestHandler):  # type: ignore[misc]
-        """Minimal handler that exposes /health JSON endpoint."""
 
-        protocol_version = "HTTP/1.1"
+class _ChunkedWriter:
+    """Minimal file-like adapter that emits HTTP/1.1 chunked transfer encoding.
 
-        def end_headers(self):  # noqa: D401
-            """Send standard headers plus CORS allowances."""
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-            super().end_headers()
+    Writes are coalesced into chunks of roughly *chunk_size* bytes. *on_start*
+    runs before the first byte is sent, which lets callers defer the status
+    line until the body is known to be producible. When the raw *sock* is
+    given (and supports `sendmsg`), each chunk goes out as a single writev of
+    size line, payload and trailer instead of being copied into one buffer.
+    With *chunked* false the body is written unframed for HTTP/1.0 clients,
+    which rely on the connection closing to delimit it.
+    """
 
-        def do_OPTIONS(self):  # pylint: disable=invalid-name
-            self.send_response(HTTPStatus.NO_CONTENT)
-            self.send_header('Content-Length', '0')
-            self.end_headers()
+    def __init__(
+        self,
+        stream,
+        on_start=None,
+        chunk_size: int = 64 * 1024,
+        sock=None,
+        capture=None,
+        capture_limit: Optional[int] = None,
+        chunked: bool = True,
+    ) -> None:
+        self._stream = stream
+        self._chunked = chunked
+        self._on_start = on_start
+        self._chunk_size = chunk_size
+        # Optional bytearray receiving a copy of the unframed body; the copy
+        # is abandoned once it would grow past *capture_limit* bytes.
+        self._capture = capture
+        self._capture_limit = capture_limit
+        self.capture_complete = capture is not None
+        # socket.sendmsg is unavailable on Windows; fall back to stream writes.
+        self._sock = sock if hasattr(sock, 'sendmsg') else None
+        self._buffer = bytearray()
+        self.started = False
 
-        def do_GET(self):  # pylint: disable=invalid-name
-            parsed = urlparse(self.path)
-            path = parsed.path.rstrip('/')
-            if path == '/health':
-                status = monitor.snapshot()
-                body = json.dumps(health_status_to_dict(status), ensure_ascii=False).encode('utf-8')
-                self.send_response(HTTPStatus.OK)
-                self.send_header('Content-Type', 'application/json; charset=utf-8')
-                self.send_header('Content-Length', str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
-            elif path == '/health/logs/stream':
-                self._handle_log_stream(parsed)
-            elif path == '/health/logs.ndjson':
-                self._handle_logs_ndjson(parsed)
-            elif path == '/health/bundle':
-                self._handle_bundle(parsed)
-            elif path == '/health/logs':
-                params = parse_qs(parsed.query)
-                limit_param = params.get('limit', ['20'])[-1]
-                since_param = params.get('since_id', [None])[-1]
-                try:
-                    limit = int(limit_param)
-                except (TypeError, ValueError):
-                    limit = 20
-                try:
-                    since_id = int(since_param) if since_param is not None else None
-                except (TypeError, ValueError):
-                    since_id = None
-                try:
-                    events = monitor.recent_events(limit=limit, since_id=since_id)
-                except Exception as exc:  # pragma: no cover - defensive
-                    self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to fetch events: {exc}')
-                    return
-                body = json.dumps({'events': events}, ensure_ascii=False).encode('utf-8')
-                self.send_response(HTTPStatus.OK)
-                self.send_header('Content-Type', 'application/json; charset=utf-8')
-                self.send_header('Content-Length', str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
-            elif path.startswith('/sessions'):
-                if not self._handle_sessions_route(parsed):
-                    self.send_error(HTTPStatus.NOT_FOUND, 'Endpoint not found')
+    def write(self, data) -> int:
+        self._buffer += data
+        if self._capture is not None:
+            if self._capture_limit is not None and len(self._capture) + len(data) > self._capture_limit:
+                self._capture.clear()
+                self._capture = None
+                self.capture_complete = False
             else:
-                self.send_error(HTTPStatus.NOT_FOUND, 'Endpoint not found')
+                self._capture += data
+        if len(self._buffer) >= self._chunk_size:
+            self._emit()
+        return len(data)
 
+    def flush(self) -> None:
+        # Chunks are emitted at size boundaries and by `finish`; flushing
+        # every zipfile member would produce many tiny chunks.
+        return
 
+    def finish(self) -> None:
+        self._emit()
+        self._start()
+        if self._chunked:
+            self._stream.write(b'0\r\n\r\n')
+        self._stream.flush()
 
-        def _handle_logs_ndjson(self, parsed):
-            params = parse_qs(parsed.query)
-            limit_param = params.get('limit', ['200'])[-1]
-            since_param = params.get('since_id', [None])[-1]
-            level_param = params.get('level', [None])[-1]
-            category_param = params.get('category', [None])[-1]
-            try:
-                limit = max(1, min(int(limit_param), 1000))
-            except (TypeError, ValueError):
-                limit = 200
-            try:
-                since_id = int(since_param) if since_param is not None else None
-            except (TypeError, ValueError):
-                since_id = None
+    def _start(self) -> None:
+        if not self.started:
+            self.started = True
+            if self._on_start is not None:
+                self._on_start()
 
-            try:
-                events = monitor.recent_events(limit=limit, since_id=since_id)
-            except Exception as exc:  # pragma: no cover - defensive
-                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to fetch events: {exc}')
-                return
+    def _emit(self) -> None:
+        if not self._buffer:
+            return
+        self._start()
+        if not self._chunked:
+            self._stream.write(self._buffer)
+        elif self._sock is not None:
+            _sendmsg_all(self._sock, (b'%X\r\n' % len(self._buffer), self._buffer, b'\r\n'))
+        else:
+            self._stream.write(b'%X\r\n%s\r\n' % (len(self._buffer), self._buffer))
+        self._buffer.clear()
 
-            if level_param or category_param:
-                filtered = []
-                for event in events:
-                    if not isinstance(event, dict):
-                        continue
-                    if level_param and str(event.get('level', '')).lower() != level_param.lower():
-                        continue
-                    if category_param and str(event.get('category', '')).lower() != category_param.lower():
-                        continue
-                    filtered.append(event)
-                events = filtered
 
+class _BundleCache:
+    """Most recent diagnostic bundle, reused for repeated downloads.
 
-            self.send_response(HTTPStatus.OK)
-            self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
+    An entry is valid for *ttl_s* seconds and only while no new audit events
+    were recorded (when the monitor exposes an audit generation).
+    """
 
-            for event in events:
-                if not isinstance(event, dict):
-                    continue
-                try:
-                    payload = json.dumps(event, ensure_ascii=False)
-                except (TypeError, ValueError):  # pragma: no cover - defensive
-                    continue
-                self.wfile.write(payload.encode('utf-8') + b'\n')
-            self.wfile.flush()
+    def __init__(self, ttl_s: float = _BUNDLE_CACHE_TTL_S) -> None:
+        self._ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._entry: Optional[Tuple[Tuple[int, int], Optional[int], float, bytes]] = None
+
+    def get(self, key: Tuple[int, int], generation: Optional[int]) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entry
+        if entry is None:
+            return None
+        entry_key, entry_generation, created_at, data = entry
+        if entry_key != key or entry_generation != generation:
+            return None
+        if time.monotonic() - created_at >= self._ttl_s:
+            return None
+        return data
+
+    def put(self, key: Tuple[int, int], generation: Optional[int], data: bytes) -> None:
+        with self._lock:
+            self._entry = (key, generation, time.monotonic(), data)
+
+
+class HealthHandler(BaseHTTPRequestHandler):  # type: ignore[misc]
+    """Minimal handler that exposes /health JSON endpoint."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = _KEEPALIVE_TIMEOUT_S
+
+    def end_headers(self):  # noqa: D401
+        """Send standard headers plus CORS allowances."""
+        for name, value in _CORS_HEADERS:
+            self.send_header(name, value)
+        super().end_headers()
+
+    def do_OPTIONS(self):  # pylint: disable=invalid-name
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        if _split_target(self.path)[0] == '/health':
+            self._send_health(include_body=False)
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND, 'Endpoint not found')
+
+    def _send_health(self, include_body: bool = True) -> None:
+        body, etag = self.server.monitor.snapshot_payload()
+        etag_bytes = etag.encode('ascii')
+        if _etag_matches(self.headers.get('If-None-Match'), etag):
+            self.wfile.write(b'%sETag: %s\r\n\r\n' % (_NOT_MODIFIED_HEAD, etag_bytes))
+            return
+        head = b'%sETag: %s\r\nContent-Length: %d\r\n\r\n' % (_HEALTH_RESPONSE_HEAD, etag_bytes, len(body))
+        self.wfile.write(head + body if include_body else head)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        path, query = _split_target(self.path)
+        route = self._routes.get(path)
+        if route is not None:
+            route(self, query)
+        elif not self._handle_sessions_route(path, query):
+            self.send_error(HTTPStatus.NOT_FOUND, 'Endpoint not found')
+
+    def _handle_health(self, query):  # pylint: disable=unused-argument
+        self._send_health()
+
+    def _handle_logs(self, query):
+        limit_param = _query_param(query, 'limit', '20')
+        since_param = _query_param(query, 'since_id')
+        try:
+            limit = int(limit_param)
+        except (TypeError, ValueError):
+            limit = 20
+        try:
+            since_id = int(since_param) if since_param is not None else None
+        except (TypeError, ValueError):
+            since_id = None
+        try:
+            events = self.server.monitor.recent_events(limit=limit, since_id=since_id)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to fetch events: {exc}')
+            return
+        body = dumps_bytes({'events': events})
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle_logs_ndjson(self, query):
+        params = _split_query(query)
+        limit_param = params.get('limit', '200')
+        since_param = params.get('since_id')
+        level_param = params.get('level')
+        category_param = params.get('category')
+        try:
+            limit = max(1, min(int(limit_param), 1000))
+        except (TypeError, ValueError):
+            limit = 200
+        try:
+            since_id = int(since_param) if since_param is not None else None
+        except (TypeError, ValueError):
+            since_id = None
+
+        try:
+            events = self.server.monitor.recent_events(
+                limit=limit,
+                since_id=since_id,
+                level=level_param,
+                category=category_param,
+            )
+        except Exception as exc:  # pragma: no cover - defensive
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to fetch events: {exc}')
             return
 
-        def _handle_bundle(self, parsed):
-            params = parse_qs(parsed.query)
-            event_limit = _clamp_int(params.get('events', ['200'])[-1], default=200, minimum=1, maximum=1000)
-            session_limit = _clamp_int(params.get('sessions', ['5'])[-1], default=5, minimum=0, maximum=100)
-            filename = params.get('filename', [None])[-1]
-            if not filename:
-                filename = f"elmetron_diagnostic_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.zip"
+        # wfile is unbuffered, so the body is assembled first and sent with
+        # a Content-Length in one write; this also keeps the connection
+        # reusable under HTTP/1.1.
+        body = bytearray()
+        for event in events:
+            if not isinstance(event, dict):
+                continue
             try:
-                bundle_bytes = build_diagnostic_bundle(
-                    monitor.service,
-                    monitor,
-                    event_limit=event_limit,
-                    session_limit=session_limit,
-                )
-            except Exception as exc:  # pragma: no cover - defensive
-                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to build diagnostic bundle: {exc}')
-                return
+                body += dumps_bytes(event, newline=True)
+            except (TypeError, ValueError):  # pragma: no cover - defensive
+                continue
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle_bundle(self, query):
+        params = _split_query(query)
+        event_limit = _clamp_int(params.get('events', '200'), default=200, minimum=1, maximum=1000)
+        session_limit = _clamp_int(params.get('sessions', '5'), default=5, minimum=0, maximum=100)
+        filename = params.get('filename')
+        if not filename:
+            filename = f"elmetron_diagnostic_{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.zip"
+        # HTTP/1.0 clients cannot parse chunked framing; the body is sent
+        # unframed instead and ends when the connection closes.
+        chunked = self.request_version != 'HTTP/1.0'
 
+        def _send_headers(content_length=None):
             self.send_response(HTTPStatus.OK)
             self.send_header('Content-Type', 'application/zip')
             self.send_header('Cache-Control', 'no-cache')
             self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
-            self.send_header('Content-Length', str(len(bundle_bytes)))
+            if content_length is None:
+                if chunked:
+                    self.send_header('Transfer-Encoding', 'chunked')
+                else:
+                    self.send_header('Connection', 'close')
+            else:
+                self.send_header('Content-Length', str(content_length))
             self.end_headers()
-            self.wfile.write(bundle_bytes)
 
+        cache_key = (event_limit, session_limit)
+        generation = self.server.monitor.audit_generation()
+        cached = self.server.bundle_cache.get(cache_key, generation)
+        if cached is not None:
+            _send_headers(len(cached))
+            self.wfile.write(cached)
+            return
 
-        def _handle_log_stream(self, parsed):
-            params = parse_qs(parsed.query)
-            limit = _clamp_int(params.get('limit', ['50'])[-1], default=50, minimum=1, maximum=500)
-            interval_s = _parse_float(params.get('interval_s', ['1'])[-1], default=1.0, minimum=0.0)
-            heartbeat_s = _parse_float(
-                params.get('heartbeat_s', ['15'])[-1],
-                default=15.0,
-                minimum=max(interval_s, 0.1) if interval_s else 0.1,
+        captured = bytearray()
+        writer = _ChunkedWriter(
+            self.wfile,
+            on_start=_send_headers,
+            sock=self.connection,
+            capture=captured,
+            capture_limit=_BUNDLE_CACHE_MAX_BYTES,
+            chunked=chunked,
+        )
+        try:
+            write_diagnostic_bundle(
+                writer,
+                self.server.monitor.service,
+                self.server.monitor,
+                event_limit=event_limit,
+                session_limit=session_limit,
             )
-            since_param = params.get('since_id', [None])[-1]
-            last_event_header = self.headers.get('Last-Event-ID') if hasattr(self, 'headers') else None
-            since_id = None
-            for candidate in (last_event_header, since_param):
-                if candidate is None:
-                    continue
-                try:
-                    since_id = int(candidate)
-                except (TypeError, ValueError):
-                    continue
-                else:
-                    break
-
-            self.send_response(HTTPStatus.OK)
-            self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
-            self.send_header('Cache-Control', 'no-cache')
-            self.send_header('Connection', 'keep-alive')
-            self.end_headers()
-            retry_ms = max(int(max(interval_s, 0.5) * 1000), 1000)
-            try:
-                self.wfile.write(f'retry: {retry_ms}\n\n'.encode('utf-8'))
-                self.wfile.flush()
-                _stream_log_events(
-                    monitor,
-                    self.wfile,
-                    since_id=since_id,
-                    limit=limit,
-                    interval_s=max(interval_s, 0.0),
-                    heartbeat_interval_s=max(heartbeat_s, 0.1),
-                )
-            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):  # pragma: no cover - client disconnect
-                return
-            except Exception:  # pragma: no cover - defensive
+            writer.finish()
+            if writer.capture_complete:
+                self.server.bundle_cache.put(cache_key, generation, bytes(captured))
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):  # pragma: no cover - client disconnect
+            self.close_connection = True
+        except Exception as exc:  # pragma: no cover - defensive
+            if writer.started:
+                # Headers are gone; dropping the connection without the
+                # terminating chunk tells the client the body is truncated.
+                self.close_connection = True
                 return
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to build diagnostic bundle: {exc}')
 
-        def _handle_sessions_route(self, parsed):
-            segments = [segment for segment in parsed.path.split('/') if segment]
-            if not segments or segments[0] != 'sessions':
-                return False
 
-            if len(segments) == 2 and segments[1] == 'recent':
-                self._handle_sessions_recent(parsed)
-                return True
+    def _handle_log_stream(self, query):
+        limit = _clamp_int(_query_param(query, 'limit', '50'), default=50, minimum=1, maximum=500)
+        interval_s = _parse_float(_query_param(query, 'interval_s', '1'), default=1.0, minimum=0.0)
+        heartbeat_s = _parse_float(
+            _query_param(query, 'heartbeat_s', '15'),
+            default=15.0,
+            minimum=max(interval_s, 0.1) if interval_s else 0.1,
+        )
+        since_param = _query_param(query, 'since_id')
+        last_event_header = self.headers.get('Last-Event-ID') if hasattr(self, 'headers') else None
+        since_id = None
+        for candidate in (last_event_header, since_param):
+            if candidate is None:
+                continue
+            try:
+                since_id = int(candidate)
+            except (TypeError, ValueError):
+                continue
+            else:
+                break
 
-            if len(segments) >= 2:
-                try:
-                    session_id = int(segments[1])
-                except (TypeError, ValueError):
-                    self.send_error(HTTPStatus.BAD_REQUEST, 'Invalid session identifier')
-                    return True
-                if len(segments) == 3 and segments[2] == 'evaluation':
-                    self._handle_session_evaluation(session_id, parsed)
-                    return True
-                if len(segments) == 4 and segments[2] == 'evaluation' and segments[3] == 'export':
-                    self._handle_session_evaluation_export(session_id, parsed)
-                    return True
+        retry_ms = max(int(max(interval_s, 0.5) * 1000), 1000)
+        # Subscribe before reading the backlog so nothing committed in
+        # between is missed; the stream drops duplicates by id.
+        stream = self.server.log_hub.open_stream(
+            self.connection,
+            heartbeat_interval_s=max(heartbeat_s, 0.1),
+            poll_interval_s=interval_s,
+        )
+        backlog = io.BytesIO()
+        backlog.write(b'%sretry: %d\n\n' % (_SSE_RESPONSE_HEAD, retry_ms))
+        try:
+            last_id = _stream_log_events(self.server.monitor, backlog, since_id=since_id, limit=limit)
+        except Exception:
+            self.server.log_hub.unsubscribe(stream)
+            raise
+        # From here on the hub owns the socket and this thread returns.
+        self.close_connection = True
+        self.server.detach_request(self.connection)
+        self.server.log_hub.start_stream(stream, backlog.getvalue(), last_id)
+
+    def _handle_sessions_route(self, path, query):
+        match = _SESSION_ROUTE.fullmatch(path)
+        if match is None:
+            return False
+        identifier, suffix = match.groups()
+        if identifier == 'recent' and suffix is None:
+            self._handle_sessions_recent(query)
+            return True
+        try:
+            session_id = int(identifier)
+        except (TypeError, ValueError):
+            self.send_error(HTTPStatus.BAD_REQUEST, 'Invalid session identifier')
+            return True
+        route = self._session_routes.get(suffix)
+        if route is None:
             return False
+        route(self, session_id, query)
+        return True
 
-        def _database(self):
-            service = getattr(monitor, 'service', None)
-            if service is None:
-                return None
-            return getattr(service, 'database', None)
+    def _database(self):
+        service = getattr(self.server.monitor, 'service', None)
+        if service is None:
+            return None
+        return getattr(service, 'database', None)
 
-        def _handle_sessions_recent(self, parsed):
-            database = self._database()
-            if database is None or not hasattr(database, 'recent_sessions'):
-                self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, 'Session catalogue unavailable')
-                return
-            params = parse_qs(parsed.query)
-            limit_param = params.get('limit', ['10'])[-1]
-            try:
-                limit = max(1, min(int(limit_param), 50))
-            except (TypeError, ValueError):
-                limit = 10
-            try:
-                sessions = database.recent_sessions(limit=limit)
-            except Exception as exc:  # pragma: no cover - defensive
-                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to load sessions: {exc}')
-                return
-            body = json.dumps({'sessions': sessions}, ensure_ascii=False).encode('utf-8')
-            self.send_response(HTTPStatus.OK)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Content-Length', str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+    def _handle_sessions_recent(self, query):
+        database = self._database()
+        if database is None or not hasattr(database, 'recent_sessions'):
+            self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, 'Session catalogue unavailable')
+            return
+        params = _split_query(query)
+        limit_param = params.get('limit', '10')
+        try:
+            limit = max(1, min(int(limit_param), 50))
+        except (TypeError, ValueError):
+            limit = 10
+        try:
+            sessions = database.recent_sessions(limit=limit)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to load sessions: {exc}')
+            return
+        body = dumps_bytes({'sessions': sessions})
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-        def _handle_session_evaluation(self, session_id: int, parsed):
-            database = self._database()
-            if database is None:
-                self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, 'Session evaluation unavailable')
-                return
-            params = parse_qs(parsed.query)
-            anchor = params.get('anchor', ['start'])[-1] or 'start'
-            try:
-                payload = build_session_evaluation(database, session_id, anchor=anchor)
-            except Exception as exc:  # pragma: no cover - defensive
-                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to build evaluation: {exc}')
-                return
-            if payload is None:
-                self.send_error(HTTPStatus.NOT_FOUND, 'Session not found')
-                return
-            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
-            self.send_response(HTTPStatus.OK)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Cache-Control', 'no-cache')
-            self.send_header('Content-Length', str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+    def _handle_session_evaluation(self, session_id: int, query):
+        database = self._database()
+        if database is None:
+            self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, 'Session evaluation unavailable')
+            return
+        params = _split_query(query)
+        anchor = params.get('anchor', 'start') or 'start'
+        try:
+            payload = build_session_evaluation(database, session_id, anchor=anchor)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to build evaluation: {exc}')
+            return
+        if payload is None:
+            self.send_error(HTTPStatus.NOT_FOUND, 'Session not found')
+            return
+        body = dumps_bytes(payload)
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-        def _handle_session_evaluation_export(self, session_id: int, parsed):
-            database = self._database()
-            if database is None:
-                self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, 'Session evaluation unavailable')
-                return
-            params = parse_qs(parsed.query)
-            anchor = params.get('anchor', ['start'])[-1] or 'start'
-            export_format = (params.get('format', ['json'])[-1] or 'json').lower()
-            filename_param = params.get('filename', [None])[-1]
-            try:
-                payload = build_session_evaluation(database, session_id, anchor=anchor)
-            except Exception as exc:  # pragma: no cover - defensive
-                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to build evaluation: {exc}')
-                return
-            if payload is None:
-                self.send_error(HTTPStatus.NOT_FOUND, 'Session not found')
-                return
-            if export_format != 'json':
-                self.send_error(HTTPStatus.BAD_REQUEST, 'Unsupported export format')
-                return
-            body = json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
-            filename = self._safe_filename(
-                filename_param,
-                f'session_{session_id}_evaluation.json',
-            )
-            self.send_response(HTTPStatus.OK)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
-            self.send_header('Content-Length', str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+    def _handle_session_evaluation_export(self, session_id: int, query):
+        database = self._database()
+        if database is None:
+            self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, 'Session evaluation unavailable')
+            return
+        params = _split_query(query)
+        anchor = params.get('anchor', 'start') or 'start'
+        export_format = (params.get('format', 'json') or 'json').lower()
+        filename_param = params.get('filename')
+        try:
+            payload = build_session_evaluation(database, session_id, anchor=anchor)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'Failed to build evaluation: {exc}')
+            return
+        if payload is None:
+            self.send_error(HTTPStatus.NOT_FOUND, 'Session not found')
+            return
+        if export_format != 'json':
+            self.send_error(HTTPStatus.BAD_REQUEST, 'Unsupported export format')
+            return
+        body = dumps_bytes(payload, indent=True)
+        filename = self._safe_filename(
+            filename_param,
+            f'session_{session_id}_evaluation.json',
+        )
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-        @staticmethod
-        def _safe_filename(candidate, default):
-            if not candidate:
-                return default
-            stripped = ''.join('_' if ch in '\\/:*?"<>|' else ch for ch in str(candidate))
-            stripped = stripped.strip() or default
-            return stripped
+    @staticmethod
+    def _safe_filename(candidate, default):
+        if not candidate:
+            return default
+        return str(candidate).translate(_FILENAME_TABLE).strip() or default
 
-        def log_message(self, format, *args):  # noqa: A003 - silence default logging
-            return
+    def log_message(self, format, *args):  # noqa: A003 - silence default logging
+        return
+
+    # Exact-path dispatch; /sessions/<id>/... goes through _SESSION_ROUTE.
+    _routes = {
+        '/health': _handle_health,
+        '/health/logs': _handle_logs,
+        '/health/logs/stream': _handle_log_stream,
+        '/health/logs.ndjson': _handle_logs_ndjson,
+        '/health/bundle': _handle_bundle,
+    }
+    _session_routes = {
+        '/evaluation': _handle_session_evaluation,
+        '/evaluation/export': _handle_session_evaluation_export,
+    }
 
-    return HealthHandler
+
+class _HealthHTTPServer(ThreadingHTTPServer):
+    """HTTP server that carries handler state and serves requests from a bounded pool.
+
+    Sockets handed to the log hub via `detach_request` are left open.
+    """
+
+    def __init__(
+        self,
+        server_address,
+        monitor: HealthMonitor,
+        log_hub: _LogEventHub,
+        max_workers: int = _REQUEST_WORKERS,
+    ) -> None:
+        self.monitor = monitor
+        self.log_hub = log_hub
+        self.bundle_cache = _BundleCache()
+        self._detached: set[socket.socket] = set()
+        self._detached_lock = threading.Lock()
+        # Created once the socket is bound so a failed bind leaves no pool behind
+        # (`TCPServer.__init__` calls `server_close` before re-raising).
+        self._pool: Optional[ThreadPoolExecutor] = None
+        super().__init__(server_address, HealthHandler)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='health-api-worker')
+
+    def process_request(self, request, client_address) -> None:
+        try:
+            self._pool.submit(self.process_request_thread, request, client_address)
+        except RuntimeError:  # pragma: no cover - pool shut down during stop()
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def detach_request(self, request) -> None:
+        with self._detached_lock:
+            self._detached.add(request)
+
+    def shutdown_request(self, request) -> None:
+        with self._detached_lock:
+            if request in self._detached:
+                self._detached.discard(request)
+                return
+        super().shutdown_request(request)
 
 
 class HealthApiServer:
@@ -426,9 +1040,11 @@ class HealthApiServer:
         monitor: HealthMonitor,
         host: str = '127.0.0.1',
         port: int = 0,
+        request_workers: int = _REQUEST_WORKERS,
     ) -> None:
-        handler = _handler_factory(monitor)
-        self._server = ThreadingHTTPServer((host, port), handler)
+        self._monitor = monitor
+        self._log_hub = _LogEventHub(monitor)
+        self._server = _HealthHTTPServer((host, port), monitor, self._log_hub, max_workers=request_workers)
         self._thread: Optional[threading.Thread] = None
 
     @property
@@ -442,10 +1058,12 @@ class HealthApiServer:
         self._thread.start()
 
     def stop(self) -> None:
+        self._log_hub.close()
         self._server.shutdown()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2.0)
         self._server.server_close()
+        self._monitor.close()
 
 
 
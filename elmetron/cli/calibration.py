@@ -1,8 +1,8 @@
 ﻿"""Helpers for interacting with calibration commands."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Sequence
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence
 
 from ..protocols.registry import CommandDefinition, ProtocolProfile
 
@@ -27,6 +27,29 @@ class CalibrationEntry:
         return " ".join(parts)
 
 
+@dataclass(slots=True)
+class Calibrations:
+    """Sorted calibration entries plus a lowercase-name index for lookups."""
+
+    entries: List[CalibrationEntry]
+    by_name: Dict[str, CalibrationEntry] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.by_name:
+            for entry in self.entries:
+                # Keep the first entry in display order if names differ only by case.
+                self.by_name.setdefault(entry.name.lower(), entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[CalibrationEntry]:
+        return iter(self.entries)
+
+    def __getitem__(self, index: int) -> CalibrationEntry:
+        return self.entries[index]
+
+
 def is_calibration_command(definition: CommandDefinition) -> bool:
     """Return True if *definition* represents a calibration routine."""
 
@@ -36,7 +59,7 @@ def is_calibration_command(definition: CommandDefinition) -> bool:
     return bool(definition.calibration_label)
 
 
-def collect_calibrations(profile: ProtocolProfile) -> List[CalibrationEntry]:
+def collect_calibrations(profile: ProtocolProfile) -> Calibrations:
     """Extract calibration commands from *profile* sorted for display."""
 
     entries: List[CalibrationEntry] = []
@@ -52,7 +75,7 @@ def collect_calibrations(profile: ProtocolProfile) -> List[CalibrationEntry]:
             )
         )
     entries.sort(key=lambda item: ((item.calibration_label or "").lower(), item.name.lower()))
-    return entries
+    return Calibrations(entries)
 
 
 def format_calibration_list(entries: Sequence[CalibrationEntry]) -> str:
@@ -77,6 +100,11 @@ def find_by_index(entries: Sequence[CalibrationEntry], index: int) -> Calibratio
 
 def find_by_name(entries: Sequence[CalibrationEntry], name: str) -> CalibrationEntry:
     target = name.strip().lower()
+    if isinstance(entries, Calibrations):
+        try:
+            return entries.by_name[target]
+        except KeyError:
+            raise KeyError(f"Calibration '{name}' not found") from None
     for entry in entries:
         if entry.name.lower() == target:
             return entry
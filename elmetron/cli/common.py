@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from argparse import Namespace
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 
 from ..config import DeviceConfig
 from ..protocols.registry import (
@@ -13,31 +13,32 @@ from ..protocols.registry import (
 )
 
 
+# (argument, DeviceConfig field, cast, skip falsy values). Arguments that are
+# absent or None are always skipped; string options also ignore empty values.
+_DEVICE_OVERRIDES: Tuple[Tuple[str, str, Optional[Callable[[Any], Any]], bool], ...] = (
+    ("device_index", "index", None, False),
+    ("device_serial", "serial", None, True),
+    ("profile", "profile", None, True),
+    ("baud", "baud", None, False),
+    ("data_bits", "data_bits", None, False),
+    ("stop_bits", "stop_bits", float, False),
+    ("parity", "parity", None, True),
+    ("poll_hex", "poll_hex", None, True),
+    ("poll_interval", "poll_interval_s", float, False),
+    ("latency", "latency_timer_ms", int, False),
+)
+
+
 def apply_device_overrides(device: DeviceConfig, args: Namespace) -> None:
     """Apply command-line overrides stored in *args* to *device*."""
 
-    if getattr(args, "device_index", None) is not None:
-        device.index = args.device_index
-    if getattr(args, "device_serial", None):
-        device.serial = args.device_serial
-    if getattr(args, "profile", None):
-        device.profile = args.profile
+    for arg_name, field_name, cast, skip_falsy in _DEVICE_OVERRIDES:
+        value = getattr(args, arg_name, None)
+        if value is None or (skip_falsy and not value):
+            continue
+        setattr(device, field_name, cast(value) if cast is not None else value)
     if getattr(args, "no_profile_defaults", False):
         device.use_profile_defaults = False
-    if getattr(args, "baud", None) is not None:
-        device.baud = args.baud
-    if getattr(args, "data_bits", None) is not None:
-        device.data_bits = args.data_bits
-    if getattr(args, "stop_bits", None) is not None:
-        device.stop_bits = float(args.stop_bits)
-    if getattr(args, "parity", None):
-        device.parity = args.parity
-    if getattr(args, "poll_hex", None):
-        device.poll_hex = args.poll_hex
-    if getattr(args, "poll_interval", None) is not None:
-        device.poll_interval_s = float(args.poll_interval)
-    if getattr(args, "latency", None) is not None:
-        device.latency_timer_ms = int(args.latency)
     timeouts = getattr(args, "timeouts", None)
     if timeouts:
         read_ms, write_ms = timeouts
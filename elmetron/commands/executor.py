@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 import cx505_d2xx
 
@@ -27,17 +28,28 @@ class CommandResult:
         return [frame.hex(" ") for frame in self.frames]
 
 
-def _prepare_payloads(definition: CommandDefinition) -> List[bytes]:
-    payloads: List[bytes] = []
-    if definition.write_hex:
-        payloads.extend(cx505_d2xx._prepare_payloads(None, definition.write_hex))  # type: ignore[attr-defined]
-    if definition.write_ascii:
-        payloads.append(definition.write_ascii.encode("ascii"))
+def _prepare_payloads(definition: CommandDefinition) -> Tuple[bytes, ...]:
+    payloads = _encode_payloads(definition.write_hex, definition.write_ascii)
     if not payloads:
         raise ValueError(f"Command '{definition.name}' does not define write_hex or write_ascii payloads")
     return payloads
 
 
+# Command definitions are loaded once but executed repeatedly (scheduled
+# polls, calibrations), so the hex decoding is memoised on the source strings.
+# The cache lives here rather than on CommandDefinition, which is serialised
+# with `asdict` into diagnostic bundles.
+@lru_cache(maxsize=256)
+def _encode_payloads(write_hex: Optional[str], write_ascii: Optional[str]) -> Tuple[bytes, ...]:
+    payloads: List[bytes] = []
+    if write_hex:
+        payloads.extend(cx505_d2xx._prepare_payloads(None, write_hex))  # type: ignore[attr-defined]
+    if write_ascii:
+        payloads.append(write_ascii.encode("ascii"))
+    return tuple(payloads)
+
+
+@lru_cache(maxsize=256)
 def _decode_expectation(expect_hex: Optional[str]) -> Optional[bytes]:
     if not expect_hex:
         return None
@@ -62,9 +74,7 @@ def execute_command(
     frames: List[bytes] = []
     bytes_read = 0
     if duration > 0:
-        def _handle_frame(frame_bytes: bytes) -> None:
-            frames.append(frame_bytes)
-        bytes_read = interface.run_window(duration, frame_handler=_handle_frame, print_raw=False)
+        bytes_read = interface.run_window(duration, frame_handler=frames.append, print_raw=False)
     expected_bytes = _decode_expectation(definition.expect_hex)
     matched = None
     if expected_bytes is not None:
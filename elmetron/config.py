@@ -1,9 +1,18 @@
 ﻿"""Configuration management for the Elmetron Data Acquisition and Analysis Suite."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING
+
+from .serialization import loads_bytes, loads_yaml
+
+try:  # Python >= 3.11
+    import tomllib
+except ModuleNotFoundError:  # pragma: no cover - runtime guard
+    tomllib = None  # type: ignore[assignment]
 
 DEFAULT_POLL_HEX = "01 23 30 23 30 23 30 23 03"
 
@@ -36,20 +45,37 @@ DEFAULT_COMPACT_FLATTEN_PAYLOAD = (
 def _coerce_tuple(value: Any) -> Tuple[str, ...]:
     """Return *value* as a tuple of strings, normalising `None` to `()`."""
 
+    kind = type(value)
+    if kind is tuple:
+        return value
     if value is None:
         return ()
-    if isinstance(value, tuple):
-        return value
-    if isinstance(value, list):
-        return tuple(value)
-    if isinstance(value, (set, frozenset)):
+    if kind is list or kind is set or kind is frozenset:
         return tuple(value)
     if isinstance(value, str):
         return (value,) if value else ()
+    if isinstance(value, tuple):
+        return value
     try:
         return tuple(value)  # type: ignore[arg-type]
     except TypeError:
-        return (str(value),) if value is not None else ()
+        return (str(value),)
+
+
+@lru_cache(maxsize=32)
+def _parse_hex_bytes(payload: str) -> Optional[bytes]:
+    """Decode space- or comma-separated hex bytes, returning None when empty."""
+
+    text = payload.replace(",", " ")
+    try:
+        data = bytes.fromhex(text)
+    except ValueError:
+        # Odd-length or prefixed tokens such as "1" or "0x1A".
+        parts = text.split()
+        if not parts:
+            return None
+        return bytes(int(part, 16) for part in parts)
+    return data or None
 
 
 if TYPE_CHECKING:
@@ -74,6 +100,7 @@ class DeviceConfig:
     write_timeout_ms: int = 500
     chunk_size: int = 256
     latency_timer_ms: int = 2
+    coalesce_writes: bool = True  # Send a command's payloads as a single FT_Write
     poll_hex: Optional[str] = DEFAULT_POLL_HEX
     poll_interval_s: Optional[float] = 1.0
     dtr: str = "set"
@@ -84,25 +111,21 @@ class DeviceConfig:
     ble_read_characteristic: Optional[str] = None
     ble_write_characteristic: Optional[str] = None
     ble_notify_characteristic: Optional[str] = None
+    ble_notify_queue_depth: int = 256  # Oldest notifications are dropped beyond this many
     fallback_profiles: Tuple[str, ...] = field(default_factory=tuple)
 
     def __post_init__(self) -> None:
         self.dtr = self._normalise_control(self.dtr, "dtr")
         self.rts = self._normalise_control(self.rts, "rts")
-        profiles: list[str] = []
-        seen: set[str] = set()
+        # Case-insensitive de-duplication keeping the first spelling, in order.
+        profiles: Dict[str, str] = {}
         for entry in _coerce_tuple(self.fallback_profiles):
             if entry is None:
                 continue
             candidate = str(entry).strip()
-            if not candidate:
-                continue
-            lowered = candidate.lower()
-            if lowered in seen:
-                continue
-            profiles.append(candidate)
-            seen.add(lowered)
-        self.fallback_profiles = tuple(profiles)
+            if candidate:
+                profiles.setdefault(candidate.lower(), candidate)
+        self.fallback_profiles = tuple(profiles.values())
         try:
             attempts = int(self.open_retry_attempts)
         except (TypeError, ValueError):
@@ -115,6 +138,17 @@ class DeviceConfig:
         if backoff < 0:
             backoff = 0.0
         self.open_retry_backoff_s = backoff
+        try:
+            depth = int(self.ble_notify_queue_depth)
+        except (TypeError, ValueError):
+            depth = 256
+        self.ble_notify_queue_depth = max(depth, 1)
+
+    @property
+    def poll_bytes(self) -> Optional[bytes]:
+        """Poll frame encoded by `poll_hex`; decoded once per distinct string."""
+
+        return _parse_hex_bytes(self.poll_hex) if self.poll_hex else None
 
     @staticmethod
     def _normalise_control(value: Optional[str], label: str) -> str:
@@ -125,40 +159,50 @@ class DeviceConfig:
         return candidate
 
     def apply_profile(self, profile: "ProtocolProfile") -> None:
-        if profile.transport:
-            self.transport = profile.transport
-        if profile.handshake:
-            self.handshake = profile.handshake
-        if profile.poll_hex and (self.use_profile_defaults or not self.poll_hex):
-            self.poll_hex = profile.poll_hex
-        if profile.poll_interval_s is not None and (self.use_profile_defaults or self.poll_interval_s is None):
-            self.poll_interval_s = float(profile.poll_interval_s)
-        if getattr(profile, "ble_address", None) and (self.use_profile_defaults or not self.ble_address):
-            self.ble_address = profile.ble_address
-        if getattr(profile, "ble_read_characteristic", None) and (self.use_profile_defaults or not self.ble_read_characteristic):
-            self.ble_read_characteristic = profile.ble_read_characteristic
-        if getattr(profile, "ble_write_characteristic", None) and (self.use_profile_defaults or not self.ble_write_characteristic):
-            self.ble_write_characteristic = profile.ble_write_characteristic
-        if getattr(profile, "ble_notify_characteristic", None) and (self.use_profile_defaults or not self.ble_notify_characteristic):
-            self.ble_notify_characteristic = profile.ble_notify_characteristic
-        if not self.use_profile_defaults:
+        for name in _PROFILE_OVERRIDE_FIELDS:
+            value = getattr(profile, name, None)
+            if value:
+                setattr(self, name, value)
+        use_defaults = self.use_profile_defaults
+        for name, cast, numeric in _PROFILE_FILL_FIELDS:
+            value = getattr(profile, name, None)
+            if numeric:
+                if value is None or not (use_defaults or getattr(self, name) is None):
+                    continue
+            elif not value or not (use_defaults or not getattr(self, name)):
+                continue
+            setattr(self, name, cast(value) if cast is not None else value)
+        if not use_defaults:
             return
-        if profile.baud is not None:
-            self.baud = int(profile.baud)
-        if profile.data_bits is not None:
-            self.data_bits = int(profile.data_bits)
-        if profile.stop_bits is not None:
-            self.stop_bits = float(profile.stop_bits)
-        if profile.parity is not None:
-            self.parity = str(profile.parity)
-        if profile.read_timeout_ms is not None:
-            self.read_timeout_ms = int(profile.read_timeout_ms)
-        if profile.write_timeout_ms is not None:
-            self.write_timeout_ms = int(profile.write_timeout_ms)
-        if profile.chunk_size is not None:
-            self.chunk_size = int(profile.chunk_size)
-        if profile.latency_timer_ms is not None:
-            self.latency_timer_ms = int(profile.latency_timer_ms)
+        for name, cast in _PROFILE_DEFAULT_FIELDS:
+            value = getattr(profile, name, None)
+            if value is not None:
+                setattr(self, name, cast(value))
+
+
+# Profile fields copied by `DeviceConfig.apply_profile` whenever the profile sets them.
+_PROFILE_OVERRIDE_FIELDS: Tuple[str, ...] = ("transport", "handshake")
+# (field, cast, numeric): copied when profile defaults are enabled or the device
+# leaves the field unset. Numeric fields treat only None as unset.
+_PROFILE_FILL_FIELDS: Tuple[Tuple[str, Optional[Callable[[Any], Any]], bool], ...] = (
+    ("poll_hex", None, False),
+    ("poll_interval_s", float, True),
+    ("ble_address", None, False),
+    ("ble_read_characteristic", None, False),
+    ("ble_write_characteristic", None, False),
+    ("ble_notify_characteristic", None, False),
+)
+# Serial parameters taken from the profile only when profile defaults are enabled.
+_PROFILE_DEFAULT_FIELDS: Tuple[Tuple[str, Callable[[Any], Any]], ...] = (
+    ("baud", int),
+    ("data_bits", int),
+    ("stop_bits", float),
+    ("parity", str),
+    ("read_timeout_ms", int),
+    ("write_timeout_ms", int),
+    ("chunk_size", int),
+    ("latency_timer_ms", int),
+)
 
 
 @dataclass(slots=True)
@@ -227,7 +271,13 @@ class AcquisitionConfig:
     lab_retry_commands: Tuple[str, ...] = ()
 
     def __post_init__(self) -> None:
-        self.startup_commands = [cmd.strip() for cmd in self.startup_commands if isinstance(cmd, str) and cmd.strip()]
+        startup: list[str] = []
+        for command in self.startup_commands:
+            if isinstance(command, str):
+                command = command.strip()
+                if command:
+                    startup.append(command)
+        self.startup_commands = startup
         normalised: list[ScheduledCommandConfig] = []
         for entry in self.scheduled_commands:
             if isinstance(entry, ScheduledCommandConfig):
@@ -276,8 +326,10 @@ class AcquisitionConfig:
         if backoff is not None and backoff < 0:
             backoff = 0.0
         self.lab_retry_backoff_s = backoff
-        self.lab_retry_categories = _coerce_tuple(self.lab_retry_categories)
-        self.lab_retry_commands = _coerce_tuple(self.lab_retry_commands)
+        if type(self.lab_retry_categories) is not tuple:
+            self.lab_retry_categories = _coerce_tuple(self.lab_retry_categories)
+        if type(self.lab_retry_commands) is not tuple:
+            self.lab_retry_commands = _coerce_tuple(self.lab_retry_commands)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -313,7 +365,7 @@ class StorageConfig:
     store_raw_frames: bool = False  # Disable to save space (only for debugging)
 
     def __post_init__(self) -> None:
-        if isinstance(self.database_path, str):
+        if not isinstance(self.database_path, Path):
             self.database_path = Path(self.database_path)
 
 
@@ -369,14 +421,18 @@ class ExportConfig:
     lims_template: Optional[Path] = None
 
     def __post_init__(self) -> None:
-        if isinstance(self.export_directory, str):
+        if not isinstance(self.export_directory, Path):
             self.export_directory = Path(self.export_directory)
         self.csv_mode = (self.csv_mode or 'full').lower()
         if self.csv_mode not in {'full', 'compact'}:
             raise ValueError("csv_mode must be 'full' or 'compact'")
-        self.csv_compact_fields = _coerce_tuple(self.csv_compact_fields)
-        self.csv_flatten_payload = _coerce_tuple(self.csv_flatten_payload)
-        self.csv_flatten_analytics = _coerce_tuple(self.csv_flatten_analytics)
+        # The shared default tuples need no coercion.
+        if self.csv_compact_fields is not DEFAULT_CSV_COMPACT_FIELDS:
+            self.csv_compact_fields = _coerce_tuple(self.csv_compact_fields)
+        if self.csv_flatten_payload is not DEFAULT_COMPACT_FLATTEN_PAYLOAD:
+            self.csv_flatten_payload = _coerce_tuple(self.csv_flatten_payload)
+        if self.csv_flatten_analytics is not DEFAULT_COMPACT_FLATTEN_ANALYTICS:
+            self.csv_flatten_analytics = _coerce_tuple(self.csv_flatten_analytics)
         if self.csv_mode == 'compact':
             if not self.csv_compact_fields:
                 self.csv_compact_fields = DEFAULT_CSV_COMPACT_FIELDS
@@ -384,9 +440,9 @@ class ExportConfig:
                 self.csv_flatten_analytics = DEFAULT_COMPACT_FLATTEN_ANALYTICS
             if not self.csv_flatten_payload:
                 self.csv_flatten_payload = DEFAULT_COMPACT_FLATTEN_PAYLOAD
-        if isinstance(self.pdf_template, str) and self.pdf_template:
+        if self.pdf_template and not isinstance(self.pdf_template, Path):
             self.pdf_template = Path(self.pdf_template)
-        if isinstance(self.lims_template, str) and self.lims_template:
+        if self.lims_template and not isinstance(self.lims_template, Path):
             self.lims_template = Path(self.lims_template)
         if self.pdf_recent_limit <= 0:
             self.pdf_recent_limit = 10
@@ -400,12 +456,14 @@ class MonitoringConfig:
     log_rotation_task: Optional[str] = None
     log_rotation_max_age_minutes: int = 180
     log_rotation_probe_interval_s: int = 120
+    command_metrics_ttl_s: float = 0.2  # Reuse command queue metrics across rapid /health polls
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             'log_rotation_task': self.log_rotation_task,
             'log_rotation_max_age_minutes': self.log_rotation_max_age_minutes,
             'log_rotation_probe_interval_s': self.log_rotation_probe_interval_s,
+            'command_metrics_ttl_s': self.command_metrics_ttl_s,
         }
 
 
@@ -423,12 +481,20 @@ class AppConfig:
 
     @classmethod
     def from_dict(cls, payload: Dict[str, Any]) -> "AppConfig":
-        """Create a configuration instance from a nested dictionary."""
+        """Create a configuration instance from a nested dictionary.
+
+        Sections may also be given as already-constructed config objects (or
+        subclasses of them). Those are already normalised, so they are copied
+        without running `__init__`/`__post_init__` again; the copy keeps
+        configurations from sharing a mutable section.
+        """
 
         def _section(name: str, factory: Any) -> Any:
             data = payload.get(name, {}) if payload else {}
             if isinstance(data, dict):
                 return factory(**data)
+            if isinstance(data, factory):
+                return _copy_section(data)
             raise TypeError(f"Expected mapping for section '{name}', got {type(data).__name__}")
 
         return cls(
@@ -444,9 +510,6 @@ class AppConfig:
     def to_dict(self) -> Dict[str, Any]:
         """Return a serialisable representation of the configuration."""
 
-        def _asdict(obj: Any) -> Dict[str, Any]:
-            return {field: getattr(obj, field) for field in obj.__dataclass_fields__}  # type: ignore[attr-defined]
-
         acquisition_payload = (
             self.acquisition.to_dict() if hasattr(self.acquisition, 'to_dict') else _asdict(self.acquisition)
         )
@@ -474,14 +537,83 @@ class AppConfig:
         }
 
 
+def _section_accessor(cls: type) -> Tuple[Tuple[str, ...], Callable[[Any], Any]]:
+    names = tuple(item.name for item in fields(cls))
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        # attrgetter with one name returns the bare value rather than a tuple.
+        return names, lambda obj: (getter(obj),)
+    return names, getter
+
+
+# Field names and a batch getter per config section, resolved once for `AppConfig.to_dict`.
+_SECTION_FIELDS: Dict[type, Tuple[Tuple[str, ...], Callable[[Any], Any]]] = {
+    cls: _section_accessor(cls)
+    for cls in (
+        DeviceConfig,
+        AcquisitionConfig,
+        StorageConfig,
+        IngestionConfig,
+        AnalyticsConfig,
+        ExportConfig,
+        MonitoringConfig,
+    )
+}
+
+
+def _asdict(obj: Any) -> Dict[str, Any]:
+    """Return a shallow field mapping for the config dataclass *obj*."""
+
+    accessor = _SECTION_FIELDS.get(type(obj))
+    if accessor is None:
+        accessor = _section_accessor(type(obj))
+    names, getter = accessor
+    return dict(zip(names, getter(obj)))
+
+
+def _copy_section(section: Any) -> Any:
+    """Copy the config dataclass *section* without re-running its validation.
+
+    List, dict and set fields are copied so the clone can be mutated
+    independently of *section*.
+    """
+
+    cls = type(section)
+    accessor = _SECTION_FIELDS.get(cls)
+    if accessor is None:
+        accessor = _section_accessor(cls)
+    names, getter = accessor
+    clone = object.__new__(cls)
+    for name, value in zip(names, getter(section)):
+        if isinstance(value, (list, dict, set)):
+            value = value.copy()
+        object.__setattr__(clone, name, value)
+    return clone
+
+
 def load_config(path: Optional[Path]) -> AppConfig:
     """Load configuration from *path* if provided, otherwise return defaults."""
 
     if path is None:
         return AppConfig()
     resolved = path.expanduser()
-    if not resolved.exists():
+    try:
+        stat = resolved.stat()
+    except (FileNotFoundError, NotADirectoryError):
         return AppConfig()
+    # AppConfig instances are mutable (CLI overrides edit them in place), so
+    # only the parsed payload is cached and a fresh config is built each call.
+    return AppConfig.from_dict(_load_payload(str(resolved), stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=8)
+def _load_payload(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse the configuration file at *path*; cached per modification time and size.
+
+    The returned mapping is shared between callers and must be treated as read-only.
+    """
+
+    resolved = Path(path)
     payload: Dict[str, Any]
     suffix = resolved.suffix.lower()
     if suffix in {".json", ".jsn"}:
@@ -492,29 +624,19 @@ def load_config(path: Optional[Path]) -> AppConfig:
         payload = _load_yaml(resolved)
     else:
         raise ValueError(f"Unsupported configuration format: {resolved.suffix}")
-    return AppConfig.from_dict(payload)
+    return payload
 
 
 def _load_json(path: Path) -> Dict[str, Any]:
-    import json
-
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return loads_bytes(path.read_bytes())
 
 
 def _load_toml(path: Path) -> Dict[str, Any]:
-    try:
-        import tomllib  # Python >= 3.11
-    except ModuleNotFoundError as exc:  # pragma: no cover - runtime guard
-        raise RuntimeError("tomllib is required to parse TOML configuration files") from exc
+    if tomllib is None:  # pragma: no cover - runtime guard
+        raise RuntimeError("tomllib is required to parse TOML configuration files")
     with path.open("rb") as handle:
         return tomllib.load(handle)
 
 
 def _load_yaml(path: Path) -> Dict[str, Any]:
-    try:
-        import yaml  # type: ignore
-    except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
-        raise RuntimeError("PyYAML is required to parse YAML configuration files") from exc
-    with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
+    return loads_yaml(path.read_bytes()) or {}
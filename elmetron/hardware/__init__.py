@@ -8,6 +8,8 @@ from .device_manager import (
     ListedDevice,
     SimulatedInterface,
     create_interface,
+    invalidate_device_cache,
+    list_all_devices,
     list_devices,
 )
 
@@ -18,5 +20,7 @@ __all__ = [
     "DeviceInterface",
     "ListedDevice",
     "create_interface",
+    "invalidate_device_cache",
+    "list_all_devices",
     "list_devices",
 ]
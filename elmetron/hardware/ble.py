@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import asyncio
-import time
+import threading
 from collections import deque
 from typing import Any, Callable, Deque, Optional
 
@@ -41,46 +41,59 @@ class BleakBridgeAdapter:
             1.0,
         )
         self._client: Any = None
-        self._notifications: Deque[bytes] = deque()
+        self._notifications: Deque[bytes] = deque(maxlen=config.ble_notify_queue_depth)
+        self._notify_ready = threading.Condition()
         self._notify_active = False
+        # Event loop owned by a background thread for the lifetime of a connection;
+        # bleak callbacks keep being serviced between synchronous calls.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
 
     def connect(self) -> None:
         if self._client is not None:
             return
         client = self._client_factory(self._address)
-        _run_async(lambda: client.connect(timeout=self._connect_timeout))
+        try:
+            self._run_async(lambda: client.connect(timeout=self._connect_timeout))
+        except BaseException:
+            self._stop_loop()
+            raise
         self._client = client
         if self._notify_char:
-            _run_async(lambda: client.start_notify(self._notify_char, self._handle_notification))
+            self._run_async(lambda: client.start_notify(self._notify_char, self._handle_notification))
             self._notify_active = True
 
     def disconnect(self) -> None:
         if self._client is None:
+            self._stop_loop()
             return
-        if self._notify_active and self._notify_char:
-            try:
-                _run_async(lambda: self._client.stop_notify(self._notify_char))
-            except Exception:  # pragma: no cover - best-effort cleanup
-                pass
-        _run_async(lambda: self._client.disconnect())
-        self._client = None
-        self._notify_active = False
-        self._notifications.clear()
+        try:
+            if self._notify_active and self._notify_char:
+                try:
+                    self._run_async(lambda: self._client.stop_notify(self._notify_char))
+                except Exception:  # pragma: no cover - best-effort cleanup
+                    pass
+            self._run_async(lambda: self._client.disconnect())
+        finally:
+            self._client = None
+            self._notify_active = False
+            with self._notify_ready:
+                self._notifications.clear()
+            self._stop_loop()
 
     def read(self, timeout: float) -> Optional[bytes]:
         if self._client is None:
             return None
         if self._notify_char:
-            deadline = time.monotonic() + timeout if timeout else None
-            while True:
-                if self._notifications:
-                    return self._notifications.popleft()
-                if deadline is not None and time.monotonic() >= deadline:
+            # Woken by `_handle_notification`; a falsy timeout waits indefinitely.
+            with self._notify_ready:
+                if not self._notify_ready.wait_for(lambda: self._notifications, timeout or None):
                     return None
-                time.sleep(0.05)
+                chunk = self._notifications.popleft()
+            return chunk if type(chunk) is bytes else bytes(chunk)
         if self._read_char is None:
             return None
-        data = _run_async(lambda: self._client.read_gatt_char(self._read_char))
+        data = self._run_async(lambda: self._client.read_gatt_char(self._read_char))
         if data is None:
             return None
         return bytes(data)
@@ -92,7 +105,7 @@ class BleakBridgeAdapter:
             raise RuntimeError(
                 "BLE write attempted but no `device.ble_write_characteristic` (or read characteristic) is configured"
             )
-        _run_async(lambda: self._client.write_gatt_char(self._write_char, payload, response=True))
+        self._run_async(lambda: self._client.write_gatt_char(self._write_char, payload, response=True))
 
     def info(self) -> dict[str, Optional[str]]:
         return {
@@ -101,7 +114,40 @@ class BleakBridgeAdapter:
         }
 
     def _handle_notification(self, _handle: int, data: bytes) -> None:
-        self._notifications.append(bytes(data))
+        # bleak hands over a fresh buffer per notification, so it is queued as-is
+        # and only converted to bytes when read (frames dropped by maxlen never are).
+        with self._notify_ready:
+            self._notifications.append(data)
+            self._notify_ready.notify()
+
+    def _run_async(self, factory: Callable[[], Any]) -> Any:
+        """Execute an awaitable returned by *factory* on the adapter's event loop."""
+
+        async def _call() -> Any:
+            return await factory()
+
+        return asyncio.run_coroutine_threadsafe(_call(), self._ensure_loop()).result()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="ble-event-loop", daemon=True)
+            thread.start()
+            self._loop = loop
+            self._loop_thread = thread
+        return self._loop
+
+    def _stop_loop(self) -> None:
+        loop, thread = self._loop, self._loop_thread
+        self._loop = None
+        self._loop_thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5.0)
+        if not loop.is_running():
+            loop.close()
 
 
 def create_ble_adapter(config: DeviceConfig) -> BleakBridgeAdapter:
@@ -110,16 +156,4 @@ def create_ble_adapter(config: DeviceConfig) -> BleakBridgeAdapter:
     return BleakBridgeAdapter(config)
 
 
-def _run_async(factory: Callable[[], Any]) -> Any:
-    """Execute an awaitable returned by *factory* on a private event loop."""
-
-    loop = asyncio.new_event_loop()
-    try:
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(factory())
-    finally:
-        asyncio.set_event_loop(None)
-        loop.close()
-
-
 __all__ = ["BleakBridgeAdapter", "create_ble_adapter"]
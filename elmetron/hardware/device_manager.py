@@ -1,9 +1,11 @@
 ﻿"""Hardware interface layer for Elmetron meters across multiple transports."""
 from __future__ import annotations
 
+import threading
 import time
-from dataclasses import dataclass
-from typing import Callable, Iterable, Optional, Protocol
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, Optional, Protocol, Tuple
 
 from ..config import DeviceConfig
 
@@ -38,7 +40,7 @@ class DeviceInterface(Protocol):
         ...
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ListedDevice:
     """Metadata describing a connected instrument."""
 
@@ -57,9 +59,37 @@ FrameHandler = Callable[[bytes], None]
 
 SUPPORTED_TRANSPORTS = {"ftdi", "ble", "sim"}
 
+# FTDI enumeration is a USB round-trip; reuse a recent non-empty scan.
+ENUMERATION_CACHE_TTL_S = 2.0
+_enumeration_cache: Dict[str, Tuple[float, Tuple[ListedDevice, ...]]] = {}
+_enumeration_lock = threading.Lock()
 
-def list_devices(transport: str = "ftdi") -> list[ListedDevice]:
-    """Enumerate visible devices for *transport*."""
+# Shortest BLE read timeout used while frames are streaming. Kept non-zero:
+# adapters may treat a zero timeout as "wait indefinitely".
+_BLE_MIN_READ_TIMEOUT_S = 0.001
+
+
+def invalidate_device_cache(transport: Optional[str] = None) -> None:
+    """Drop cached enumeration results for *transport* (or every transport)."""
+
+    with _enumeration_lock:
+        if transport is None:
+            _enumeration_cache.clear()
+        else:
+            _enumeration_cache.pop(transport.lower(), None)
+
+
+def list_devices(
+    transport: str = "ftdi",
+    *,
+    max_age_s: float = ENUMERATION_CACHE_TTL_S,
+    force: bool = False,
+) -> list[ListedDevice]:
+    """Enumerate visible devices for *transport*.
+
+    FTDI results younger than *max_age_s* are served from a cache unless
+    *force* is set.
+    """
 
     transport = transport.lower()
     if transport == "sim":
@@ -73,6 +103,11 @@ def list_devices(transport: str = "ftdi") -> list[ListedDevice]:
         ]
     if transport != "ftdi":
         raise ValueError(f"Device enumeration is not implemented for transport '{transport}'")
+    if not force and max_age_s > 0:
+        with _enumeration_lock:
+            cached = _enumeration_cache.get(transport)
+        if cached is not None and time.monotonic() - cached[0] < max_age_s:
+            return list(cached[1])
     devices: list[ListedDevice] = []
     for index, info in enumerate(cx505_d2xx.enumerate_devices()):
         devices.append(
@@ -87,9 +122,34 @@ def list_devices(transport: str = "ftdi") -> list[ListedDevice]:
                 transport="ftdi",
             )
         )
+    if devices:
+        # Empty scans are not cached so a newly attached meter shows up at once.
+        with _enumeration_lock:
+            _enumeration_cache[transport] = (time.monotonic(), tuple(devices))
     return devices
 
 
+def list_all_devices(transports: Iterable[str] = ("ftdi", "sim")) -> list[ListedDevice]:
+    """Enumerate several transports concurrently, grouped in *transports* order.
+
+    Transports without enumeration support (currently BLE) are skipped.
+    """
+
+    names = list(dict.fromkeys(name.lower() for name in transports))
+
+    def _scan(name: str) -> list[ListedDevice]:
+        try:
+            return list_devices(name)
+        except ValueError:
+            return []
+
+    if len(names) <= 1:
+        return [device for name in names for device in _scan(name)]
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="device-scan") as pool:
+        results = list(pool.map(_scan, names))
+    return [device for devices in results for device in devices]
+
+
 class CX505Interface(DeviceInterface):
     """Manage a CX-505 connection using the FTDI D2XX bridge."""
 
@@ -97,7 +157,7 @@ class CX505Interface(DeviceInterface):
         self._config = config
         self._handle: Optional[cx505_d2xx.HANDLE] = None
         self._device: Optional[ListedDevice] = None
-        self._poll_payload: Optional[bytes] = _parse_hex_bytes(config.poll_hex) if config.poll_hex else None
+        self._poll_payload: Optional[bytes] = config.poll_bytes
 
     @property
     def device(self) -> Optional[ListedDevice]:
@@ -114,6 +174,9 @@ class CX505Interface(DeviceInterface):
         last_error: Optional[Exception] = None
 
         for attempt in range(1, attempts + 1):
+            if attempt > 1:
+                # A failed attempt may mean the cached scan is stale.
+                invalidate_device_cache("ftdi")
             devices = list_devices()
             if not devices:
                 last_error = RuntimeError("No FTDI D2XX devices detected")
@@ -182,6 +245,7 @@ class CX505Interface(DeviceInterface):
                     self._config.parity,
                     self._config.read_timeout_ms,
                     self._config.write_timeout_ms,
+                    latency_timer_ms=self._config.latency_timer_ms,
                 )
                 cx505_d2xx.apply_control_lines(handle, self._config.dtr, self._config.rts)
                 if self._poll_payload:
@@ -192,7 +256,8 @@ class CX505Interface(DeviceInterface):
                     print("[DEBUG] No poll_payload configured - skipping handshake")
                 self._handle = handle
                 assert target is not None
-                target.transport = "ftdi"
+                if target.transport != "ftdi":
+                    target = replace(target, transport="ftdi")
                 self._device = target
                 break
             except Exception as exc:  # pragma: no cover - cleanup on failure
@@ -250,6 +315,9 @@ class CX505Interface(DeviceInterface):
         if self._handle is None:
             self.open()
         assert self._handle is not None
+        if self._config.coalesce_writes:
+            # The FTDI link is a byte stream, so payload boundaries carry no framing.
+            payloads = [b"".join(payloads)]
         return cx505_d2xx.write_payloads(self._handle, payloads)
 
     def __enter__(self) -> "CX505Interface":
@@ -340,14 +408,19 @@ class BleBridgeInterface(DeviceInterface):
         assert self._adapter is not None
         total = 0
         deadline = time.monotonic() + duration_s
+        # Adaptive poll: frames tend to arrive in bursts, so read with a short
+        # timeout right after data and double it on each empty read, up to the
+        # configured interval once the link goes quiet.
+        interval = _BLE_MIN_READ_TIMEOUT_S
         while True:
             remaining = deadline - time.monotonic()
             if remaining <= 0:
                 break
-            timeout = min(self._read_interval_s, remaining)
-            chunk = self._adapter.read(timeout)
+            chunk = self._adapter.read(min(interval, remaining))
             if not chunk:
+                interval = min(interval * 2, self._read_interval_s)
                 continue
+            interval = _BLE_MIN_READ_TIMEOUT_S
             total += len(chunk)
             if frame_handler:
                 frame_handler(chunk)
@@ -358,9 +431,11 @@ class BleBridgeInterface(DeviceInterface):
         assert self._adapter is not None
         bytes_written = 0
         for payload in payloads:
-            if not isinstance(payload, (bytes, bytearray)):
-                raise TypeError("BLE payloads must be bytes-like")
-            self._adapter.write(bytes(payload))
+            if type(payload) is not bytes:
+                if not isinstance(payload, (bytes, bytearray, memoryview)):
+                    raise TypeError("BLE payloads must be bytes-like")
+                payload = bytes(payload)
+            self._adapter.write(payload)
             bytes_written += len(payload)
         return bytes_written
 
@@ -425,12 +500,8 @@ def _default_ble_adapter_factory(config: DeviceConfig) -> BleAdapter:
     return create_ble_adapter(config)
 
 
-def _parse_hex_bytes(payload: str) -> Optional[bytes]:
-    payload = payload.strip()
-    if not payload:
-        return None
-    parts = payload.replace(",", " ").split()
-    return bytes(int(part, 16) for part in parts)
+# Formatted straight to bytes, skipping the str round-trip per frame.
+_SIM_FRAME_TEMPLATE = b"SIM:%04d:%03d:%d"
 
 
 class SimulatedInterface(DeviceInterface):
@@ -466,16 +537,16 @@ class SimulatedInterface(DeviceInterface):
         samples = max(int(duration_s * 5), 1)
         frames: list[bytes] = []
         total = 0
+        timestamp = int(time.time())
         for _ in range(samples):
-            frame = self._generate_frame()
+            frame = self._generate_frame(timestamp)
             frames.append(frame)
             total += len(frame)
             if frame_handler:
                 frame_handler(frame)
         if log_path:
             with open(log_path, "ab") as handle:
-                for frame in frames:
-                    handle.write(frame + b"\n")
+                handle.write(b"\n".join(frames) + b"\n")
         return total
 
     def write(self, payloads: Iterable[bytes]) -> int:
@@ -488,10 +559,10 @@ class SimulatedInterface(DeviceInterface):
     def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[override]
         self.close()
 
-    def _generate_frame(self) -> bytes:
+    def _generate_frame(self, timestamp: Optional[int] = None) -> bytes:
         self._frame_counter += 1
         value = 700 + (self._frame_counter % 50)
-        timestamp = int(time.time())
-        payload = f"SIM:{self._frame_counter:04d}:{value:03d}:{timestamp}".encode("ascii")
-        return payload[:64]
+        if timestamp is None:
+            timestamp = int(time.time())
+        return (_SIM_FRAME_TEMPLATE % (self._frame_counter, value, timestamp))[:64]
 
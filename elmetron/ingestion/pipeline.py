@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 from ..analytics.engine import AnalyticsEngine
 from ..config import IngestionConfig
@@ -11,6 +11,16 @@ from ..storage.database import DeviceMetadata, SessionHandle
 import cx505_d2xx
 
 
+def _frame_hex(frame: bytes, core_hex: Optional[str]) -> str:
+    """Return ``frame.hex()``, reusing the decoder's hex of the frame prefix."""
+
+    # `_decode_frame` hexes the frame minus its trailing CR/LF; only that tail
+    # still needs encoding.
+    if core_hex is None:
+        return frame.hex()
+    return core_hex + frame[len(core_hex) // 2:].hex()
+
+
 class FrameIngestor:
     """Decode CX-505 frames and push them into the storage layer."""
 
@@ -28,17 +38,23 @@ class FrameIngestor:
         self._decode_error_callback = decode_error_callback
         self._frames = 0
         self._analytics_profile: Optional[Dict[str, object]] = None
+        self._device_key: Optional[Tuple[Optional[str], Optional[str], Optional[str]]] = None
+        self._device_meta: Optional[DeviceMetadata] = None
 
     @property
     def frames(self) -> int:
         return self._frames
 
-    def handle_frame(self, frame: bytes) -> Optional[Dict[str, Any]]:
+    def handle_frame(self, frame: Union[bytes, bytearray, memoryview]) -> Optional[Dict[str, Any]]:
         captured_at = datetime.utcnow()
+        session = self._session
+        if type(frame) is not bytes:
+            # Materialise buffer views once; decoding, hex and the DB blob share it.
+            frame = bytes(frame)
         try:
             decoded = cx505_d2xx._decode_frame(frame)  # pylint: disable=protected-access
         except Exception as exc:  # pylint: disable=broad-except
-            self._session.log_event(
+            session.log_event(
                 'warning',
                 'decode',
                 'Failed to decode frame',
@@ -55,30 +71,44 @@ class FrameIngestor:
             return None
 
         header = decoded.get('header', {})
-        candidate_serial = header.get('serial') or self._session.metadata.serial
-        candidate_model = header.get('model') or self._session.metadata.model
+        current_meta = session.metadata
+        candidate_serial = header.get('serial') or current_meta.serial
+        candidate_model = header.get('model') or current_meta.model
         candidate_description = (
-            self._session.metadata.description
+            current_meta.description
             or candidate_model
             or header.get('raw')
         )
-        device_meta = DeviceMetadata(
-            serial=candidate_serial,
-            description=candidate_description,
-            model=candidate_model,
-        )
-        if device_meta != self._session.metadata:
-            self._session.update_instrument(device_meta)
-            self._session.set_metadata(
-                {
-                    'device.serial': device_meta.serial,
-                    'device.model': device_meta.model,
-                    'device.description': device_meta.description,
-                }
+        device_key = (candidate_serial, candidate_description, candidate_model)
+        device_meta = self._device_meta
+        # Headers rarely change after the first frame; only rebuild and compare
+        # the metadata when the candidates (or the session's metadata) moved.
+        if (
+            device_meta is None
+            or device_key != self._device_key
+            or device_meta is not current_meta
+        ):
+            device_meta = DeviceMetadata(
+                serial=candidate_serial,
+                description=candidate_description,
+                model=candidate_model,
             )
+            if device_meta != current_meta:
+                session.update_instrument(device_meta)
+                session.set_metadata(
+                    {
+                        'device.serial': device_meta.serial,
+                        'device.model': device_meta.model,
+                        'device.description': device_meta.description,
+                    }
+                )
+            device_meta = session.metadata
+            self._device_meta = device_meta
+            self._device_key = device_key
 
+        captured_at_text = captured_at.isoformat(timespec='milliseconds') + 'Z'
         if self._config.enrich_with_timestamp:
-            decoded['captured_at'] = captured_at.isoformat(timespec='milliseconds') + 'Z'
+            decoded['captured_at'] = captured_at_text
         if self._config.annotate_device:
             decoded.setdefault('device', {})
             decoded['device'].update(
@@ -89,7 +119,7 @@ class FrameIngestor:
                 }
             )
         if self._config.emit_raw_frame:
-            decoded['raw_frame_hex'] = frame.hex()
+            decoded['raw_frame_hex'] = _frame_hex(frame, decoded.get('raw_hex'))
 
         if self._analytics:
             analytics_payload = self._analytics.process(decoded)
@@ -99,17 +129,17 @@ class FrameIngestor:
         else:
             analytics_payload = None
 
-        storage_result = self._session.store_capture(
+        storage_result = session.store_capture(
             captured_at,
             frame,
             decoded,
             derived_metrics=analytics_payload,
         )
-        decoded.setdefault('storage', {})
-        decoded['storage']['frame_id'] = storage_result.frame_id
-        decoded['storage']['measurement_id'] = storage_result.measurement_id
-        decoded['storage']['session_id'] = self._session.id
-        decoded['storage']['captured_at'] = captured_at.isoformat(timespec='milliseconds') + 'Z'
+        storage = decoded.setdefault('storage', {})
+        storage['frame_id'] = storage_result.frame_id
+        storage['measurement_id'] = storage_result.measurement_id
+        storage['session_id'] = session.id
+        storage['captured_at'] = captured_at_text
 
         self._frames += 1
         return decoded
@@ -121,3 +151,6 @@ class FrameIngestor:
         if self._analytics_profile is None:
             self._analytics_profile = self._analytics.profile_summary()
         return self._analytics_profile
+
+
+__all__ = ["FrameIngestor"]
@@ -1,16 +1,24 @@
 ﻿"""Protocol registry utilities for Elmetron devices."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
 
 from ..config import DEFAULT_POLL_HEX, DeviceConfig
+from ..serialization import loads_bytes, loads_yaml
+
+try:  # Python >= 3.11
+    import tomllib
+except ModuleNotFoundError:  # pragma: no cover - runtime guard
+    tomllib = None  # type: ignore[assignment]
 
 DEFAULT_PROFILE_NAME = "cx505"
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class CommandDefinition:
     """Describes a single command/calibration sequence."""
 
@@ -27,9 +35,13 @@ class CommandDefinition:
     calibration_label: Optional[str] = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ProtocolProfile:
-    """Represents a single meter protocol definition."""
+    """Represents a single meter protocol definition.
+
+    Profiles are immutable (``commands`` is exposed as a read-only mapping)
+    because registries, including the built-in one, are shared between callers.
+    """
 
     name: str
     description: Optional[str] = None
@@ -49,25 +61,34 @@ class ProtocolProfile:
     ble_read_characteristic: Optional[str] = None
     ble_write_characteristic: Optional[str] = None
     ble_notify_characteristic: Optional[str] = None
-    commands: Dict[str, CommandDefinition] = field(default_factory=dict)
+    commands: Mapping[str, CommandDefinition] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.commands, MappingProxyType):
+            object.__setattr__(self, "commands", MappingProxyType(dict(self.commands)))
 
 
 class ProtocolRegistry:
     """Container that maps profile names to protocol descriptions."""
 
     def __init__(self, profiles: Dict[str, ProtocolProfile]):
-        self._profiles = profiles
+        # Keys are lower-cased once here so lookups only normalise the query.
+        self._profiles = {key.lower(): profile for key, profile in profiles.items()}
 
     def get(self, name: str) -> Optional[ProtocolProfile]:
-        return self._profiles.get(name.lower())
+        profiles = self._profiles
+        profile = profiles.get(name)
+        if profile is None:
+            profile = profiles.get(name.lower())
+        return profile
 
     def apply_to_device(self, device: DeviceConfig) -> ProtocolProfile:
         """Apply the profile referenced by *device* to the device config."""
 
         requested = (device.profile or DEFAULT_PROFILE_NAME).lower()
-        profile = self.get(requested)
+        profile = self._profiles.get(requested)
         if profile is None and requested != DEFAULT_PROFILE_NAME:
-            profile = self.get(DEFAULT_PROFILE_NAME)
+            profile = self._profiles.get(DEFAULT_PROFILE_NAME)
         if profile is None:
             raise KeyError(f"Protocol profile '{requested}' not found")
         device.apply_profile(profile)
@@ -100,40 +121,29 @@ class ProtocolRegistry:
                             read_duration_value = None
                     else:
                         read_duration_value = None
+                    get = command_fields.get
                     command_defs[command_name] = CommandDefinition(
-                    name=command_name,
-                    description=command_fields.get("description"),
-                    category=command_fields.get("category"),
-                    write_hex=command_fields.get("write_hex"),
-                    write_ascii=command_fields.get("write_ascii"),
-                    post_delay_s=post_delay_value,
-                    read_duration_s=read_duration_value,
-                    expect_hex=command_fields.get("expect_hex"),
-                    default_max_retries=command_fields.get("default_max_retries"),
-                    default_retry_backoff_s=command_fields.get("default_retry_backoff_s"),
-                    calibration_label=command_fields.get("calibration_label"),
-                )
-            profile = ProtocolProfile(
-                name=name,
-                description=data.get("description"),
-                poll_hex=data.get("poll_hex"),
-                poll_interval_s=data.get("poll_interval_s"),
-                baud=data.get("baud"),
-                data_bits=data.get("data_bits"),
-                stop_bits=data.get("stop_bits"),
-                parity=data.get("parity"),
-                latency_timer_ms=data.get("latency_timer_ms"),
-                read_timeout_ms=data.get("read_timeout_ms"),
-                write_timeout_ms=data.get("write_timeout_ms"),
-                chunk_size=data.get("chunk_size"),
-                transport=data.get("transport"),
-                handshake=data.get("handshake"),
-                commands=command_defs,
-            )
+                        command_name,
+                        *map(get, _COMMAND_LEADING_FIELDS),
+                        post_delay_value,
+                        read_duration_value,
+                        *map(get, _COMMAND_TRAILING_FIELDS),
+                    )
+            get = data.get
+            profile = ProtocolProfile(name, *map(get, _PROFILE_FIELDS), command_defs)
             profiles[name.lower()] = profile
         return cls(profiles)
 
 
+# Registry keys copied verbatim, in constructor order, so `from_dict` can build
+# each definition positionally. `name` comes from the mapping key, the numeric
+# command delays are coerced and `commands` is built separately.
+_COMMAND_FIELD_NAMES = tuple(item.name for item in fields(CommandDefinition))
+_COMMAND_LEADING_FIELDS = _COMMAND_FIELD_NAMES[1:_COMMAND_FIELD_NAMES.index("post_delay_s")]
+_COMMAND_TRAILING_FIELDS = _COMMAND_FIELD_NAMES[_COMMAND_FIELD_NAMES.index("read_duration_s") + 1:]
+_PROFILE_FIELDS = tuple(item.name for item in fields(ProtocolProfile))[1:-1]
+
+
 DEFAULT_PROFILES: Dict[str, Dict[str, Any]] = {
     "cx505": {
         "description": "Default CX-505 handshake and transport parameters.",
@@ -199,57 +209,65 @@ DEFAULT_PROFILES: Dict[str, Dict[str, Any]] = {
     },
 }
 
-
-
+# Registries are read-only once built, so the built-in one is shared.
+_DEFAULT_REGISTRY = ProtocolRegistry.from_dict(DEFAULT_PROFILES)
 
 
 def load_registry(path: Optional[Path]) -> ProtocolRegistry:
     """Load protocol profiles from *path* or use built-in defaults."""
 
     if path is None:
-        return ProtocolRegistry.from_dict(DEFAULT_PROFILES)
+        return _DEFAULT_REGISTRY
     resolved = path.expanduser()
     if not resolved.exists():
         raise FileNotFoundError(f"Protocol registry '{resolved}' not found")
-    suffix = resolved.suffix.lower()
-    if suffix in {".toml", ".tml"}:
-        payload = _load_toml(resolved)
-    elif suffix in {".json", ".jsn"}:
-        payload = _load_json(resolved)
-    elif suffix in {".yaml", ".yml"}:
-        payload = _load_yaml(resolved)
-    else:
-        raise ValueError(f"Unsupported protocol registry format: {resolved.suffix}")
+    payload = _load_registry_payload(resolved)
     profiles = payload.get("profiles") if isinstance(payload, dict) else None
     if not isinstance(profiles, dict):
         raise ValueError("Protocol registry must contain a 'profiles' mapping")
     return ProtocolRegistry.from_dict(profiles)
 
 
-def _load_json(path: Path) -> Dict[str, Any]:
-    import json
+def _load_registry_payload(path: Path) -> Any:
+    """Parse the registry at *path*, reusing the result while the file is unchanged.
 
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    The returned payload is shared between callers and must be treated as read-only.
+    """
+
+    stat = path.stat()
+    return _parse_registry(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _parse_registry(path: str, mtime_ns: int, size: int) -> Any:
+    resolved = Path(path)
+    loader = _REGISTRY_LOADERS.get(resolved.suffix.lower())
+    if loader is None:
+        raise ValueError(f"Unsupported protocol registry format: {resolved.suffix}")
+    return loader(resolved)
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    return loads_bytes(path.read_bytes())
 
 
 def _load_toml(path: Path) -> Dict[str, Any]:
-    try:
-        import tomllib
-    except ModuleNotFoundError as exc:  # pragma: no cover - runtime guard
-        raise RuntimeError("tomllib is required to parse TOML protocol registries") from exc
+    if tomllib is None:  # pragma: no cover - runtime guard
+        raise RuntimeError("tomllib is required to parse TOML protocol registries")
     with path.open("rb") as handle:
         return tomllib.load(handle)
 
 
 def _load_yaml(path: Path) -> Dict[str, Any]:
-    try:
-        import yaml  # type: ignore
-    except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
-        raise RuntimeError("PyYAML is required to parse YAML protocol registries") from exc
-    with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
-
-
+    return loads_yaml(path.read_bytes()) or {}
 
 
+# Registry parsers keyed by lower-cased file suffix.
+_REGISTRY_LOADERS: Dict[str, Callable[[Path], Dict[str, Any]]] = {
+    ".toml": _load_toml,
+    ".tml": _load_toml,
+    ".json": _load_json,
+    ".jsn": _load_json,
+    ".yaml": _load_yaml,
+    ".yml": _load_yaml,
+}
@@ -1,13 +1,18 @@
 ﻿from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple
 
-from .registry import _load_json, _load_toml, _load_yaml
+from .registry import _REGISTRY_LOADERS, _load_registry_payload
 
-VALID_TRANSPORTS = {"ftdi", "ble", "sim"}
-VALID_PARITIES = {"N", "E", "O", "M", "S"}
+VALID_TRANSPORTS = frozenset({"ftdi", "ble", "sim"})
+VALID_PARITIES = frozenset({"N", "E", "O", "M", "S"})
+_SORTED_TRANSPORTS = sorted(VALID_TRANSPORTS)
+# Two-digit hex bytes separated by whitespace and/or dashes, e.g. "01 23-30".
+_HEX_BYTES_RE = re.compile(r"[\s-]*[0-9A-Fa-f]{2}(?:[\s-]+[0-9A-Fa-f]{2})*[\s-]*")
 
 
 @dataclass(slots=True)
@@ -22,21 +27,37 @@ class ValidationIssue:
 
 @dataclass(slots=True)
 class ValidationResult:
-    issues: List[ValidationIssue]
-
-    @property
-    def errors(self) -> List[ValidationIssue]:
-        return [issue for issue in self.issues if issue.level == "error"]
-
-    @property
-    def warnings(self) -> List[ValidationIssue]:
-        return [issue for issue in self.issues if issue.level == "warning"]
+    """Issues found by a validation run, partitioned by level once per change.
+
+    ``issues`` is held as a tuple; add to it through `extend` or `merge` so
+    ``errors`` and ``warnings`` stay in step.
+    """
+
+    issues: Tuple[ValidationIssue, ...]
+    errors: Tuple[ValidationIssue, ...] = field(init=False, repr=False, compare=False)
+    warnings: Tuple[ValidationIssue, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.issues = tuple(self.issues)
+        self._partition()
+
+    def _partition(self) -> None:
+        errors: List[ValidationIssue] = []
+        warnings: List[ValidationIssue] = []
+        for issue in self.issues:
+            if issue.level == "error":
+                errors.append(issue)
+            elif issue.level == "warning":
+                warnings.append(issue)
+        self.errors = tuple(errors)
+        self.warnings = tuple(warnings)
 
     def extend(self, issues: Iterable[ValidationIssue]) -> None:
-        self.issues.extend(issues)
+        self.issues = (*self.issues, *issues)
+        self._partition()
 
     def merge(self, other: "ValidationResult") -> None:
-        self.issues.extend(other.issues)
+        self.extend(other.issues)
 
 
 def validate_registry_payload(payload: Mapping[str, Any]) -> ValidationResult:
@@ -53,18 +74,12 @@ def validate_registry_file(path: Path) -> ValidationResult:
     if not path.exists():
         return ValidationResult([ValidationIssue("error", str(path), "Registry file not found")])
 
-    suffix = path.suffix.lower()
+    if path.suffix.lower() not in _REGISTRY_LOADERS:
+        return ValidationResult([
+            ValidationIssue("error", str(path), f"Unsupported registry format '{path.suffix}'"),
+        ])
     try:
-        if suffix in {".toml", ".tml"}:
-            payload = _load_toml(path)
-        elif suffix in {".json", ".jsn"}:
-            payload = _load_json(path)
-        elif suffix in {".yaml", ".yml"}:
-            payload = _load_yaml(path)
-        else:
-            return ValidationResult([
-                ValidationIssue("error", str(path), f"Unsupported registry format '{path.suffix}'"),
-            ])
+        payload = _load_registry_payload(path)
     except Exception as exc:  # pragma: no cover - parsing safety
         return ValidationResult([
             ValidationIssue("error", str(path), f"Failed to parse registry: {exc}"),
@@ -81,14 +96,13 @@ def validate_profiles(profiles: Mapping[str, Any]) -> ValidationResult:
     if not profiles:
         issues.append(ValidationIssue("error", "profiles", "No protocol profiles defined"))
         return ValidationResult(issues)
-    name_counts: Dict[str, int] = {}
+    name_counts: Counter[str] = Counter()
     for name, profile in profiles.items():
         location = f"profiles.{name}"
         if not isinstance(profile, Mapping):
             issues.append(ValidationIssue("error", location, "Profile must be a mapping"))
             continue
-        lowered = name.lower()
-        name_counts[lowered] = name_counts.get(lowered, 0) + 1
+        name_counts[name.lower()] += 1
         issues.extend(_validate_profile(name, profile))
 
     for lowered, count in name_counts.items():
@@ -118,65 +132,19 @@ def _validate_profile(name: str, profile: Mapping[str, Any]) -> List[ValidationI
             ValidationIssue(
                 "error",
                 f"{location}.transport",
-                f"Unknown transport '{transport}'; expected one of {sorted(VALID_TRANSPORTS)}",
-            )
-        )
-
-    poll_hex = profile.get("poll_hex")
-    if poll_hex is not None and not _is_hex_string(poll_hex):
-        issues.append(ValidationIssue("error", f"{location}.poll_hex", "poll_hex must be space-separated hex bytes"))
-
-    poll_interval = profile.get("poll_interval_s")
-    if poll_interval is not None and not _is_positive_number(poll_interval, allow_zero=False):
-        issues.append(ValidationIssue("error", f"{location}.poll_interval_s", "poll_interval_s must be > 0"))
-
-    baud = profile.get("baud")
-    if baud is not None and not _is_positive_int(baud):
-        issues.append(ValidationIssue("error", f"{location}.baud", "baud must be a positive integer"))
-
-    data_bits = profile.get("data_bits")
-    if data_bits is not None and not _is_positive_int(data_bits):
-        issues.append(ValidationIssue("error", f"{location}.data_bits", "data_bits must be a positive integer"))
-
-    stop_bits = profile.get("stop_bits")
-    if stop_bits is not None and not _is_positive_number(stop_bits, allow_zero=False):
-        issues.append(ValidationIssue("error", f"{location}.stop_bits", "stop_bits must be > 0"))
-
-    parity = profile.get("parity")
-    if parity is not None and (not isinstance(parity, str) or parity.upper() not in VALID_PARITIES):
-        issues.append(
-            ValidationIssue(
-                "error",
-                f"{location}.parity",
-                f"parity must be one of {sorted(VALID_PARITIES)}",
+                f"Unknown transport '{transport}'; expected one of {_SORTED_TRANSPORTS}",
             )
         )
 
-    latency = profile.get("latency_timer_ms")
-    if latency is not None and not _is_non_negative_int(latency):
-        issues.append(ValidationIssue("error", f"{location}.latency_timer_ms", "latency_timer_ms must be >= 0"))
-
-    read_timeout = profile.get("read_timeout_ms")
-    if read_timeout is not None and not _is_non_negative_int(read_timeout):
-        issues.append(ValidationIssue("error", f"{location}.read_timeout_ms", "read_timeout_ms must be >= 0"))
-
-    write_timeout = profile.get("write_timeout_ms")
-    if write_timeout is not None and not _is_non_negative_int(write_timeout):
-        issues.append(ValidationIssue("error", f"{location}.write_timeout_ms", "write_timeout_ms must be >= 0"))
-
-    chunk_size = profile.get("chunk_size")
-    if chunk_size is not None and not _is_positive_int(chunk_size):
-        issues.append(ValidationIssue("error", f"{location}.chunk_size", "chunk_size must be a positive integer"))
+    issues.extend(_check_fields(profile, location, _PROFILE_FIELD_RULES))
 
     commands = profile.get("commands")
     if commands is not None:
         if not isinstance(commands, Mapping):
             issues.append(ValidationIssue("error", f"{location}.commands", "commands must be a mapping"))
         else:
-            command_names: Dict[str, int] = {}
+            command_names = Counter(command_name.lower() for command_name in commands)
             for command_name, command_data in commands.items():
-                lowered = command_name.lower()
-                command_names[lowered] = command_names.get(lowered, 0) + 1
                 issues.extend(_validate_command(name, command_name, command_data))
             for lowered, count in command_names.items():
                 if count > 1:
@@ -213,83 +181,95 @@ def _validate_command(profile_name: str, command_name: str, command_data: Any) -
     if write_ascii is not None and not isinstance(write_ascii, str):
         issues.append(ValidationIssue("error", f"{location}.write_ascii", "write_ascii must be a string"))
 
-    expect_hex = command_data.get("expect_hex")
-    if expect_hex is not None and not _is_hex_string(expect_hex):
-        issues.append(ValidationIssue("error", f"{location}.expect_hex", "expect_hex must be space-separated hex bytes"))
-
-    post_delay = command_data.get("post_delay_s")
-    if post_delay is not None and not _is_non_negative_number(post_delay):
-        issues.append(ValidationIssue("error", f"{location}.post_delay_s", "post_delay_s must be >= 0"))
-
-    read_duration = command_data.get("read_duration_s")
-    if read_duration is not None and not _is_positive_number(read_duration, allow_zero=False):
-        issues.append(ValidationIssue("error", f"{location}.read_duration_s", "read_duration_s must be > 0 when provided"))
-
-    max_retries = command_data.get("default_max_retries")
-    if max_retries is not None and not _is_non_negative_int(max_retries):
-        issues.append(ValidationIssue("error", f"{location}.default_max_retries", "default_max_retries must be >= 0"))
+    issues.extend(_check_fields(command_data, location, _COMMAND_FIELD_RULES))
+    return issues
 
-    retry_backoff = command_data.get("default_retry_backoff_s")
-    if retry_backoff is not None and not _is_positive_number(retry_backoff, allow_zero=False):
-        issues.append(
-            ValidationIssue(
-                "error",
-                f"{location}.default_retry_backoff_s",
-                "default_retry_backoff_s must be > 0 when provided",
-            )
-        )
 
-    category = command_data.get("category")
-    if category is not None and not isinstance(category, str):
-        issues.append(ValidationIssue("error", f"{location}.category", "category must be a string"))
-    calibration_label = command_data.get("calibration_label")
-    if calibration_label is not None and not isinstance(calibration_label, str):
-        issues.append(
-            ValidationIssue("error", f"{location}.calibration_label", "calibration_label must be a string"),
-        )
+def _check_fields(
+    data: Mapping[str, Any],
+    location: str,
+    rules: Tuple[Tuple[str, Callable[[Any], bool], str], ...],
+) -> List[ValidationIssue]:
+    """Apply *rules* to the fields of *data* that are present (not None)."""
 
+    issues: List[ValidationIssue] = []
+    get = data.get
+    for key, check, message in rules:
+        value = get(key)
+        if value is not None and not check(value):
+            issues.append(ValidationIssue("error", f"{location}.{key}", message))
     return issues
 
 
 def _is_hex_string(value: Any) -> bool:
-    if not isinstance(value, str):
-        return False
-    tokens = [token for token in value.replace("-", " ").split() if token]
-    if not tokens:
-        return False
-    for token in tokens:
-        if len(token) != 2:
-            return False
-        try:
-            int(token, 16)
-        except ValueError:
-            return False
-    return True
-
-
-def _is_positive_number(value: Any, *, allow_zero: bool) -> bool:
-    try:
-        numeric = float(value)
-    except (TypeError, ValueError):
-        return False
-    return numeric >= 0 if allow_zero else numeric > 0
+    return isinstance(value, str) and _HEX_BYTES_RE.fullmatch(value) is not None
+
+
+def _is_positive_number(value: Any) -> bool:
+    numeric = _as_number(value, float)
+    return numeric is not None and numeric > 0
 
 
 def _is_non_negative_number(value: Any) -> bool:
-    return _is_positive_number(value, allow_zero=True)
+    numeric = _as_number(value, float)
+    return numeric is not None and numeric >= 0
 
 
 def _is_positive_int(value: Any) -> bool:
-    try:
-        integer = int(value)
-    except (TypeError, ValueError):
-        return False
-    return integer > 0
+    integer = _as_number(value, int)
+    return integer is not None and integer > 0
 
 
 def _is_non_negative_int(value: Any) -> bool:
+    integer = _as_number(value, int)
+    return integer is not None and integer >= 0
+
+
+def _as_number(value: Any, convert: Callable[[Any], Any]) -> Optional[Any]:
+    """Return *value* as a number via *convert*, or None when it is not numeric.
+
+    Parsed registries mostly hold plain ints and floats, which skip conversion.
+    Booleans are rejected even though they subclass int.
+    """
+
+    kind = type(value)
+    if kind is int or (kind is float and convert is float):
+        return value
+    if kind is bool:
+        return None
     try:
-        integer = int(value)
-    except (TypeError, ValueError):
-        return False
-    return integer >= 0
+        return convert(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _is_parity(value: Any) -> bool:
+    return isinstance(value, str) and value.upper() in VALID_PARITIES
+
+
+def _is_str(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+# (key, check, message) rules applied in order to fields that are present.
+_PROFILE_FIELD_RULES: Tuple[Tuple[str, Callable[[Any], bool], str], ...] = (
+    ("poll_hex", _is_hex_string, "poll_hex must be space-separated hex bytes"),
+    ("poll_interval_s", _is_positive_number, "poll_interval_s must be > 0"),
+    ("baud", _is_positive_int, "baud must be a positive integer"),
+    ("data_bits", _is_positive_int, "data_bits must be a positive integer"),
+    ("stop_bits", _is_positive_number, "stop_bits must be > 0"),
+    ("parity", _is_parity, f"parity must be one of {sorted(VALID_PARITIES)}"),
+    ("latency_timer_ms", _is_non_negative_int, "latency_timer_ms must be >= 0"),
+    ("read_timeout_ms", _is_non_negative_int, "read_timeout_ms must be >= 0"),
+    ("write_timeout_ms", _is_non_negative_int, "write_timeout_ms must be >= 0"),
+    ("chunk_size", _is_positive_int, "chunk_size must be a positive integer"),
+)
+_COMMAND_FIELD_RULES: Tuple[Tuple[str, Callable[[Any], bool], str], ...] = (
+    ("expect_hex", _is_hex_string, "expect_hex must be space-separated hex bytes"),
+    ("post_delay_s", _is_non_negative_number, "post_delay_s must be >= 0"),
+    ("read_duration_s", _is_positive_number, "read_duration_s must be > 0 when provided"),
+    ("default_max_retries", _is_non_negative_int, "default_max_retries must be >= 0"),
+    ("default_retry_backoff_s", _is_positive_number, "default_retry_backoff_s must be > 0 when provided"),
+    ("category", _is_str, "category must be a string"),
+    ("calibration_label", _is_str, "calibration_label must be a string"),
+)
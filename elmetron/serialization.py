@@ -0,0 +1,74 @@
+"""JSON encoding helpers with an optional `orjson` fast path, plus YAML decoding."""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any
+
+try:
+    import orjson  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Match the stdlib behaviour of stringifying non-str mapping keys.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+# PyYAML is optional and slow to import, so it is loaded on first use only.
+_YAML: Any = None
+
+
+def dumps_bytes(payload: Any, *, indent: bool = False, newline: bool = False) -> bytes:
+    """Encode *payload* as UTF-8 JSON bytes.
+
+    Output is compact unless *indent* is set (two spaces, as for exported
+    files); *newline* appends a trailing newline for NDJSON streams. Uses
+    `orjson` when installed and falls back to the stdlib encoder. Both raise
+    `TypeError` (or a subclass) for unserialisable values.
+    """
+
+    if orjson is not None:
+        option = _ORJSON_OPTIONS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(payload, option=option)
+    text = json.dumps(payload, ensure_ascii=False, indent=2 if indent else None)
+    if newline:
+        text += '\n'
+    return text.encode('utf-8')
+
+
+def loads_bytes(data: bytes) -> Any:
+    """Decode UTF-8 JSON *data*, ignoring a leading byte-order mark.
+
+    Uses `orjson` when installed. Malformed input raises
+    `json.JSONDecodeError` (`orjson.JSONDecodeError` subclasses it).
+    """
+
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def loads_yaml(data: bytes) -> Any:
+    """Decode YAML *data* with PyYAML's safe loader.
+
+    Prefers the LibYAML-backed `CSafeLoader`, which applies the same safe tag
+    set. Raises `RuntimeError` when PyYAML is not installed.
+    """
+
+    global _YAML
+    if _YAML is None:
+        try:
+            import yaml  # type: ignore
+        except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("PyYAML is required to parse YAML files") from exc
+        _YAML = yaml
+    loader = getattr(_YAML, "CSafeLoader", _YAML.SafeLoader)
+    return _YAML.load(data, Loader=loader)
+
+
+__all__ = ["dumps_bytes", "loads_bytes", "loads_yaml"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -11,8 +12,15 @@ from typing import Any, Dict, Optional
 
 from ..config import StorageConfig
 
+_DERIVED_METRICS_UPSERT = """
+    INSERT INTO derived_metrics (measurement_id, metrics_json)
+    VALUES (?, ?)
+    ON CONFLICT(measurement_id)
+    DO UPDATE SET metrics_json = excluded.metrics_json, created_at = CURRENT_TIMESTAMP
+"""
 
-@dataclass(slots=True)
+
+@dataclass(slots=True, frozen=True)
 class DeviceMetadata:
     serial: Optional[str]
     description: Optional[str]
@@ -42,15 +50,34 @@ class Database:
         if config.ensure_directories:
             self._path.parent.mkdir(parents=True, exist_ok=True)
         self._connection: Optional[sqlite3.Connection] = None
+        self._audit_condition = threading.Condition()
+        self._audit_generation = 0
 
     @property
     def path(self) -> Path:
         return self._path
 
+    @property
+    def audit_generation(self) -> int:
+        """Counter bumped every time an audit event is committed."""
+
+        return self._audit_generation
+
+    def wait_for_audit_events(self, generation: int, timeout: Optional[float]) -> int:
+        """Block until the audit generation moves past *generation* or *timeout* elapses."""
+
+        with self._audit_condition:
+            self._audit_condition.wait_for(lambda: self._audit_generation != generation, timeout)
+            return self._audit_generation
+
     def connect(self) -> sqlite3.Connection:
         if self._connection is None:
             self._connection = sqlite3.connect(str(self._path))
             self._connection.row_factory = sqlite3.Row
+            # Capture commits run on the acquisition thread. In WAL mode NORMAL
+            # defers fsync to checkpoints, so a slow disk no longer stalls every
+            # frame; committed data still survives an application crash.
+            self._connection.execute('PRAGMA synchronous=NORMAL')
         return self._connection
 
     def close(self) -> None:
@@ -416,15 +443,7 @@ class Database:
         conn = self.connect()
         payload = json.dumps(metrics, ensure_ascii=False)
         with conn:
-            conn.execute(
-                """
-                INSERT INTO derived_metrics (measurement_id, metrics_json)
-                VALUES (?, ?)
-                ON CONFLICT(measurement_id)
-                DO UPDATE SET metrics_json = excluded.metrics_json, created_at = CURRENT_TIMESTAMP
-                """,
-                (measurement_id, payload),
-            )
+            conn.execute(_DERIVED_METRICS_UPSERT, (measurement_id, payload))
 
 
     def append_audit_event(self, session_id: int, event: AuditEvent) -> None:
@@ -440,6 +459,9 @@ class Database:
                 """,
                 (session_id, event.level, event.category, event.message, payload_json),
             )
+        with self._audit_condition:
+            self._audit_generation += 1
+            self._audit_condition.notify_all()
 
 
     def recent_audit_events(
@@ -447,9 +469,21 @@ class Database:
         *,
         limit: int = 20,
         since_id: Optional[int] = None,
+        order: str = 'desc',
+        level: Optional[str] = None,
+        category: Optional[str] = None,
     ) -> list[Dict[str, Any]]:
-        """Return the most recent audit events for dashboards/diagnostics."""
+        """Return the most recent audit events for dashboards/diagnostics.
+
+        Events are returned newest-first by default. With ``order='asc'`` they
+        are returned oldest-first: the latest *limit* events when *since_id* is
+        omitted, otherwise the next *limit* events after *since_id* so
+        streaming consumers can page forward without gaps. *level* and
+        *category* restrict the result to case-insensitive matches.
+        """
 
+        if order not in {'asc', 'desc'}:
+            raise ValueError("order must be 'asc' or 'desc'")
         try:
             limit_value = int(limit)
         except (TypeError, ValueError):
@@ -459,6 +493,7 @@ class Database:
         query = ["SELECT id, session_id, level, category, message, payload_json, created_at FROM audit_events"]
         params: list[Any] = []
         where_clauses = []
+        paging_forward = False
         if since_id is not None:
             try:
                 since_value = int(since_id)
@@ -467,18 +502,31 @@ class Database:
             else:
                 where_clauses.append('id > ?')
                 params.append(since_value)
+                paging_forward = True
+        if level:
+            where_clauses.append('level = ? COLLATE NOCASE')
+            params.append(str(level))
+        if category:
+            where_clauses.append('category = ? COLLATE NOCASE')
+            params.append(str(category))
 
         if where_clauses:
             query.append('WHERE ' + ' AND '.join(where_clauses))
 
-        query.append('ORDER BY id DESC')
+        if order == 'asc' and paging_forward:
+            query.append('ORDER BY id ASC')
+        else:
+            query.append('ORDER BY id DESC')
         query.append('LIMIT ?')
         params.append(limit_value)
+        sql = ' '.join(query)
+        if order == 'asc' and not paging_forward:
+            sql = f'SELECT * FROM ({sql}) ORDER BY id ASC'
 
         conn = sqlite3.connect(str(self._path))
         conn.row_factory = sqlite3.Row
         try:
-            rows = conn.execute(' '.join(query), params).fetchall()
+            rows = conn.execute(sql, params).fetchall()
         finally:
             conn.close()
 
@@ -510,6 +558,14 @@ class Database:
                 """
             )
             conn.execute('PRAGMA user_version = 1')
+        if current_version < 2:
+            conn.executescript(
+                """
+                CREATE INDEX IF NOT EXISTS idx_audit_events_category_level
+                    ON audit_events(category COLLATE NOCASE, level COLLATE NOCASE, id);
+                """
+            )
+            conn.execute('PRAGMA user_version = 2')
 
     def recent_sessions(
         self,
@@ -762,8 +818,12 @@ class SessionHandle:
                 ),
             )
             measurement_id = measurement_cursor.lastrowid
-        if derived_metrics:
-            self._database.set_derived_metrics(measurement_id, derived_metrics)
+            if derived_metrics:
+                # Same transaction as the frame: one commit per capture.
+                conn.execute(
+                    _DERIVED_METRICS_UPSERT,
+                    (measurement_id, json.dumps(derived_metrics, ensure_ascii=False)),
+                )
         self._frames += 1
         return StoredMeasurement(frame_id=frame_id, measurement_id=measurement_id)
 
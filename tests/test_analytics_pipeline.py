@@ -276,3 +276,89 @@ def test_export_session_lims_xml_template(seeded_session, tmp_path) -> None:
     xml_text = xml_path.read_text(encoding='utf-8')
     assert '<SessionReport' in xml_text
     assert '<Measurements>' in xml_text
+
+
+def test_store_capture_commits_frame_and_metrics_together(tmp_path) -> None:
+    database = Database(StorageConfig(database_path=tmp_path / 'commit.sqlite', ensure_directories=False))
+    database.initialise()
+    session = database.start_session(datetime.utcnow(), DeviceMetadata(serial='C1', description=None, model='CX-505'))
+    statements: list[str] = []
+    conn = database.connect()
+    conn.set_trace_callback(statements.append)
+    try:
+        stored = session.store_capture(
+            datetime.utcnow(),
+            b'\x01\x02',
+            {'measurement': {'value': 7.0, 'unit': 'pH'}},
+            derived_metrics={'stability': 0.5},
+        )
+    finally:
+        conn.set_trace_callback(None)
+
+    assert sum(1 for statement in statements if statement.strip().upper() == 'COMMIT') == 1
+    row = conn.execute(
+        'SELECT metrics_json FROM derived_metrics WHERE measurement_id = ?', (stored.measurement_id,)
+    ).fetchone()
+    assert json.loads(row['metrics_json']) == {'stability': 0.5}
+    database.close()
+
+
+def test_frame_ingestor_emits_full_raw_frame_hex(tmp_path) -> None:
+    database = Database(StorageConfig(database_path=tmp_path / 'hex.sqlite', ensure_directories=False))
+    database.initialise()
+    session = database.start_session(datetime.utcnow(), DeviceMetadata(serial='H1', description=None, model='CX-505'))
+    ingestor = FrameIngestor(AppConfig().ingestion, session)
+    frame = b'\x01#CX-505#PH\x17\x02#001# 7.123 pH# 24.7 C\x1e\x03\r\n'
+
+    result = ingestor.handle_frame(frame)
+
+    assert result is not None
+    assert result['raw_frame_hex'] == frame.hex()
+    assert result['raw_hex'] == frame.rstrip(b'\r\n').hex()
+    database.close()
+
+
+def test_frame_ingestor_updates_instrument_only_on_header_change(tmp_path, monkeypatch) -> None:
+    database = Database(StorageConfig(database_path=tmp_path / 'meta.sqlite', ensure_directories=False))
+    database.initialise()
+    session = database.start_session(datetime.utcnow(), DeviceMetadata(serial=None, description=None, model=None))
+    ingestor = FrameIngestor(AppConfig().ingestion, session)
+    headers = iter([{'serial': 'A1', 'model': 'CX-505'}] * 3 + [{'serial': 'B2', 'model': 'CX-505'}])
+    monkeypatch.setattr(
+        cx505_d2xx,
+        '_decode_frame',
+        lambda _frame: {'header': next(headers), 'measurement': {'value': 7.0, 'unit': 'pH'}},
+    )
+    updates: list[DeviceMetadata] = []
+    original_update = session.update_instrument
+
+    def record_update(metadata: DeviceMetadata) -> int:
+        updates.append(metadata)
+        return original_update(metadata)
+
+    monkeypatch.setattr(session, 'update_instrument', record_update)
+
+    for _ in range(4):
+        result = ingestor.handle_frame(b'\x00')
+        assert result is not None
+
+    assert [meta.serial for meta in updates] == ['A1', 'B2']
+    assert result['device']['serial'] == 'B2'
+    database.close()
+
+
+def test_frame_ingestor_accepts_buffer_views(tmp_path) -> None:
+    database = Database(StorageConfig(database_path=tmp_path / 'view.sqlite', ensure_directories=False))
+    database.initialise()
+    session = database.start_session(datetime.utcnow(), DeviceMetadata(serial='V1', description=None, model='CX-505'))
+    ingestor = FrameIngestor(AppConfig().ingestion, session)
+    frame = b'\x01#CX-505#PH\x17\x02#001# 7.123 pH# 24.7 C\x1e\x03\r\n'
+    buffer = bytearray(b'--' + frame + b'--')
+
+    result = ingestor.handle_frame(memoryview(buffer)[2:-2])
+
+    assert result is not None
+    assert result['raw_frame_hex'] == frame.hex()
+    stored = database.connect().execute('SELECT frame_bytes FROM raw_frames').fetchone()
+    assert bytes(stored['frame_bytes']) == frame
+    database.close()
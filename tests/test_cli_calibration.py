@@ -48,3 +48,10 @@ def test_find_by_name_case_insensitive_lookup() -> None:
     assert find_by_name(entries, "CALIBRATE_PH7").name == "calibrate_ph7"
     with pytest.raises(KeyError):
         find_by_name(entries, "unknown")
+
+
+def test_collect_calibrations_indexes_names() -> None:
+    calibrations = collect_calibrations(_build_profile())
+    assert set(calibrations.by_name) == {"calibrate_ph4", "calibrate_ph7"}
+    assert find_by_name(calibrations, " Calibrate_PH4 ") is calibrations[0]
+    assert find_by_name(list(calibrations), "calibrate_ph4") is calibrations[0]
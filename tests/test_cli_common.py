@@ -0,0 +1,35 @@
+﻿from __future__ import annotations
+
+from argparse import Namespace
+
+from elmetron.cli.common import apply_device_overrides
+from elmetron.config import DeviceConfig
+
+
+def test_apply_device_overrides_casts_and_skips_unset_values() -> None:
+    device = DeviceConfig()
+    args = Namespace(
+        device_index=0,
+        device_serial="",
+        profile=None,
+        no_profile_defaults=True,
+        baud=9600,
+        stop_bits="1",
+        parity="N",
+        poll_interval="2.5",
+        latency="4",
+        timeouts=(100, 200),
+    )
+
+    apply_device_overrides(device, args)
+
+    assert device.index == 0
+    assert device.serial is None
+    assert device.profile == "cx505"
+    assert device.use_profile_defaults is False
+    assert device.baud == 9600
+    assert device.stop_bits == 1.0
+    assert device.parity == "N"
+    assert device.poll_interval_s == 2.5
+    assert device.latency_timer_ms == 4
+    assert (device.read_timeout_ms, device.write_timeout_ms) == (100, 200)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from elmetron.commands import executor
+from elmetron.commands.executor import CommandDefinition, execute_command
+
+
+class _FakeInterface:
+    def __init__(self, frames):
+        self.frames = frames
+        self.writes = []
+
+    def write(self, payloads):
+        payloads = list(payloads)
+        self.writes.append(payloads)
+        return sum(len(payload) for payload in payloads)
+
+    def run_window(self, duration_s, frame_handler=None, print_raw=False):
+        for frame in self.frames:
+            frame_handler(frame)
+        return sum(len(frame) for frame in self.frames)
+
+
+def test_execute_command_reuses_decoded_payloads_and_expectation():
+    executor._encode_payloads.cache_clear()
+    executor._decode_expectation.cache_clear()
+    definition = CommandDefinition(
+        name='ping',
+        write_hex='02, 50 03',
+        write_ascii='OK',
+        read_duration_s=0.1,
+        expect_hex='06 01',
+    )
+    interface = _FakeInterface([b'\x06\x01\x02'])
+
+    first = execute_command(interface, definition)
+    second = execute_command(interface, definition)
+
+    assert interface.writes == [[b'\x02\x50\x03', b'OK']] * 2
+    assert first.matched_expectation is True
+    assert second.written_bytes == 5
+    assert executor._encode_payloads.cache_info().hits == 1
+    assert executor._decode_expectation.cache_info().hits == 1
+
+
+def test_execute_command_rejects_definition_without_payload():
+    with pytest.raises(ValueError, match='empty'):
+        execute_command(_FakeInterface([]), CommandDefinition(name='empty'))
@@ -0,0 +1,136 @@
+﻿from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from elmetron import config as config_module
+from elmetron.config import DEFAULT_POLL_HEX, AcquisitionConfig, AppConfig, DeviceConfig, load_config
+
+
+def test_load_config_reuses_parsed_payload_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'device': {'baud': 9600}}), encoding='utf-8')
+    calls = []
+    original = config_module._load_json
+
+    def _counting_load(target):
+        calls.append(target)
+        return original(target)
+
+    monkeypatch.setattr(config_module, '_load_json', _counting_load)
+    config_module._load_payload.cache_clear()
+
+    first = load_config(path)
+    first.device.baud = 1200  # callers may mutate their copy
+    second = load_config(path)
+    assert len(calls) == 1
+    assert second.device.baud == 9600
+    assert second is not first
+
+    path.write_text(json.dumps({'device': {'baud': 19200}}), encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_config(path).device.baud == 19200
+    assert len(calls) == 2
+
+    assert load_config(tmp_path / 'missing.json').device.baud == 115200
+
+
+def test_device_poll_bytes_tracks_poll_hex():
+    device = DeviceConfig()
+    assert device.poll_bytes == bytes.fromhex(DEFAULT_POLL_HEX)
+    assert device.poll_bytes is DeviceConfig().poll_bytes
+
+    device.poll_hex = '01, 02 ff'
+    assert device.poll_bytes == b'\x01\x02\xff'
+    device.poll_hex = '  '
+    assert device.poll_bytes is None
+
+
+@pytest.mark.parametrize(
+    ('text', 'expected'),
+    [
+        ('01 23 30 03', b'\x01\x23\x30\x03'),
+        ('0123', b'\x01\x23'),
+        ('1 a 0x1F', b'\x01\x0a\x1f'),
+        (',', None),
+    ],
+)
+def test_parse_hex_bytes_fast_path_and_fallback(text, expected):
+    assert config_module._parse_hex_bytes(text) == expected
+
+
+def test_parse_hex_bytes_rejects_garbage():
+    with pytest.raises(ValueError):
+        config_module._parse_hex_bytes('zz')
+
+
+def test_coerce_tuple_normalises_inputs():
+    coerce = config_module._coerce_tuple
+    fields = ('a', 'b')
+
+    assert coerce(fields) is fields
+    assert coerce(None) == ()
+    assert coerce(['a', 'b']) == fields
+    assert coerce('a') == ('a',)
+    assert coerce('') == ()
+    assert coerce(iter(['x'])) == ('x',)
+    assert coerce(5) == ('5',)
+
+
+def test_app_config_to_dict_covers_every_section_field():
+    config = AppConfig()
+    payload = config.to_dict()
+
+    for name in ('device', 'storage', 'ingestion', 'analytics', 'export'):
+        section = getattr(config, name)
+        assert list(payload[name]) == list(section.__dataclass_fields__)
+    assert payload['device']['poll_hex'] == config.device.poll_hex
+    assert payload['storage']['database_path'] == str(config.storage.database_path)
+    json.dumps(payload)
+
+
+def test_app_config_from_dict_copies_section_objects_without_revalidating(monkeypatch):
+    class LabDeviceConfig(DeviceConfig):
+        pass
+
+    device = LabDeviceConfig(baud=9600)
+    acquisition = AcquisitionConfig()
+    monkeypatch.setattr(DeviceConfig, '__post_init__', lambda self: pytest.fail('revalidated'))
+    monkeypatch.setattr(AcquisitionConfig, '__post_init__', lambda self: pytest.fail('revalidated'))
+
+    sections = {'device': device, 'acquisition': acquisition}
+    first = AppConfig.from_dict(sections)
+    second = AppConfig.from_dict(sections)
+    first.device.baud = 19200
+    first.acquisition.startup_commands.append('calibrate_ph7')
+
+    assert type(second.device) is LabDeviceConfig
+    assert second.device.baud == 9600
+    assert device.baud == 9600
+    assert second.acquisition.startup_commands == acquisition.startup_commands == []
+    with pytest.raises(TypeError):
+        AppConfig.from_dict({'device': ['not', 'a', 'mapping']})
+
+
+def test_acquisition_config_normalises_startup_commands():
+    config = AcquisitionConfig(startup_commands=[' ping ', '', '   ', None, 'calibrate'])
+    assert config.startup_commands == ['ping', 'calibrate']
+
+
+def test_device_config_dedupes_fallback_profiles_case_insensitively():
+    device = DeviceConfig(fallback_profiles=['CX505', ' cx505 ', None, '', 'cx705', 'Cx705'])
+    assert device.fallback_profiles == ('CX505', 'cx705')
+
+
+def test_load_config_reads_yaml(tmp_path):
+    pytest.importorskip('yaml')
+    path = tmp_path / 'config.yaml'
+    path.write_text('device:\n  baud: 57600\nexport:\n  csv_mode: full\n', encoding='utf-8')
+
+    config = load_config(path)
+
+    assert config.device.baud == 57600
+    assert config.export.csv_mode == 'full'
@@ -48,6 +48,36 @@ def test_decode_frame_parses_measurement_sections():
     assert measurement_info.get('extra_fields') is None
 
 
+@pytest.mark.parametrize(
+    ('date_text', 'time_text', 'expected'),
+    [
+        ('25-09-2025', '12:34:56', '2025-09-25T12:34:56'),
+        ('5-9-2025', '7:04:05', '2025-09-05T07:04:05'),
+        ('31-02-2025', '12:00:00', None),
+        ('2025-09-25', '12:34:56', None),
+        ('25-09-2025', '12:34', None),
+    ],
+)
+def test_parse_timestamp_matches_strptime(date_text, time_text, expected):
+    assert cx505_d2xx._parse_timestamp(date_text, time_text) == expected
+
+
 def test_decode_frame_rejects_frames_without_soh():
     with pytest.raises(ValueError):
         cx505_d2xx._decode_frame(b'#001# 7.123 pH# 24.7 C# 25-09-2025# 12:34:56\x03\r\n')
+
+
+def test_write_payloads_passes_bytes_straight_to_ft_write(monkeypatch):
+    calls = []
+
+    def fake_write(handle, data, length, written_ref):
+        calls.append((data, length.value))
+        written_ref._obj.value = length.value
+        return 0
+
+    monkeypatch.setattr(cx505_d2xx, '_ft_write', fake_write)
+    poll = bytes.fromhex('01 23 30 03')
+
+    assert cx505_d2xx.write_payloads(None, [poll, b'', bytearray(b'\x02')]) == 5
+    assert calls[0][0] is poll
+    assert calls == [(poll, 4), (b'\x02', 1)]
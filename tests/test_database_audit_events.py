@@ -1,5 +1,7 @@
 ﻿from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime, timedelta
 
 from elmetron.config import StorageConfig
@@ -54,3 +56,68 @@ def test_recent_audit_events_supports_since_id(tmp_path):
     assert filtered
     assert all(event['id'] > middle_id for event in filtered)
     assert filtered[0]['id'] == newest_id
+
+
+def test_recent_audit_events_ascending_order(tmp_path):
+    database = _create_database(tmp_path)
+    handle = database.start_session(
+        datetime.utcnow(),
+        DeviceMetadata(serial='ASC', description=None, model='CX-505'),
+    )
+
+    for index in range(5):
+        handle.log_event('info', 'session', f'Event {index}')
+
+    latest = database.recent_audit_events(limit=3, order='asc')
+    assert [event['message'] for event in latest] == ['Event 2', 'Event 3', 'Event 4']
+
+    first_id = latest[0]['id'] - 2
+    paged = database.recent_audit_events(limit=2, since_id=first_id, order='asc')
+    assert [event['message'] for event in paged] == ['Event 1', 'Event 2']
+
+
+def test_wait_for_audit_events_wakes_on_insert(tmp_path):
+    database = _create_database(tmp_path)
+    handle = database.start_session(
+        datetime.utcnow(),
+        DeviceMetadata(serial='SIG', description=None, model='CX-505'),
+    )
+    generation = database.audit_generation
+
+    assert database.wait_for_audit_events(generation, timeout=0.01) == generation
+
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(database.wait_for_audit_events(generation, timeout=5.0)),
+    )
+    started = time.monotonic()
+    waiter.start()
+    handle.log_event('info', 'session', 'Wake up')
+    waiter.join(timeout=5.0)
+
+    assert results == [generation + 1]
+    assert time.monotonic() - started < 2.0
+
+
+def test_recent_audit_events_filters_level_and_category_in_query(tmp_path):
+    database = _create_database(tmp_path)
+    handle = database.start_session(
+        datetime.utcnow(),
+        DeviceMetadata(serial='FLT', description=None, model='CX-505'),
+    )
+
+    handle.log_event('warning', 'capture', 'Hiccup 1')
+    for index in range(5):
+        handle.log_event('info', 'session', f'Noise {index}')
+    handle.log_event('WARNING', 'Capture', 'Hiccup 2')
+
+    events = database.recent_audit_events(limit=2, level='warning', category='capture')
+    assert [event['message'] for event in events] == ['Hiccup 2', 'Hiccup 1']
+
+    ascending = database.recent_audit_events(limit=1, level='info', order='asc')
+    assert [event['message'] for event in ascending] == ['Noise 4']
+
+    conn = database.connect()
+    assert conn.execute('PRAGMA user_version').fetchone()[0] >= 2
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list('audit_events')")}
+    assert 'idx_audit_events_category_level' in indexes
@@ -24,5 +24,7 @@ def test_database_creates_overlay_indexes(tmp_path):
     assert 'idx_measurements_session_timestamp' in measurement_indexes
     assert 'idx_raw_frames_session_captured_at' in raw_frame_indexes
     assert user_version >= 1
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
 
     database.close()
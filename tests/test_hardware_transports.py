@@ -1,7 +1,10 @@
 ﻿from __future__ import annotations
 
+import dataclasses
 import importlib
 import sys
+import threading
+import time
 import types
 from collections import deque
 from typing import Deque, List, Optional
@@ -55,6 +58,10 @@ def test_create_interface_simulated_generates_frames(tmp_path) -> None:
     assert total > 0
     assert frames
     assert frames[0].startswith(b"SIM:")
+    counter, value, timestamp = frames[1].split(b":")[1:]
+    assert (counter, value) == (b"0002", b"702")
+    assert abs(int(timestamp) - time.time()) < 5
+    assert (tmp_path / "sim.log").read_bytes() == b"".join(frame + b"\n" for frame in frames)
     interface.close()
 
 
@@ -77,6 +84,34 @@ def test_create_interface_ble_uses_supplied_adapter_factory() -> None:
     assert not adapter.connected
 
 
+def test_ble_run_window_shortens_timeout_after_data() -> None:
+    adapter = FakeBleAdapter()
+    script: Deque[bytes | None] = deque([None, None, None, b"a", b"b", None, None])
+    timeouts: list[float] = []
+
+    def scripted_read(timeout: float) -> bytes | None:
+        timeouts.append(timeout)
+        if script:
+            return script.popleft()
+        time.sleep(timeout)
+        return None
+
+    adapter.read = scripted_read  # type: ignore[method-assign]
+    interface = BleBridgeInterface(
+        DeviceConfig(transport="ble"),
+        adapter_factory=lambda _: adapter,
+        read_interval_s=0.01,
+    )
+
+    collected: list[bytes] = []
+    assert interface.run_window(0.1, frame_handler=collected.append) == 2
+    assert collected == [b"a", b"b"]
+    assert timeouts[:7] == pytest.approx([0.001, 0.002, 0.004, 0.008, 0.001, 0.001, 0.002])
+    assert max(timeouts) <= 0.01
+
+    interface.close()
+
+
 def test_ble_write_sends_payloads_via_adapter() -> None:
     adapter = FakeBleAdapter()
     config = DeviceConfig(transport="ble")
@@ -89,6 +124,23 @@ def test_ble_write_sends_payloads_via_adapter() -> None:
     interface.close()
 
 
+def test_ble_write_passes_bytes_through_and_copies_views() -> None:
+    received: list[object] = []
+    adapter = FakeBleAdapter()
+    adapter.write = received.append  # type: ignore[method-assign]
+    interface = BleBridgeInterface(DeviceConfig(transport="ble"), adapter_factory=lambda _: adapter)
+    payload = b"PING"
+
+    assert interface.write([payload, bytearray(b"AB"), memoryview(b"xCDx")[1:3]]) == 8
+    assert received[0] is payload
+    assert received[1:] == [b"AB", b"CD"]
+    assert all(type(item) is bytes for item in received)
+    with pytest.raises(TypeError):
+        interface.write(["text"])  # type: ignore[list-item]
+
+    interface.close()
+
+
 def test_default_ble_adapter_factory_raises_without_dependency() -> None:
     config = DeviceConfig(
         transport="ble",
@@ -187,6 +239,26 @@ def test_cx505_interface_retries_until_success(monkeypatch) -> None:
     interface.close()
 
 
+@pytest.mark.parametrize("coalesce", [True, False])
+def test_cx505_write_coalesces_payloads(monkeypatch, coalesce: bool) -> None:
+    batches: list[list[bytes]] = []
+
+    def fake_write_payloads(_handle, payloads) -> int:
+        batch = list(payloads)
+        batches.append(batch)
+        return sum(len(payload) for payload in batch)
+
+    monkeypatch.setattr(device_manager.cx505_d2xx, "write_payloads", fake_write_payloads)
+    interface = device_manager.CX505Interface(DeviceConfig(poll_hex=None, coalesce_writes=coalesce))
+    interface._handle = object()  # type: ignore[assignment]
+
+    assert interface.write((b"\x01#", bytearray(b"30"), b"\x03")) == 5
+    if coalesce:
+        assert batches == [[b"\x01#30\x03"]]
+    else:
+        assert batches == [[b"\x01#", b"30", b"\x03"]]
+
+
 def test_cx505_interface_waits_for_device(monkeypatch) -> None:
     responses = [
         [],
@@ -254,6 +326,7 @@ def test_cx505_interface_closes_handle_on_configuration_failure(monkeypatch) ->
 
     def fake_configure(handle, *args, **kwargs):
         configure_calls.append(handle)
+        assert kwargs["latency_timer_ms"] == 4
         if len(configure_calls) == 1:
             raise RuntimeError("configure failed")
 
@@ -266,7 +339,13 @@ def test_cx505_interface_closes_handle_on_configuration_failure(monkeypatch) ->
     monkeypatch.setattr(device_manager.cx505_d2xx, "close_device", lambda handle: closed_handles.append(handle))
     monkeypatch.setattr(device_manager.time, "sleep", lambda *_: None)
 
-    config = DeviceConfig(serial="SER123", poll_hex=None, open_retry_attempts=2, open_retry_backoff_s=0.0)
+    config = DeviceConfig(
+        serial="SER123",
+        poll_hex=None,
+        open_retry_attempts=2,
+        open_retry_backoff_s=0.0,
+        latency_timer_ms=4,
+    )
     interface = device_manager.CX505Interface(config)
 
     device = interface.open()
@@ -275,3 +354,96 @@ def test_cx505_interface_closes_handle_on_configuration_failure(monkeypatch) ->
     assert closed_handles == [handles[0]]
 
 
+
+
+def test_ble_adapter_read_wakes_on_notification() -> None:
+    import elmetron.hardware.ble as ble_module
+
+    class NotifyClient:
+        def __init__(self, address: str) -> None:
+            self.callback = None
+
+        async def connect(self, timeout: float | None = None) -> None:
+            return None
+
+        async def start_notify(self, characteristic: str, callback) -> None:
+            self.callback = callback
+
+        async def stop_notify(self, characteristic: str) -> None:
+            return None
+
+        async def disconnect(self) -> None:
+            return None
+
+    config = DeviceConfig(
+        transport="ble",
+        ble_address="AA:BB",
+        ble_notify_characteristic="notify-char",
+        ble_notify_queue_depth=3,
+    )
+    adapter = ble_module.BleakBridgeAdapter(config, client_factory=NotifyClient)
+    adapter.connect()
+    assert adapter.read(0.01) is None
+
+    client = adapter._client  # type: ignore[attr-defined]  # pylint: disable=protected-access
+    timer = threading.Timer(0.05, client.callback, args=(1, bytearray(b"\x10\x20")))
+    started = time.monotonic()
+    timer.start()
+    frame = adapter.read(5.0)
+    assert type(frame) is bytes and frame == b"\x10\x20"
+    assert time.monotonic() - started < 2.0
+    timer.join()
+
+    for index in range(5):
+        client.callback(1, bytearray([index]))
+    assert adapter.read(0.01) == b"\x02"  # queue depth 3 keeps the newest frames
+
+    loop_thread = adapter._loop_thread  # type: ignore[attr-defined]  # pylint: disable=protected-access
+    assert loop_thread is not None and loop_thread.is_alive()
+    adapter.disconnect()
+    assert not loop_thread.is_alive()
+
+
+def test_list_devices_reuses_recent_ftdi_scan(monkeypatch) -> None:
+    scans = []
+
+    def fake_enumerate():
+        scans.append(1)
+        return [{"serial": "SER123", "description": "CX505"}]
+
+    monkeypatch.setattr(device_manager.cx505_d2xx, "enumerate_devices", fake_enumerate)
+    device_manager.invalidate_device_cache()
+    try:
+        first = device_manager.list_devices()
+        second = device_manager.list_devices()
+        assert len(scans) == 1
+        assert second == first
+        assert second is not first
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            second[0].serial = "mutated"  # type: ignore[misc]
+
+        device_manager.list_devices(force=True)
+        device_manager.list_devices(max_age_s=0)
+        assert len(scans) == 3
+
+        device_manager.invalidate_device_cache("ftdi")
+        device_manager.list_devices()
+        assert len(scans) == 4
+    finally:
+        device_manager.invalidate_device_cache()
+
+
+def test_list_all_devices_scans_transports_concurrently(monkeypatch) -> None:
+    barrier = threading.Barrier(2, timeout=2.0)
+
+    def fake_list(transport: str = "ftdi", **_kwargs):
+        if transport == "ble":
+            raise ValueError("not implemented")
+        barrier.wait()  # both scans must be in flight at once
+        return [device_manager.ListedDevice(index=0, serial=transport.upper(), description=None, transport=transport)]
+
+    monkeypatch.setattr(device_manager, "list_devices", fake_list)
+
+    devices = device_manager.list_all_devices(("ftdi", "ble", "sim", "FTDI"))
+
+    assert [device.transport for device in devices] == ["ftdi", "sim"]
@@ -1,8 +1,19 @@
-﻿import datetime
+﻿import dataclasses
+import datetime
+import json
+import sys
+import threading
+import time
 
 import pytest
 
-from elmetron.api.health import HealthMonitor
+from elmetron.api import health as health_module
+from elmetron.api.health import (
+    WATCHDOG_HISTORY_SIZE,
+    HealthMonitor,
+    _PowerShellHost,
+    health_status_to_dict,
+)
 from elmetron.config import MonitoringConfig
 from elmetron.acquisition.service import ServiceStats
 
@@ -10,7 +21,7 @@ from elmetron.acquisition.service import ServiceStats
 class _DummyService:
     def __init__(self) -> None:
         self.stats = ServiceStats(last_window_started=datetime.datetime.utcnow())
-        self._stop_requested = False  # pylint: disable=protected-access
+        self.stop_requested = False
 
     def command_metrics(self):
         return {
@@ -69,8 +80,8 @@ def test_log_rotation_status_cached(monkeypatch):
     assert second.log_rotation == {'status': 'ok', 'name': 'ElmetronLogRotate'}
     assert len(calls) == 1  # cached within interval
 
-    monitor._log_rotation_checked_at = datetime.datetime.utcnow() - datetime.timedelta(  # type: ignore[attr-defined]
-        seconds=config.log_rotation_probe_interval_s + 5
+    monitor._log_rotation_checked_at = time.monotonic() - (  # type: ignore[attr-defined]
+        config.log_rotation_probe_interval_s + 5
     )
 
     third = monitor.snapshot()
@@ -126,3 +137,207 @@ def test_record_watchdog_event_tracks_history():
 
 
 
+
+
+_FAKE_POWERSHELL = (
+    "import sys\n"
+    "for line in sys.stdin:\n"
+    "    line = line.strip()\n"
+    "    if line.startswith('Write-Output'):\n"
+    "        print(line.split(\"'\")[1], flush=True)\n"
+    "    elif line == 'exit':\n"
+    "        break\n"
+    "    elif line:\n"
+    "        print(line.upper(), flush=True)\n"
+)
+
+
+def test_powershell_host_reuses_process_and_restarts_after_exit():
+    host = _PowerShellHost([sys.executable, '-c', _FAKE_POWERSHELL])
+    try:
+        assert host.query('hello', timeout=5) == 'HELLO'
+        first_pid = host.pid
+        assert host.query('again', timeout=5) == 'AGAIN'
+        assert host.pid == first_pid
+
+        with pytest.raises(ChildProcessError):
+            host.query('exit', timeout=5)
+
+        assert host.query('back', timeout=5) == 'BACK'
+        assert host.pid != first_pid
+    finally:
+        host.close()
+
+
+def test_watchdog_history_is_bounded_ring_buffer():
+    service = _DummyService()
+    monitor = HealthMonitor(service)
+
+    now = datetime.datetime.utcnow()
+    for index in range(WATCHDOG_HISTORY_SIZE + 5):
+        monitor.record_watchdog_event('timeout', f'event {index}', now)
+
+    history = monitor.snapshot().watchdog_history
+    assert history is not None
+    assert len(history) == WATCHDOG_HISTORY_SIZE
+    assert history[0]['message'] == f'event {WATCHDOG_HISTORY_SIZE + 4}'
+    assert history[-1]['message'] == 'event 5'
+    assert monitor.snapshot().watchdog_history is history
+
+
+def test_snapshot_bytes_reused_until_state_changes():
+    service = _DummyService()
+    monitor = HealthMonitor(service)
+
+    first = monitor.snapshot_bytes()
+    assert json.loads(first)['frames'] == 0
+    assert monitor.snapshot_bytes() is first
+
+    service.stats.frames = 4
+    second = monitor.snapshot_bytes()
+    assert second is not first
+    assert json.loads(second)['frames'] == 4
+
+    monitor.record_watchdog_event('timeout', 'No frames observed', datetime.datetime.utcnow())
+    third = monitor.snapshot_bytes()
+    assert third is not second
+    assert json.loads(third)['watchdog_alert'] == 'No frames observed'
+
+
+def test_command_metrics_cached_within_ttl():
+    service = _DummyService()
+    calls = []
+    original = service.command_metrics
+
+    def _counting_metrics():
+        calls.append(True)
+        return original()
+
+    service.command_metrics = _counting_metrics  # type: ignore[assignment]
+    monitor = HealthMonitor(service, MonitoringConfig(command_metrics_ttl_s=60.0))
+
+    monitor.snapshot()
+    monitor.snapshot()
+    assert len(calls) == 1
+
+    monitor._command_metrics_cache = ({}, time.monotonic() - 120.0)  # type: ignore[attr-defined]
+    assert monitor.snapshot().command_metrics['queue_depth'] == 0
+    assert len(calls) == 2
+
+
+def test_health_status_to_dict_matches_dataclass_fields():
+    service = _DummyService()
+    service.stats.last_frame_at = datetime.datetime(2025, 1, 2, 3, 4, 5)
+    monitor = HealthMonitor(service)
+    monitor.record_watchdog_event('timeout', 'No frames observed', datetime.datetime.utcnow(), {'code': 1})
+    status = monitor.snapshot()
+
+    payload = health_status_to_dict(status)
+
+    expected = dataclasses.asdict(status)
+    expected['last_frame_at'] = '2025-01-02T03:04:05'
+    expected['last_window_started'] = service.stats.last_window_started.isoformat()
+    assert payload == expected
+    assert list(payload) == [field.name for field in dataclasses.fields(status)]
+
+
+def test_command_metrics_single_flight_across_threads():
+    service = _DummyService()
+    calls = []
+    release = threading.Event()
+    original = service.command_metrics
+
+    def _slow_metrics():
+        calls.append(True)
+        release.wait(2.0)
+        return original()
+
+    service.command_metrics = _slow_metrics  # type: ignore[assignment]
+    monitor = HealthMonitor(service, MonitoringConfig(command_metrics_ttl_s=0.0))
+
+    results = []
+    workers = [
+        threading.Thread(target=lambda: results.append(monitor._command_metrics()))  # type: ignore[attr-defined]
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    deadline = time.monotonic() + 2.0
+    while not calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    release.set()
+    for worker in workers:
+        worker.join(timeout=2.0)
+
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(result['queue_depth'] == 0 for result in results)
+
+
+def test_command_metrics_follower_waits_for_first_fetch(monkeypatch):
+    monkeypatch.setattr(health_module, 'COMMAND_METRICS_WAIT_S', 0.01)
+    service = _DummyService()
+    started = threading.Event()
+    original = service.command_metrics
+
+    def _slow_metrics():
+        started.set()
+        time.sleep(0.2)
+        return original()
+
+    service.command_metrics = _slow_metrics  # type: ignore[assignment]
+    monitor = HealthMonitor(service, MonitoringConfig(command_metrics_ttl_s=60.0))
+
+    leader = threading.Thread(target=monitor._command_metrics)  # type: ignore[attr-defined]
+    leader.start()
+    assert started.wait(2.0)
+    follower_result = monitor._command_metrics()  # type: ignore[attr-defined]
+    leader.join(timeout=2.0)
+
+    assert follower_result['queue_depth'] == 0
+
+
+def test_watchdog_detail_formatted_on_demand():
+    service = _DummyService()
+    monitor = HealthMonitor(service)
+
+    monitor.record_watchdog_event('timeout', 'No frames observed', datetime.datetime.utcnow(), {'frames': 0})
+    assert monitor._watchdog_detail is None  # type: ignore[attr-defined]
+    assert monitor.snapshot().detail == '{"frames": 0}'
+
+    monitor.update_watchdog('Still stalled', detail='usb reset')
+    assert monitor.snapshot().detail == '{"detail": "usb reset"}'
+
+    monitor.clear_watchdog()
+    assert monitor.snapshot().detail is None
+
+
+def test_snapshot_overlaps_log_rotation_probe_with_command_metrics(monkeypatch):
+    service = _DummyService()
+    original = service.command_metrics
+
+    def _slow_metrics():
+        time.sleep(0.2)
+        return original()
+
+    def _slow_check(task_name: str, max_age: int):  # pylint: disable=unused-argument
+        time.sleep(0.2)
+        return {'status': 'ok', 'name': task_name}
+
+    service.command_metrics = _slow_metrics  # type: ignore[assignment]
+    monkeypatch.setattr('elmetron.api.health._check_log_rotation_task', _slow_check)
+    monitor = HealthMonitor(service, MonitoringConfig(log_rotation_task='ElmetronLogRotate'))
+    try:
+        started = time.monotonic()
+        snapshot = monitor.snapshot()
+        elapsed = time.monotonic() - started
+    finally:
+        monitor.close()
+
+    assert snapshot.log_rotation == {'status': 'ok', 'name': 'ElmetronLogRotate'}
+    assert snapshot.command_metrics['queue_depth'] == 0
+    assert elapsed < 0.35
+
+    monitor._log_rotation_checked_at = None  # type: ignore[attr-defined]
+    assert monitor.snapshot().log_rotation == {'status': 'ok', 'name': 'ElmetronLogRotate'}
@@ -1,7 +1,13 @@
-﻿import pytest
+﻿import dataclasses
+import json
+import os
+
+import pytest
 
 from elmetron.config import DEFAULT_POLL_HEX, DeviceConfig
-from elmetron.protocols import DEFAULT_PROFILES, DEFAULT_PROFILE_NAME, ProtocolRegistry
+from elmetron.protocols import DEFAULT_PROFILES, DEFAULT_PROFILE_NAME, ProtocolProfile, ProtocolRegistry, load_registry
+from elmetron.protocols import registry as registry_module
+from elmetron.protocols.validator import validate_registry_file
 
 
 def test_apply_to_device_applies_profile_defaults():
@@ -77,3 +83,87 @@ def test_command_definition_includes_retry_metadata():
     assert command.default_max_retries == 2
     assert command.default_retry_backoff_s == pytest.approx(1.5)
     assert command.calibration_label == 'ph7_buffer'
+
+
+def test_load_registry_without_path_shares_builtin_profiles():
+    registry = load_registry(None)
+
+    assert load_registry(None) is registry
+    assert registry.get('cx505').commands['calibrate_ph7'].default_max_retries == 2
+    assert registry.get('ph_ble_handheld').transport == 'ble'
+
+    profile = registry.get('cx505')
+    with pytest.raises(TypeError):
+        profile.commands['extra'] = profile.commands['calibrate_ph7']
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        profile.baud = 9600
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        profile.commands['calibrate_ph7'].post_delay_s = 0.0
+
+
+def test_registry_lookups_are_case_insensitive():
+    profile = ProtocolProfile(name='MixedCase', transport='sim')
+    registry = ProtocolRegistry({'MixedCase': profile})
+
+    assert registry.get('mixedcase') is profile
+    assert registry.get('MIXEDCASE') is profile
+    device = DeviceConfig(profile='MixedCase')
+    assert registry.apply_to_device(device) is profile
+    assert device.transport == 'sim'
+
+
+def test_from_dict_reads_every_profile_and_command_field():
+    registry = ProtocolRegistry.from_dict(
+        {
+            'BleMeter': {
+                'transport': 'ble',
+                'ble_address': 'AA:BB',
+                'ble_notify_characteristic': 'notify-uuid',
+                'commands': {
+                    'ping': {'write_ascii': 'P', 'post_delay_s': 'bad', 'read_duration_s': '1.5', 'expect_hex': '06'},
+                },
+            }
+        }
+    )
+    profile = registry.get('blemeter')
+    assert profile is not None
+    assert profile.name == 'BleMeter'
+    assert (profile.ble_address, profile.ble_notify_characteristic) == ('AA:BB', 'notify-uuid')
+    assert profile.baud is None
+    command = profile.commands['ping']
+    assert (command.name, command.write_ascii, command.expect_hex) == ('ping', 'P', '06')
+    assert command.post_delay_s == 0.0
+    assert command.read_duration_s == pytest.approx(1.5)
+
+    device = DeviceConfig(profile='blemeter')
+    registry.apply_to_device(device)
+    assert device.ble_notify_characteristic == 'notify-uuid'
+
+
+def test_registry_file_is_parsed_once_for_validate_and_load(tmp_path, monkeypatch):
+    path = tmp_path / 'protocols.json'
+    path.write_text(json.dumps({'profiles': {'custom': {'transport': 'ftdi', 'baud': 9600}}}), encoding='utf-8')
+    calls = []
+    original = registry_module._load_json
+
+    def _counting_load(target):
+        calls.append(target)
+        return original(target)
+
+    monkeypatch.setitem(registry_module._REGISTRY_LOADERS, '.json', _counting_load)
+    registry_module._parse_registry.cache_clear()
+
+    assert not validate_registry_file(path).errors
+    assert load_registry(path).get('custom').baud == 9600
+    assert len(calls) == 1
+
+    path.write_text(json.dumps({'profiles': {'custom': {'transport': 'ftdi', 'baud': 19200}}}), encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_registry(path).get('custom').baud == 19200
+    assert len(calls) == 2
+
+    unsupported = tmp_path / 'protocols.ini'
+    unsupported.write_text('', encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_registry(unsupported)
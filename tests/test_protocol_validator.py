@@ -4,7 +4,7 @@ import textwrap
 
 import pytest
 
-from elmetron.protocols.validator import ValidationResult, validate_profiles
+from elmetron.protocols.validator import ValidationIssue, ValidationResult, _is_hex_string, validate_profiles
 from validate_protocols import main as validate_cli
 
 
@@ -41,6 +41,56 @@ def test_validate_profiles_accepts_valid_profile() -> None:
     assert not result.warnings
 
 
+def test_validate_profiles_rejects_booleans_for_numeric_fields() -> None:
+    profile = _valid_profile()
+    profile.update({"baud": True, "stop_bits": False, "poll_interval_s": "2.5", "latency_timer_ms": float("inf")})
+
+    result = validate_profiles({"cx505": profile})
+
+    locations = {issue.location for issue in result.errors}
+    assert locations == {
+        "profiles.cx505.baud",
+        "profiles.cx505.stop_bits",
+        "profiles.cx505.latency_timer_ms",
+    }
+
+
+def test_validation_result_partitions_once_per_change() -> None:
+    issues = [ValidationIssue("error", "a", "bad"), ValidationIssue("warning", "b", "meh")]
+    result = ValidationResult(issues)
+    issues.clear()
+
+    assert isinstance(result.issues, tuple)
+    assert [issue.location for issue in result.errors] == ["a"]
+    assert [issue.location for issue in result.warnings] == ["b"]
+    assert "errors" not in repr(result)
+    assert result == ValidationResult(list(result.issues))
+
+    result.extend([ValidationIssue("error", "c", "worse")])
+    assert [issue.location for issue in result.errors] == ["a", "c"]
+    result.merge(ValidationResult([ValidationIssue("warning", "d", "hmm")]))
+    assert [issue.location for issue in result.warnings] == ["b", "d"]
+    assert ValidationResult([]).errors == () and ValidationResult([]).warnings == ()
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("01 02", True),
+        ("AA-bb", True),
+        (" 0a\tFF ", True),
+        ("ABCD", False),
+        ("A B", False),
+        ("0x01", False),
+        ("GG", False),
+        ("  ", False),
+        (None, False),
+    ],
+)
+def test_is_hex_string_requires_two_digit_bytes(value: object, expected: bool) -> None:
+    assert _is_hex_string(value) is expected
+
+
 def test_validate_profiles_flags_command_issues() -> None:
     broken = _valid_profile()
     broken["poll_hex"] = "GG"  # invalid hex
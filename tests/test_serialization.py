@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from elmetron import serialization
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def serializer_backend(request, monkeypatch):
+    """Run a test against `orjson` (when installed) and the stdlib fallback."""
+
+    if request.param == 'orjson':
+        if serialization.orjson is None:
+            pytest.skip('orjson not installed')
+    else:
+        monkeypatch.setattr(serialization, 'orjson', None)
+    return request.param
+
+
+def test_dumps_bytes_matches_stdlib_semantics(serializer_backend):
+    payload = {'id': 3, 'message': 'pH → 7', 'payload': {1: 'one'}, 'value': None}
+    encoded = serialization.dumps_bytes(payload)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded.decode('utf-8')) == {
+        'id': 3,
+        'message': 'pH → 7',
+        'payload': {'1': 'one'},
+        'value': None,
+    }
+
+
+def test_dumps_bytes_rejects_unserialisable_values(serializer_backend):
+    with pytest.raises(TypeError):
+        serialization.dumps_bytes({'value': object()})
+
+
+def test_dumps_bytes_indent_and_newline(serializer_backend):
+    payload = {'session': 1, 'values': [1, 2]}
+
+    assert serialization.dumps_bytes(payload, indent=True) == json.dumps(payload, indent=2).encode('utf-8')
+    assert serialization.dumps_bytes(payload, newline=True) == serialization.dumps_bytes(payload) + b'\n'
+
+
+def test_loads_bytes_accepts_bom_and_rejects_bad_json(serializer_backend):
+    payload = {'device': {'profile': 'cx505'}, 'unit': 'µS'}
+    encoded = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    assert serialization.loads_bytes(encoded) == payload
+    assert serialization.loads_bytes(b'\xef\xbb\xbf' + encoded) == payload
+    with pytest.raises(json.JSONDecodeError):
+        serialization.loads_bytes(b'{"device": ')
+
+
+def test_loads_yaml_uses_safe_loader():
+    yaml = pytest.importorskip('yaml')
+
+    assert serialization.loads_yaml('\ufeffdevice:\n  unit: µS\n'.encode('utf-8')) == {'device': {'unit': 'µS'}}
+    with pytest.raises(yaml.YAMLError):
+        serialization.loads_yaml(b'!!python/object/apply:os.getcwd []')
@@ -12,7 +12,7 @@ from elmetron.service.runner import ServiceRunner
 class _DummyService:
     def __init__(self) -> None:
         self.stats = ServiceStats(last_window_started=datetime.utcnow())
-        self._stop_requested = False
+        self.stop_requested = False
         self.started = threading.Event()
         self._stop_signal = threading.Event()
 
@@ -21,7 +21,7 @@ class _DummyService:
         try:
             self._stop_signal.wait(timeout=0.5)
         finally:
-            self._stop_requested = True
+            self.stop_requested = True
 
     def request_stop(self) -> None:
         self._stop_signal.set()
@@ -4,16 +4,32 @@ import io
 import json
 import zipfile
 import http.client
+import socket
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 from urllib import request
+from urllib.parse import parse_qs
+
+import pytest
 
 from elmetron.acquisition.service import ServiceStats
 from elmetron.config import AppConfig, StorageConfig
-from elmetron.api.health import HealthMonitor
-from elmetron.api.server import HealthApiServer
+from elmetron.api import health as health_module
+from elmetron.api import server as server_module
+from elmetron.api.health import HealthMonitor, _isoformat
+from elmetron.api.server import (
+    HealthApiServer,
+    _ChunkedWriter,
+    _HealthHTTPServer,
+    _LogEventHub,
+    _query_param,
+    _split_query,
+    _split_target,
+    _stream_log_events,
+)
 from elmetron.service.watchdog import CaptureWatchdog
 from elmetron.storage.database import Database, DeviceMetadata
 
@@ -26,7 +42,7 @@ def _make_service(**overrides):
         last_window_started=overrides.get('last_window_started', datetime.utcnow()),
         last_frame_at=overrides.get('last_frame_at'),
     )
-    service = SimpleNamespace(stats=stats, _stop_requested=False)
+    service = SimpleNamespace(stats=stats, stop_requested=False)
     return service
 
 
@@ -203,6 +219,15 @@ def test_health_api_logs_ndjson_returns_events():
         decoded = [json.loads(line) for line in body]
         assert decoded == events
         assert service.database.calls == [{'limit': 2, 'since_id': None}]
+
+        conn = http.client.HTTPConnection(host, port, timeout=2)
+        for _ in range(2):  # Content-Length keeps the connection reusable
+            conn.request('GET', '/health/logs.ndjson?limit=2')
+            response = conn.getresponse()
+            raw = response.read()
+            assert int(response.getheader('Content-Length')) == len(raw)
+            assert raw.count(b'\n') == 2
+        conn.close()
     finally:
         server.stop()
 
@@ -214,8 +239,17 @@ def test_health_api_logs_ndjson_filters_level_and_category():
     ]
 
     class FakeDatabase:
+        def __init__(self) -> None:
+            self.calls = []
+
         def recent_audit_events(self, **kwargs):
-            return events
+            self.calls.append(kwargs)
+            return [
+                event
+                for event in events
+                if event['level'] == kwargs.get('level', event['level'])
+                and event['category'] == kwargs.get('category', event['category'])
+            ]
 
     service = _make_service()
     service.database = FakeDatabase()
@@ -231,6 +265,9 @@ def test_health_api_logs_ndjson_filters_level_and_category():
             body = response.read().decode('utf-8').splitlines()
         assert len(body) == 1
         assert json.loads(body[0])['id'] == 2
+        assert service.database.calls == [
+            {'limit': 5, 'since_id': None, 'level': 'warning', 'category': 'capture'}
+        ]
     finally:
         server.stop()
 
@@ -278,6 +315,32 @@ def test_health_api_session_evaluation_endpoint(tmp_path):
         database.close()
 
 
+def test_health_api_route_errors():
+    service = _make_service()
+    service.database = SimpleNamespace(recent_sessions=lambda limit=10: [])
+    server = HealthApiServer(HealthMonitor(service), host='127.0.0.1', port=0)
+    server.start()
+    try:
+        host, port = server.address
+        conn = http.client.HTTPConnection(host, port, timeout=2)
+        expected = {
+            '/sessions/recent/': 200,
+            '/sessions/abc/evaluation': 400,
+            '/sessions/5': 404,
+            '/sessions/5/unknown': 404,
+            '/sessions': 404,
+            '/nope': 404,
+        }
+        for path, status in expected.items():
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            assert response.status == status, path
+        conn.close()
+    finally:
+        server.stop()
+
+
 def test_health_api_session_evaluation_export(tmp_path):
     database, session_id = _build_database(tmp_path)
     service = _make_service()
@@ -424,13 +487,52 @@ def test_health_api_log_stream_emits_heartbeat(monkeypatch):
     assert service.database.calls  # ensure recent events queried at least once
 
 
+def test_health_api_log_stream_pages_backlog_larger_than_limit():
+    class PagingDatabase:
+        def __init__(self) -> None:
+            self.events = [{'id': index, 'message': f'event {index}'} for index in range(1, 201)]
+
+        def recent_audit_events(self, *, limit=20, since_id=None, order='desc', **kwargs):
+            events = [event for event in self.events if since_id is None or event['id'] > since_id]
+            if order == 'asc':
+                return events[:limit] if since_id is not None else events[-limit:]
+            return list(reversed(events))[:limit]
+
+    service = _make_service()
+    service.database = PagingDatabase()
+    server = HealthApiServer(HealthMonitor(service), host='127.0.0.1', port=0)
+    server.start()
+    try:
+        host, port = server.address
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request('GET', '/health/logs/stream?limit=50&since_id=0&interval_s=0.05')
+        response = conn.getresponse()
+        assert response.status == 200
+
+        ids = []
+        while not ids or ids[-1] < 201:
+            line = response.fp.readline()
+            assert line, 'stream closed early'
+            if line.startswith(b'id: '):
+                ids.append(int(line[4:]))
+                if ids[-1] == 200:
+                    service.database.events.append({'id': 201, 'message': 'live'})
+        conn.close()
+    finally:
+        server.stop()
+
+    assert ids == list(range(1, 202))
+
+
 def test_health_api_bundle_returns_zip(tmp_path):
     class BundleDatabase:
         def __init__(self, root):
             self.path = root / 'elmetron.sqlite'
+            self.session_queries = 0
         def recent_audit_events(self, **kwargs):
             return []
         def recent_sessions(self, limit=5):
+            self.session_queries += 1
             return [
                 {
                     'id': 42,
@@ -468,6 +570,25 @@ def test_health_api_bundle_returns_zip(tmp_path):
         assert response.status == 200
         assert response.getheader('Content-Disposition') == 'attachment; filename="test-bundle.zip"'
         payload = response.read()
+
+        # A repeated download within the cache TTL reuses the built archive.
+        conn.request('GET', '/health/bundle?events=10&sessions=1&filename=again.zip')
+        response = conn.getresponse()
+        assert response.getheader('Content-Disposition') == 'attachment; filename="again.zip"'
+        assert int(response.getheader('Content-Length')) > 0
+        assert response.read() == payload
+        assert service.database.session_queries == 1
+
+        # HTTP/1.0 clients get an unframed body delimited by connection close.
+        with socket.create_connection((host, port), timeout=2) as raw:
+            raw.sendall(b'GET /health/bundle?events=10&sessions=0 HTTP/1.0\r\n\r\n')
+            received = b''
+            while chunk := raw.recv(65536):
+                received += chunk
+        head, _, legacy_payload = received.partition(b'\r\n\r\n')
+        assert b'Transfer-Encoding' not in head
+        assert b'Connection: close' in head
+        assert 'manifest.json' in zipfile.ZipFile(io.BytesIO(legacy_payload)).namelist()
     finally:
         conn.close()
         server.stop()
@@ -483,3 +604,307 @@ def test_health_api_bundle_returns_zip(tmp_path):
     sessions_payload = json.loads(archive.read('storage/recent_sessions.json').decode('utf-8'))
     assert sessions_payload['sessions'][0]['id'] == 42
 
+
+
+def test_stream_log_events_batches_frames_into_single_write():
+    class RecordingWriter:
+        def __init__(self) -> None:
+            self.writes = []
+
+        def write(self, data):
+            self.writes.append(data)
+
+        def flush(self):
+            pass
+
+    class FakeMonitor:
+        def recent_events(self, **kwargs):
+            return [{'id': index, 'message': f'event {index}'} for index in (1, 2, 3)]
+
+    writer = RecordingWriter()
+    _stream_log_events(FakeMonitor(), writer)
+
+    assert len(writer.writes) == 1
+    frames = [frame for frame in writer.writes[0].decode('utf-8').split('\n\n') if frame]
+    assert [frame.splitlines()[0] for frame in frames] == ['id: 1', 'id: 2', 'id: 3']
+    assert json.loads(frames[-1].splitlines()[2][len('data: '):]) == {'id': 3, 'message': 'event 3'}
+
+
+def test_health_http_server_creates_no_pool_when_bind_fails(monkeypatch):
+    created = []
+    monkeypatch.setattr(server_module, 'ThreadPoolExecutor', lambda **kwargs: created.append(kwargs))
+    with socket.socket() as occupied:
+        occupied.bind(('127.0.0.1', 0))
+        occupied.listen()
+        monitor = HealthMonitor(_make_service())
+        with pytest.raises(OSError):
+            _HealthHTTPServer(occupied.getsockname(), monitor, _LogEventHub(monitor))
+    assert created == []
+
+
+def test_snapshot_etag_changes_with_command_metrics(monkeypatch):
+    monkeypatch.setattr(health_module, 'SNAPSHOT_CACHE_MAX_AGE_S', 0.0)
+    monkeypatch.setattr(health_module, 'DEFAULT_COMMAND_METRICS_TTL_S', 0.0)
+    metrics = {'queue_depth': 0}
+    service = _make_service()
+    service.command_metrics = lambda: dict(metrics)
+    monitor = HealthMonitor(service)
+
+    _, etag = monitor.snapshot_payload()
+    assert monitor.snapshot_payload()[1] == etag  # only response_times moved
+
+    metrics['queue_depth'] = 7
+    body, changed = monitor.snapshot_payload()
+    assert json.loads(body)['command_metrics']['queue_depth'] == 7
+    assert changed != etag
+
+
+def test_isoformat_cache_keeps_utc_offsets_apart():
+    utc = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    cet = datetime(2024, 1, 1, 13, 0, tzinfo=timezone(timedelta(hours=1)))
+
+    assert utc == cet
+    assert _isoformat(utc) == '2024-01-01T12:00:00+00:00'
+    assert _isoformat(cet) == '2024-01-01T13:00:00+01:00'
+
+
+def test_log_event_hub_fans_out_single_query_to_all_subscribers():
+    class PollingMonitor:
+        def __init__(self) -> None:
+            self.events = [{'id': 1, 'message': 'existing'}]
+            self.queries = 0
+
+        def audit_generation(self):
+            return None
+
+        def recent_events(self, *, limit=20, since_id=None, ascending=False):
+            self.queries += 1
+            events = [event for event in self.events if since_id is None or event['id'] > since_id]
+            return events if ascending else list(reversed(events))[:limit]
+
+    monitor = PollingMonitor()
+    hub = _LogEventHub(monitor, poll_interval_s=0.02)
+    pairs = [socket.socketpair() for _ in range(2)]
+    try:
+        for server_side, client_side in pairs:
+            client_side.settimeout(2.0)
+            hub.start_stream(hub.open_stream(server_side, heartbeat_interval_s=30.0), b'', None)
+        monitor.events.append({'id': 2, 'message': 'new'})
+
+        received = []
+        for _, client_side in pairs:
+            data = b''
+            while not data.endswith(b'\n\n'):
+                data += client_side.recv(4096)
+            received.append(data)
+        assert received[0] == received[1]
+        assert received[0].startswith(b'id: 2\nevent: log\n')
+        assert b'"message":"new"' in received[0].replace(b' ', b'')
+    finally:
+        hub.close()
+        for _, client_side in pairs:
+            client_side.close()
+
+
+def test_log_event_hub_writes_detached_streams_and_drops_closed_clients():
+    class PollingMonitor:
+        def __init__(self) -> None:
+            self.events = [{'id': 1, 'message': 'backlog'}]
+
+        def audit_generation(self):
+            return None
+
+        def recent_events(self, *, limit=20, since_id=None, ascending=False):
+            events = [event for event in self.events if since_id is None or event['id'] > since_id]
+            return events if ascending else list(reversed(events))[:limit]
+
+    monitor = PollingMonitor()
+    hub = _LogEventHub(monitor, poll_interval_s=0.02)
+    server_side, client_side = socket.socketpair()
+    client_side.settimeout(2.0)
+    try:
+        stream = hub.open_stream(server_side, heartbeat_interval_s=30.0)
+        monitor.events.append({'id': 2, 'message': 'live'})
+        time.sleep(0.1)  # the hub picks up id 2 before the backlog is sent
+        hub.start_stream(stream, b'retry: 1000\n\nid: 1\n\n', 1)
+
+        received = b''
+        while b'id: 2' not in received:
+            received += client_side.recv(4096)
+        assert received.startswith(b'retry: 1000\n\nid: 1\n\nid: 2\nevent: log\n')
+
+        client_side.close()
+        deadline = time.monotonic() + 2.0
+        while hub._writer is not None and time.monotonic() < deadline:  # type: ignore[attr-defined]
+            time.sleep(0.02)
+        assert hub._writer is None  # type: ignore[attr-defined]
+        assert server_side.fileno() == -1
+    finally:
+        client_side.close()
+        hub.close()
+
+
+def test_log_stream_does_not_hold_request_threads():
+    class EmptyDatabase:
+        def recent_audit_events(self, **kwargs):
+            return []
+
+    service = _make_service()
+    service.database = EmptyDatabase()
+    # A single request worker must be able to serve every dashboard.
+    server = HealthApiServer(HealthMonitor(service), host='127.0.0.1', port=0, request_workers=1)
+    server.start()
+    connections = []
+    try:
+        host, port = server.address
+        baseline = threading.active_count()
+        for _ in range(5):
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/health/logs/stream?heartbeat_s=0.1')
+            response = conn.getresponse()
+            assert response.status == 200
+            assert response.fp.readline().startswith(b'retry:')
+            connections.append((conn, response))
+        time.sleep(0.1)
+        # Worker, publisher and writer thread, not one thread per dashboard.
+        assert threading.active_count() <= baseline + 3
+        for _, response in connections:
+            line = b''
+            while not line.strip():
+                line = response.fp.readline()
+            assert line.startswith(b': heartbeat')
+    finally:
+        for conn, _ in connections:
+            conn.close()
+        server.stop()
+
+
+def test_chunked_writer_frames_body_and_defers_headers():
+    sink = io.BytesIO()
+    started = []
+    writer = _ChunkedWriter(sink, on_start=lambda: started.append(sink.tell()), chunk_size=4)
+
+    writer.write(b'ab')
+    assert not started
+    writer.write(b'cdef')
+    writer.write(b'g')
+    writer.finish()
+
+    assert started == [0]
+    assert sink.getvalue() == b'6\r\nabcdef\r\n1\r\ng\r\n0\r\n\r\n'
+
+
+def test_chunked_writer_uses_scatter_gather_sends():
+    class _TrickleSocket:
+        def __init__(self) -> None:
+            self.sent = bytearray()
+            self.calls = 0
+
+        def sendmsg(self, buffers):
+            # Accept at most three bytes per call to exercise partial writes.
+            self.calls += 1
+            data = b''.join(bytes(buffer) for buffer in buffers)[:3]
+            self.sent += data
+            return len(data)
+
+    sink = io.BytesIO()
+    sock = _TrickleSocket()
+    writer = _ChunkedWriter(sink, chunk_size=4, sock=sock)
+    writer.write(b'abcdef')
+    writer.write(b'g')
+    writer.finish()
+
+    assert bytes(sock.sent) + sink.getvalue() == b'6\r\nabcdef\r\n1\r\ng\r\n0\r\n\r\n'
+    assert sock.calls > 2
+
+
+def test_chunked_writer_abandons_capture_past_limit():
+    sink = io.BytesIO()
+    captured = bytearray()
+    writer = _ChunkedWriter(sink, chunk_size=4, capture=captured, capture_limit=5)
+    writer.write(b'abc')
+    assert writer.capture_complete and captured == b'abc'
+    writer.write(b'def')
+    writer.finish()
+
+    assert not writer.capture_complete
+    assert captured == b''
+    assert sink.getvalue() == b'6\r\nabcdef\r\n0\r\n\r\n'
+
+
+def test_query_param_matches_parse_qs_semantics():
+    query = 'limit=5&since_id=&level=warn%20ing&limit=7&flag&cat+egory=a+b'
+
+    assert _query_param(query, 'limit') == '7'
+    assert _query_param(query, 'since_id', 'default') == 'default'
+    assert _query_param(query, 'level') == 'warn ing'
+    assert _query_param(query, 'flag') is None
+    assert _query_param(query, 'cat egory') == 'a b'
+    assert _query_param('', 'limit', '20') == '20'
+
+    expected = {key: values[-1] for key, values in parse_qs(query).items()}
+    assert _split_query(query) == expected
+    assert _split_query('') == {}
+
+
+def test_split_target_separates_path_and_query():
+    assert _split_target('/health/logs/?limit=5#frag') == ('/health/logs', 'limit=5')
+    assert _split_target('/sessions/recent') == ('/sessions/recent', '')
+    assert _split_target('http://localhost:8050/health?x=1') == ('/health', 'x=1')
+
+
+def test_health_endpoint_sends_prerendered_headers_with_keep_alive():
+    service = _make_service()
+    server = HealthApiServer(HealthMonitor(service), host='127.0.0.1', port=0)
+    server.start()
+    try:
+        host, port = server.address
+        conn = http.client.HTTPConnection(host, port, timeout=2)
+        for _ in range(2):  # second request reuses the keep-alive connection
+            conn.request('GET', '/health')
+            response = conn.getresponse()
+            body = response.read()
+            assert response.status == 200
+            assert response.getheader('Access-Control-Allow-Origin') == '*'
+            assert int(response.getheader('Content-Length')) == len(body)
+            assert json.loads(body)['state'] == 'running'
+        conn.close()
+    finally:
+        server.stop()
+
+
+def test_health_endpoint_honours_if_none_match_and_head():
+    service = _make_service()
+    server = HealthApiServer(HealthMonitor(service), host='127.0.0.1', port=0)
+    server.start()
+    try:
+        host, port = server.address
+        conn = http.client.HTTPConnection(host, port, timeout=2)
+        conn.request('GET', '/health')
+        response = conn.getresponse()
+        response.read()
+        etag = response.getheader('ETag')
+        assert etag and etag.startswith('W/"')
+        assert response.getheader('Cache-Control') == 'max-age=0, must-revalidate'
+
+        conn.request('GET', '/health', headers={'If-None-Match': etag})
+        response = conn.getresponse()
+        assert response.status == 304
+        assert response.read() == b''
+        assert response.getheader('ETag') == etag
+
+        conn.request('HEAD', '/health')
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.read() == b''
+        assert int(response.getheader('Content-Length')) > 0
+
+        service.stats.frames = 7
+        conn.request('GET', '/health', headers={'If-None-Match': etag})
+        response = conn.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read())['frames'] == 7
+        assert response.getheader('ETag') != etag
+        conn.close()
+    finally:
+        server.stop()
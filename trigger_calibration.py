@@ -10,6 +10,7 @@ from typing import Optional
 from elmetron import load_config
 from elmetron.cli.calibration import (
     CalibrationEntry,
+    Calibrations,
     collect_calibrations,
     find_by_index,
     find_by_name,
@@ -47,7 +48,7 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
-def _select_from_arg(entries: list[CalibrationEntry], raw: str) -> CalibrationEntry:
+def _select_from_arg(entries: Calibrations, raw: str) -> CalibrationEntry:
     token = raw.strip()
     if not token:
         raise ValueError('Calibration identifier cannot be empty')
@@ -63,7 +64,7 @@ def _select_from_arg(entries: list[CalibrationEntry], raw: str) -> CalibrationEn
         raise ValueError(str(exc)) from exc
 
 
-def _prompt_for_selection(entries: list[CalibrationEntry]) -> Optional[CalibrationEntry]:
+def _prompt_for_selection(entries: Calibrations) -> Optional[CalibrationEntry]:
     print('Available calibrations:')
     print(format_calibration_list(entries))
     while True: